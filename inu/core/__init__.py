@@ -2,8 +2,9 @@ from .singleton import Singleton
 from .ping_port import ping
 from .config import *
 from ._logging import getLogger, LoggingHandler, getLevel, stopwatch
-from .bash import Bash
+from .bash import Bash, QalcPool
+from .http import HTTPClient, APILimit
 from .bot import Inu, BotResponseError # needs `Bash`
-from .db import Table, Database  # needs `Inu`
+from .db import Table, Database, WriteBuffer, QueryStats  # needs `Inu`
 from .context import *
 from .api import *
\ No newline at end of file
@@ -23,6 +23,11 @@ from datetime import datetime, timedelta
 from typing import *
 from functools import wraps
 import asyncio
+import atexit
+import queue
+import sys
+import threading
+import time
 
 from colorama import init, Fore, Style
 from . import ConfigProxy, ConfigType
@@ -98,6 +103,147 @@ aliases = [
     ("core.db.DB", "DB"), ("db", "DB"), ("rest", "REST")
 ]
 
+class LogWriter:
+    """
+    Writes log lines to the console and to <`path`> in a background thread.
+
+    The file is kept open, lines are written in batches and the file is rotated
+    if it's bigger than <`max_bytes`> or older than <`max_age`> seconds.
+    If the queue is full, records below WARNING are dropped immediately,
+    others wait up to <`block_timeout`> seconds. Dropped records are counted.
+    """
+    BATCH_SIZE = 512
+
+    def __init__(
+        self,
+        path: str,
+        max_queue: int = 10_000,
+        max_bytes: int = 10 * 1024**2,
+        max_age: float = 24 * 60 * 60,
+        backup_count: int = 5,
+        block_timeout: float = 0.05,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backup_count = backup_count
+        self.block_timeout = block_timeout
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._queue: "queue.Queue[Optional[Tuple[str, str, str, str]]]" = queue.Queue(max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        self._opened: float = 0
+        # a forked child has the queue, but not the thread
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._queue = queue.Queue(self.max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log writer", daemon=True)
+                self._thread.start()
+
+    def put(self, level_name: str, time_stamp: str, module: str, message: str) -> None:
+        """hands a record to the writer thread"""
+        self._ensure_started()
+        item = (level_name, time_stamp, module, message)
+        try:
+            if level_name in ("WARN", "ERROR", "CRIT"):
+                self._queue.put(item, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stop = True
+                batch = [item for item in batch if item is not None]
+            try:
+                self._write(batch)
+            except Exception as e:
+                sys.stderr.write(f"log writer failed: {e!r}\n")
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, batch: List[Tuple[str, str, str, str]]) -> None:
+        if self.dropped != self._reported_dropped:
+            time_stamp = (datetime.now().strftime("%b %d %H:%M:%S:%f"))[:-7]
+            batch.append(("WARN", time_stamp, "core.logging", f"dropped {self.dropped - self._reported_dropped} log records - queue was full"))
+            self._reported_dropped = self.dropped
+        console_lines = []
+        file_lines = []
+        for level_name, time_stamp, module, message in batch:
+            console_lines.append(
+                f"{level_color.get(level_name, '')}{level_style.get(level_name, '')}{level_name:<6}{Style.RESET_ALL}"
+                f"{LoggingHandler._get_color('datetime')}{time_stamp:<8}{Style.RESET_ALL}: "
+                f"{Style.BRIGHT}{LoggingHandler._get_color(module)}{module[:12]:<12}{Style.RESET_ALL} "
+                f"» "
+                f"{msg_colors.get(level_name, '')}{message}{Style.RESET_ALL}\n"
+            )
+            file_lines.append(f"{level_name:<6}{time_stamp:<8}: {module[:12]:<12}| {str(message)}\n")
+        sys.stdout.write("".join(console_lines))
+        sys.stdout.flush()
+        log_file = self._open()
+        log_file.write("".join(file_lines))
+        log_file.flush()
+
+    def _open(self) -> IO[str]:
+        if self._file is not None and (
+            self._file.tell() >= self.max_bytes
+            or time.time() - self._opened >= self.max_age
+        ):
+            self._file.close()
+            self._file = None
+            self._rotate()
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._opened = time.time()
+        return self._file
+
+    def _rotate(self) -> None:
+        """inu.log -> inu.log.1 -> ... -> inu.log.<`backup_count`>"""
+        for i in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backup_count > 0 and os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.1")
+
+    def stop(self, timeout: float = 5) -> None:
+        """writes the remaining records and stops the thread"""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+
+log_writer = LogWriter(f"{os.getcwd()}/inu/inu.log")
+atexit.register(log_writer.stop)
+
+
 class LoggingHandler(logging.Logger):
     def trace(self, message: str):
         self.log(5, message)
@@ -136,18 +282,11 @@ class LoggingHandler(logging.Logger):
         # date formatting like this:
         # Oct 22 13:46:27:90
         time_stamp = (date.strftime("%b %d %H:%M:%S:%f"))[:-7]
-        print(f"{level_color[level_name]}{level_style[level_name]}{level_name:<6}{Style.RESET_ALL}"
-              f"{self._get_color('datetime')}{time_stamp:<8}{Style.RESET_ALL}: "
-              f"{Style.BRIGHT}{self._get_color(module)}{module[:12]:<12}{Style.RESET_ALL} "
-              f"» "
-              f"{msg_colors[level_name]}{message}{Style.RESET_ALL}")
-
-        with open(f"{os.getcwd()}/inu/inu.log", "a", encoding="utf-8") as log_file:
-            log_entry = f"{level_name:<6}{time_stamp:<8}: {module[:12]:<12}| {str(message)}\n"
-            log_file.write(log_entry)
-
-    # noinspection PyMethodMayBeStatic
-    def _get_color(self, name: str) -> str:
+        # printing and writing to the file happens in the writer thread
+        log_writer.put(level_name, time_stamp, module, str(message))
+
+    @staticmethod
+    def _get_color(name: str) -> str:
         """get color for the module name"""
         if name in color_patterns_cache:
             return color_patterns_cache[name]
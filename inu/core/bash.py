@@ -1,6 +1,9 @@
 import asyncio
 from typing import *
 import traceback
+import shutil
+import secrets
+import re
 
 from ._logging import getLogger
 log = getLogger(__name__)
@@ -48,6 +51,8 @@ class Bash:
         ValueError: 
             If the query could not be calculated (error contains stderr)
         """
+        if not base and not terse and QalcPool.accepts(query):
+            return await QalcPool.query(query)
         args = ["qalc"]
         #args.append(f"--base={base}")
         if base:
@@ -60,3 +65,222 @@ class Bash:
         if err:
             raise ValueError(err)
         return out
+
+
+
+class _QalcWorker:
+    """One long-lived `qalc` process, which reads expressions from stdin"""
+
+    def __init__(self, proc: asyncio.subprocess.Process, generation: int):
+        self.proc = proc
+        self.generation = generation
+
+    @classmethod
+    async def spawn(cls, generation: int) -> "_QalcWorker":
+        args = ["qalc"]
+        # qalc buffers stdout when it's not a terminal
+        if shutil.which("stdbuf"):
+            args = ["stdbuf", "-oL", *args]
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        return cls(proc, generation)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def query(self, query: str) -> str:
+        """
+        Raises:
+        -------
+        ValueError:
+            qalc printed an error or warning
+        EOFError:
+            the process died
+        """
+        assert self.proc.stdin and self.proc.stdout
+        line = " ".join(query.splitlines())
+        # printed back by qalc after the query - marks the end of the result.
+        # New for every query, that no expression can print it
+        marker = str(secrets.randbelow(9 * 10**17) + 10**17)
+        self.proc.stdin.write(f"{line}\n{marker}\n".encode("utf-8"))
+        await self.proc.stdin.drain()
+        lines: List[str] = []
+        while True:
+            raw = await self.proc.stdout.readline()
+            if not raw:
+                raise EOFError("qalc exited")
+            out = raw.decode("utf-8").strip()
+            if out in (marker, f"{marker} = {marker}"):
+                break
+            if out:
+                lines.append(out)
+        errors = [l for l in lines if l.startswith(("error:", "warning:"))]
+        if errors:
+            raise ValueError("\n".join(errors))
+        return "\n".join(lines) + "\n"
+
+    def kill(self) -> None:
+        if self.alive:
+            self.proc.kill()
+
+
+class QalcPool:
+    """
+    Pool of long-lived `qalc` processes.
+
+    A query is a pipe round trip to an idle worker instead of starting `qalc`
+    and loading its unit and currency database. Workers which time out or die
+    are replaced.
+
+    Workers are shared between users, hence queries which change the state
+    of the session (commands, definitions, previous answers) are not accepted
+    and have to be calculated with a fresh `qalc` process.
+    """
+    WORKERS: int = 2
+    TIMEOUT: float = 10
+    # interactive commands of qalc - they change settings or use the history
+    COMMANDS: Final[FrozenSet[str]] = frozenset({
+        "approximate", "assume", "base", "clear", "copy", "decimal", "delete",
+        "exact", "exit", "expand", "exrates", "factor", "find", "fraction", "function",
+        "help", "info", "keep", "list", "mc", "mode", "m+", "m-", "mr", "ms", "partial",
+        "pop", "quit", "rotate", "rpn", "save", "set", "simplify", "stack", "store",
+        "swap", "unkeep", "variable", "?",
+    })
+    # definitions, functions which store variables and references to earlier results
+    _STATEFUL: Final[re.Pattern] = re.compile(
+        r":=|\b(?:ans\d*|answer|save|store)\b",
+        re.IGNORECASE,
+    )
+    _idle: Optional[asyncio.Queue] = None
+    _workers: List[_QalcWorker] = []
+    # workers of older generations are replaced, when they are released
+    _generation: int = 0
+    _lock: Optional[asyncio.Lock] = None
+    # running replacements - referenced, that they are not garbage collected
+    _replacing: Set["asyncio.Task[None]"] = set()
+
+    @classmethod
+    async def start(cls) -> None:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if cls._idle is not None:
+                return
+            cls._idle = asyncio.Queue()
+            for _ in range(cls.WORKERS):
+                await cls._add_worker()
+        log.info(f"Started qalc pool with {cls.WORKERS} workers", prefix="init")
+
+    @classmethod
+    def accepts(cls, query: str) -> bool:
+        """
+        Returns wether <`query`> can be calculated by a pooled worker
+        without leaving state behind for the next user
+        """
+        for line in query.splitlines() or [""]:
+            words = line.strip().lstrip("/").split(maxsplit=1)
+            if words and words[0].lower() in cls.COMMANDS:
+                return False
+        return not cls._STATEFUL.search(query)
+
+    @classmethod
+    async def _add_worker(cls) -> None:
+        assert cls._idle is not None
+        worker = await _QalcWorker.spawn(cls._generation)
+        if sum(w.alive for w in cls._workers) >= cls.WORKERS:
+            # another task added one meanwhile
+            worker.kill()
+            return
+        cls._workers.append(worker)
+        cls._idle.put_nowait(worker)
+
+    @classmethod
+    async def _replace(cls, worker: _QalcWorker) -> None:
+        worker.kill()
+        if worker in cls._workers:
+            cls._workers.remove(worker)
+        if cls._idle is None:
+            # pool was shut down
+            return
+        try:
+            await cls._add_worker()
+        except Exception:
+            log.error(f"can't start qalc worker:\n{traceback.format_exc()}")
+
+    @classmethod
+    def _replace_soon(cls, worker: _QalcWorker) -> None:
+        task = asyncio.create_task(cls._replace(worker))
+        cls._replacing.add(task)
+        task.add_done_callback(cls._replacing.discard)
+
+    @classmethod
+    async def query(cls, query: str, timeout: Optional[float] = None) -> str:
+        """
+        Calculates <`query`> with an idle worker.
+
+        Returns:
+        --------
+        str:
+            the output of qalc
+
+        Raises:
+        -------
+        ValueError:
+            the query could not be calculated
+        asyncio.TimeoutError:
+            qalc took longer than <`timeout`> (defaults to `QalcPool.TIMEOUT`)
+        """
+        if cls._idle is None:
+            await cls.start()
+        assert cls._idle is not None
+        if cls._idle.empty() and not any(worker.alive for worker in cls._workers):
+            # every worker died or failed to start - nobody would release one
+            await cls._add_worker()
+        worker: _QalcWorker = await cls._idle.get()
+        try:
+            result = await asyncio.wait_for(worker.query(query), timeout=timeout or cls.TIMEOUT)
+        except ValueError:
+            cls._release(worker)
+            raise
+        except BaseException:
+            # stuck, dead or cancelled mid query - the output of the worker is out of sync
+            log.warning(f"replacing qalc worker after query {query!r}")
+            cls._replace_soon(worker)
+            raise
+        cls._release(worker)
+        return result
+
+    @classmethod
+    def _release(cls, worker: _QalcWorker) -> None:
+        assert cls._idle is not None
+        if worker.generation != cls._generation or not worker.alive:
+            cls._replace_soon(worker)
+        else:
+            cls._idle.put_nowait(worker)
+
+    @classmethod
+    async def refresh(cls) -> None:
+        """
+        Replaces all workers, that they load updated data (e.g. currencies).
+        Busy workers are replaced after their current query
+        """
+        if cls._idle is None:
+            return
+        cls._generation += 1
+        outdated = []
+        while not cls._idle.empty():
+            outdated.append(cls._idle.get_nowait())
+        for worker in outdated:
+            await cls._replace(worker)
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        for worker in cls._workers:
+            worker.kill()
+        cls._workers = []
+        cls._idle = None
@@ -30,6 +30,7 @@ from matplotlib.colors import cnames
 from ._logging import LoggingHandler, getLogger, getLevel 
 from . import ConfigProxy, ConfigType
 from . import Bash
+from . import HTTPClient
 
 T_STR_LIST = TypeVar("T_STR_LIST", list[str], str)
 T_INTERACTION_TYPE = TypeVar("T_INTERACTION_TYPE", bound=Union[ComponentInteraction, ModalInteraction])
@@ -77,11 +78,13 @@ class Inu(lightbulb.BotApp):
         from core.db import Database
         self.db = Database()
         self.db.bot = self
+        # pooled session for all REST wrappers
+        self.http_client = HTTPClient()
         self.data = Data()
         self.scheduler = AsyncIOScheduler()
         self.scheduler.start()
-        self._prefixes = {}
         self._default_prefix = self.conf.bot.DEFAULT_PREFIX
+        self.prefix_cache = PrefixCache(self)
         self.search = Search(self)
         self.shortcuts: "Shortcuts" = Shortcuts(bot=self)
         self.id_creator = IDCreator()
@@ -119,17 +122,10 @@ class Inu(lightbulb.BotApp):
     def prefixes_from(self, guild_id: Optional[int]) -> List[str]:
         if not guild_id:
             return [self._default_prefix, ""]
-        prefixes = self._prefixes.get(guild_id, None)
-        if not prefixes:
-            # insert guild into table
-            from core.db import Table
-            table = Table("guilds")
-            asyncio.create_task(
-                table.upsert(
-                    ["guild_id", "prefixes"], 
-                    [guild_id, [self._default_prefix]]
-                )
-            )
+        prefixes = self.prefix_cache.get(guild_id)
+        if prefixes is None:
+            # unknown guild - insert it once
+            self.prefix_cache.ensure_guild(guild_id)
         return prefixes or [self._default_prefix]
 
     def add_task(
@@ -366,6 +362,69 @@ class Data:
         self.lavalink: lavasnek_rs.Lavalink = None  # type: ignore
         self.preffered_music_search: Mapping[int, str] = {}
 
+class PrefixCache:
+    """
+    Cache of the prefixes of all guilds.
+
+    Guilds which are not stored yet get a negative entry and are inserted once.
+    Changes of prefixes have to be written through with `set`.
+    """
+    def __init__(self, bot: Inu):
+        self.bot = bot
+        self.log = getLogger(__name__, self.__class__.__name__)
+        # Mapping from guild_id to prefixes
+        self._prefixes: Dict[int, List[str]] = {}
+        # guilds which are not stored and are currently inserted
+        self._missing: Set[int] = set()
+        # running inserts - referenced, that they are not garbage collected
+        self._inserts: Set["asyncio.Task[None]"] = set()
+
+    def get(self, guild_id: int) -> Optional[List[str]]:
+        """
+        Returns:
+        --------
+        Optional[List[str]] :
+            the prefixes of <`guild_id`> or None if the guild is unknown
+        """
+        return self._prefixes.get(guild_id)
+
+    def set(self, guild_id: int, prefixes: List[str]) -> None:
+        """updates the cached prefixes of <`guild_id`>"""
+        self._prefixes[guild_id] = list(prefixes)
+        self._missing.discard(guild_id)
+
+    async def load(self) -> None:
+        """loads the prefixes of all stored guilds"""
+        records = await self.bot.db.fetch("SELECT guild_id, prefixes FROM guilds")
+        self._prefixes = {record["guild_id"]: list(record["prefixes"] or []) for record in records}
+        self.log.info(f"loaded prefixes of {len(self._prefixes)} guilds", prefix="init")
+
+    def ensure_guild(self, guild_id: int) -> None:
+        """inserts <`guild_id`> with the default prefix if it's not stored yet"""
+        if guild_id in self._prefixes or guild_id in self._missing:
+            return
+        self._missing.add(guild_id)
+        task = asyncio.create_task(self._insert_guild(guild_id))
+        self._inserts.add(task)
+        task.add_done_callback(self._inserts.discard)
+
+    async def _insert_guild(self, guild_id: int) -> None:
+        try:
+            record = await self.bot.db.row(
+                """
+                INSERT INTO guilds (guild_id, prefixes) VALUES ($1, $2)
+                ON CONFLICT (guild_id) DO UPDATE SET guild_id = EXCLUDED.guild_id
+                RETURNING prefixes
+                """,
+                guild_id, [self.bot._default_prefix]
+            )
+            self.set(guild_id, list(record["prefixes"] or []))
+        except Exception:
+            # next message will try again
+            self._missing.discard(guild_id)
+            self.log.error(f"failed to insert guild {guild_id}:\n{traceback.format_exc()}")
+
+
 class Configuration():
     """Wrapper for the config file"""
     def __init__(self, config: Mapping[str, Union[str, None]]):
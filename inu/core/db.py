@@ -6,7 +6,10 @@ from functools import wraps, update_wrapper
 import traceback
 from datetime import datetime, timedelta
 import re
-from collections import OrderedDict
+from collections import OrderedDict, deque
+import bisect
+import time
+from functools import lru_cache
 
 import aiofiles
 import asyncpg
@@ -18,7 +21,7 @@ if TYPE_CHECKING:
 
     from lightbulb import Bot
 
-__all__: Final[Sequence[str]] = ["Database"]
+__all__: Final[Sequence[str]] = ["Database", "Table", "WriteBuffer", "QueryStats"]
 
 from core import getLogger
 
@@ -46,15 +49,338 @@ def acquire(func: Callable[..., Any]) -> Callable[..., Any]:
         assert self.is_connected, "Not connected."
         self.calls += 1
         cxn: asyncpg.Connection
+        query = args[0] if args and isinstance(args[0], str) else func.__name__
+        requested = time.perf_counter()
         async with self._pool.acquire() as cxn:
-            async with cxn.transaction():
-                return await func(self, *args, _cxn=cxn, **kwargs)
+            started = time.perf_counter()
+            self.query_stats.record_pool_wait((started - requested) * 1000)
+            failed = False
+            result = None
+            try:
+                async with cxn.transaction():
+                    result = await func(self, *args, _cxn=cxn, **kwargs)
+                    return result
+            except Exception:
+                failed = True
+                raise
+            finally:
+                rows = len(result) if isinstance(result, list) else int(result is not None)
+                self.query_stats.record(
+                    query, (time.perf_counter() - started) * 1000, rows=rows, failed=failed
+                )
 
     return wrapper
 
 
+class StatementCache:
+    """
+    Caches the SQL of `Table` operations by (table, operation, column shape).
+
+    The prepared statements are cached by asyncpg itself per connection
+    (`statement_cache_size`), hence the same SQL string is reused here.
+    """
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._sql: OrderedDict[Tuple[Any, ...], str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def sql(self, key: Tuple[Any, ...], build: Callable[[], str]) -> str:
+        """
+        Returns the cached SQL for <`key`> or builds it with <`build`>
+        """
+        try:
+            sql = self._sql[key]
+            self._sql.move_to_end(key)
+            self.hits += 1
+            return sql
+        except KeyError:
+            pass
+        self.misses += 1
+        sql = build()
+        self._sql[key] = sql
+        if len(self._sql) > self.max_size:
+            self._sql.popitem(last=False)
+        return sql
+
+    def clear(self) -> None:
+        self._sql.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryStats:
+    """
+    Per query latency statistics.
+
+    Queries are grouped by their fingerprint (the SQL with literals replaced
+    and whitespace collapsed). Every fingerprint keeps counters, a fixed
+    bucket histogram and a ring buffer of the last latencies for percentiles.
+    The time spent waiting for a pooled connection is tracked separately.
+    """
+    BUCKETS: Final[Tuple[float, ...]] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+    _literal = re.compile(r"'(?:[^']|'')*'|(?<!\$)\b\d+(?:\.\d+)?\b")
+    _whitespace = re.compile(r"\s+")
+
+    class Entry:
+        __slots__ = ("count", "errors", "total", "max", "rows", "samples", "histogram")
+
+        def __init__(self, samples: int):
+            self.count = 0
+            self.errors = 0
+            self.total = 0.0
+            self.max = 0.0
+            self.rows = 0
+            self.samples: Deque[float] = deque(maxlen=samples)
+            self.histogram = [0] * len(QueryStats.BUCKETS)
+
+        def add(self, ms: float) -> None:
+            self.count += 1
+            self.total += ms
+            self.max = max(self.max, ms)
+            self.samples.append(ms)
+            self.histogram[bisect.bisect_left(QueryStats.BUCKETS, ms)] += 1
+
+        def percentile(self, p: float) -> float:
+            if not self.samples:
+                return 0.0
+            ordered = sorted(self.samples)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+        @property
+        def mean(self) -> float:
+            return self.total / self.count if self.count else 0.0
+
+    def __init__(self, max_queries: int = 512, samples: int = 256):
+        self.max_queries = max_queries
+        self.samples = samples
+        self.queries: OrderedDict[str, QueryStats.Entry] = OrderedDict()
+        self.pool_wait = QueryStats.Entry(samples)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def fingerprint(query: str) -> str:
+        """
+        Returns <`query`> with literals replaced by `?` and collapsed whitespace
+        """
+        query = QueryStats._literal.sub("?", query)
+        query = QueryStats._whitespace.sub(" ", query).strip()
+        return query[:300]
+
+    def _entry(self, query: str) -> "QueryStats.Entry":
+        key = self.fingerprint(query)
+        entry = self.queries.get(key)
+        if entry is None:
+            entry = self.queries[key] = QueryStats.Entry(self.samples)
+            if len(self.queries) > self.max_queries:
+                self.queries.popitem(last=False)
+        else:
+            self.queries.move_to_end(key)
+        return entry
+
+    def record(self, query: str, ms: float, rows: int = 0, failed: bool = False) -> None:
+        """
+        Records one call of <`query`> which took <`ms`> milliseconds
+        """
+        entry = self._entry(query)
+        entry.add(ms)
+        entry.rows += rows
+        if failed:
+            entry.errors += 1
+
+    def record_pool_wait(self, ms: float) -> None:
+        self.pool_wait.add(ms)
+
+    def slowest(self, amount: int = 10, key: str = "p95") -> List[Tuple[str, "QueryStats.Entry"]]:
+        """
+        Returns the <`amount`> slowest fingerprints.
+
+        Args:
+        -----
+        amount: int
+            how many fingerprints to return
+        key: str
+            one of `p95`, `mean`, `max` or `total`
+        """
+        def sort_key(item: Tuple[str, QueryStats.Entry]) -> float:
+            entry = item[1]
+            if key == "p95":
+                return entry.percentile(0.95)
+            return getattr(entry, key)
+        return sorted(self.queries.items(), key=sort_key, reverse=True)[:amount]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "query": query,
+                "calls": entry.count,
+                "errors": entry.errors,
+                "rows": entry.rows,
+                "mean_ms": entry.mean,
+                "p50_ms": entry.percentile(0.5),
+                "p95_ms": entry.percentile(0.95),
+                "p99_ms": entry.percentile(0.99),
+                "max_ms": entry.max,
+            }
+            for query, entry in self.queries.items()
+        ])
+
+    def clear(self) -> None:
+        self.queries.clear()
+        self.pool_wait = QueryStats.Entry(self.samples)
+
+
+class WriteBuffer:
+    """
+    Write-behind buffer for high frequency inserts into one table.
+
+    Rows are collected with `add` and written with one `executemany`
+    (or `COPY` if <`use_copy`> is set) as soon as <`max_rows`> are queued or 
+    <`flush_interval`> seconds passed since the first queued row.
+
+    When the database is not reachable, the rows are queued again - up to
+    <`max_queued`> rows, older ones are dropped after that.
+    """
+    # errors of the connection, not of the rows - the batch is tried again later
+    CONNECTION_ERRORS: Final[Tuple[Type[BaseException], ...]] = (
+        asyncpg.PostgresConnectionError,
+        asyncpg.InterfaceError,
+        OSError,
+        asyncio.TimeoutError,
+    )
+
+    def __init__(
+        self,
+        db: "Database",
+        table_name: str,
+        columns: Sequence[str],
+        on_conflict: str = "",
+        max_rows: int = 500,
+        flush_interval: float = 10.0,
+        use_copy: bool = False,
+        max_queued: int = 20_000,
+    ):
+        self.db = db
+        self.table_name = table_name
+        self.columns = list(columns)
+        self.on_conflict = on_conflict
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.use_copy = use_copy
+        self.max_queued = max_queued
+        self.log = getLogger(__name__, self.__class__.__name__, table_name)
+        self._rows: List[Tuple[Any, ...]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # set while the database is not reachable - only the timer flushes then
+        self._backoff = False
+        self.flushed_rows = 0
+        self.flushes = 0
+        self.dropped_rows = 0
+
+        values_chain = [f'${num}' for num in range(1, len(self.columns)+1)]
+        self.sql = (
+            f"INSERT INTO {self.table_name} ({', '.join(self.columns)})\n"
+            f"VALUES ({', '.join(values_chain)})\n"
+        )
+        if on_conflict:
+            self.sql += f"ON CONFLICT {on_conflict}\n"
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, *row: Any) -> None:
+        """
+        Queues a row. The values have to be in the same order as `columns`
+        """
+        if len(row) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} values for {self.columns}, got {len(row)}")
+        self._rows.append(row)
+        if len(self._rows) >= self.max_rows and not self._backoff:
+            self._flush_soon()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_soon)
+
+    def _requeue(self, rows: List[Tuple[Any, ...]]) -> None:
+        """puts <`rows`> in front of the queue and tries again after `flush_interval`"""
+        self._backoff = True
+        self._rows = rows + self._rows
+        if (overflow := len(self._rows) - self.max_queued) > 0:
+            del self._rows[:overflow]
+            self.dropped_rows += overflow
+            self.log.error(f"dropped {overflow} rows - queue is full")
+        self._schedule_flush()
+
+    def _flush_soon(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> int:
+        """
+        Writes all queued rows.
+
+        Returns:
+        --------
+        `int`:
+            the amount of written rows
+        """
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            try:
+                await self._write(rows)
+                written = len(rows)
+                self._backoff = False
+            except self.CONNECTION_ERRORS as e:
+                self.log.warning(f"can't write {len(rows)} rows - queued again: {e!r}")
+                self._requeue(rows)
+                return 0
+            except Exception:
+                # the database answered - one bad row shouldn't take the whole batch with it
+                self._backoff = False
+                self.log.warning(f"batch of {len(rows)} rows failed - retrying row by row:\n{traceback.format_exc()}")
+                written = 0
+                for i, row in enumerate(rows):
+                    try:
+                        await self.db.execute(self.sql, *row)
+                        written += 1
+                    except self.CONNECTION_ERRORS as e:
+                        self.log.warning(f"can't write {len(rows) - i} rows - queued again: {e!r}")
+                        self._requeue(rows[i:])
+                        break
+                    except Exception as e:
+                        self.dropped_rows += 1
+                        self.log.error(f"dropped row {row}: {e}")
+            self.flushes += 1
+            self.flushed_rows += written
+            if table_logging:
+                self.log.debug(f"flushed {written} rows")
+            return written
+
+    async def _write(self, rows: List[Tuple[Any, ...]]) -> None:
+        if self.use_copy:
+            await self.db.copy_records(self.table_name, rows, columns=self.columns)
+        else:
+            await self.db.execute_many(self.sql, rows)
+
+
 class Database(metaclass=Singleton):
-    __slots__: Sequence[str] = ("_bot", "_connected", "_pool", "calls", "log")
+    __slots__: Sequence[str] = (
+        "_bot", "_connected", "_pool", "calls", "statement_cache", "query_stats", "_write_buffers", "log"
+    )
     instance = None
 
     def __init__(self, bot: Optional["Inu"] = None) -> None:
@@ -65,6 +391,9 @@ class Database(metaclass=Singleton):
         self._bot: Inu #type: ignore
         self._connected = asyncio.Event()
         self.calls = 0
+        self.statement_cache = StatementCache()
+        self.query_stats = QueryStats()
+        self._write_buffers: Dict[Tuple[str, Tuple[str, ...]], WriteBuffer] = {}
         self.log = getLogger(__name__, self.__class__.__name__)
 
     async def wait_until_connected(self) -> None:
@@ -118,7 +447,9 @@ class Database(metaclass=Singleton):
 
     async def close(self) -> None:
         assert self.is_connected, "Not connected."
+        await self.flush_write_buffers()
         await self._pool.close()
+        self.statement_cache.clear()
         self._connected.clear()
         self.log.info("Closed database connection.")
 
@@ -137,6 +468,45 @@ class Database(metaclass=Singleton):
     async def execute_many(self, query: str, valueset: List[Any], _cxn: asyncpg.Connection) -> None:
         await _cxn.executemany(query, valueset)
 
+    @acquire
+    async def copy_records(
+        self, 
+        table_name: str, 
+        records: List[Tuple[Any, ...]], 
+        columns: Sequence[str], 
+        _cxn: asyncpg.Connection
+    ) -> str:
+        """Copies <`records`> into <`table_name`> using `COPY`"""
+        schema, _, table = table_name.rpartition(".")
+        return await _cxn.copy_records_to_table(
+            table, records=records, columns=list(columns), schema_name=schema or None
+        )
+
+    def write_buffer(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        **kwargs: Any,
+    ) -> WriteBuffer:
+        """
+        Returns the `WriteBuffer` for <`table_name`> and <`columns`>.
+        It will be created with <`kwargs`> if it doesn't exist yet.
+        """
+        key = (table_name, tuple(columns))
+        buffer = self._write_buffers.get(key)
+        if buffer is None:
+            buffer = WriteBuffer(self, table_name, columns, **kwargs)
+            self._write_buffers[key] = buffer
+        return buffer
+
+    async def flush_write_buffers(self) -> None:
+        """Writes all rows which are queued in write buffers"""
+        for buffer in self._write_buffers.values():
+            try:
+                await buffer.flush()
+            except Exception:
+                self.log.error(f"failed to flush {buffer.table_name}:\n{traceback.format_exc()}")
+
     @acquire
     async def val(self, query: str, *values: Any, column: int = 0, _cxn: asyncpg.Connection) -> Any:
         """Returns a value of the first row from a given query"""
@@ -158,6 +528,30 @@ class Database(metaclass=Singleton):
         """Executes and returns (if specified) a given `query`"""
         return await _cxn.fetch(query, *values)
 
+    @acquire
+    async def fetch_prepared(self, query: str, *values: Any, _cxn: asyncpg.Connection) -> List[asyncpg.Record]:
+        """
+        Like `fetch`. <`query`> should be a cached SQL string,
+        that the statement cache of the connection is hit
+        """
+        return await _cxn.fetch(query, *values)
+
+    @acquire
+    async def execute_prepared(self, query: str, *values: Any, _cxn: asyncpg.Connection) -> str:
+        """
+        Like `execute`. <`query`> should be a cached SQL string,
+        that the statement cache of the connection is hit
+        """
+        return await _cxn.execute(query, *values)
+
+    @property
+    def statement_cache_hits(self) -> int:
+        return self.statement_cache.hits
+
+    @property
+    def statement_cache_misses(self) -> int:
+        return self.statement_cache.misses
+
     @acquire
     async def execute_script(self, path: str, *args: Any, _cxn: asyncpg.Connection) -> None:
         async with aiofiles.open(path, "r") as script:
@@ -239,7 +633,7 @@ class Table():
         self.name = table_name
         self.db = Database()
         self.do_log = debug_log
-        self._executed_sql = ""
+        self._last_sql: Optional[Tuple[str, List]] = None
         self._as_dataframe: bool = False
         self._error_logging = error_log
     def return_as_dataframe(self, b: bool) -> None:
@@ -279,17 +673,20 @@ class Table():
                 new_columns.append(k)
             values, which_columns = new_values, new_columns
 
-        values_chain = [f'${num}' for num in range(1, len(values)+1)]
-        sql = (
-            f"INSERT INTO {self.name} ({', '.join(which_columns)})\n"
-            f"VALUES ({', '.join(values_chain)})\n" 
-        )
-        if on_conflict:
-            sql += f"ON CONFLICT {on_conflict}\n"
-        if returning:
-            sql += f"RETURNING {returning}\n"
+        def build() -> str:
+            values_chain = [f'${num}' for num in range(1, len(values)+1)]
+            sql = (
+                f"INSERT INTO {self.name} ({', '.join(which_columns)})\n"
+                f"VALUES ({', '.join(values_chain)})\n" 
+            )
+            if on_conflict:
+                sql += f"ON CONFLICT {on_conflict}\n"
+            if returning:
+                sql += f"RETURNING {returning}\n"
+            return sql
+        sql = self._sql(("insert", tuple(which_columns), returning, on_conflict), build)
         self._create_sql_log_message(sql, values)
-        return_values = await self.db.fetch(sql, *values)
+        return_values = await self.db.fetch_prepared(sql, *values)
         return return_values
 
     @logging()
@@ -313,26 +710,29 @@ class Table():
         if where:
             which_columns = list(where.keys())
             values = list(where.values())
-        values_chain = [f'${num}' for num in range(1, len(values)+1)]
-        update_set_query = ""
-        for i, item in enumerate(zip(which_columns, values_chain)):
-            if i == 0:
-                continue
-            update_set_query += f"{item[0]}={item[1]}, "
-        update_set_query = update_set_query[:-2]  # remove last ","
-        on_conflict_values = which_columns[0]
-        if compound_of:
-            on_conflict_values = ", ".join(c for c in which_columns[:compound_of])
-        sql = (
-            f"INSERT INTO {self.name} ({', '.join(which_columns)}) \n"
-            f"VALUES ({', '.join(values_chain)}) \n"
-            f"ON CONFLICT ({on_conflict_values}) DO UPDATE \n"
-            f"SET {update_set_query} \n"
-        )
-        if returning:
-            sql += f"RETURNING {returning} \n"
+        def build() -> str:
+            values_chain = [f'${num}' for num in range(1, len(values)+1)]
+            update_set_query = ""
+            for i, item in enumerate(zip(which_columns, values_chain)):
+                if i == 0:
+                    continue
+                update_set_query += f"{item[0]}={item[1]}, "
+            update_set_query = update_set_query[:-2]  # remove last ","
+            on_conflict_values = which_columns[0]
+            if compound_of:
+                on_conflict_values = ", ".join(c for c in which_columns[:compound_of])
+            sql = (
+                f"INSERT INTO {self.name} ({', '.join(which_columns)}) \n"
+                f"VALUES ({', '.join(values_chain)}) \n"
+                f"ON CONFLICT ({on_conflict_values}) DO UPDATE \n"
+                f"SET {update_set_query} \n"
+            )
+            if returning:
+                sql += f"RETURNING {returning} \n"
+            return sql
+        sql = self._sql(("upsert", tuple(which_columns), compound_of, returning), build)
         self._create_sql_log_message(sql, values)
-        return_values = await self.db.execute(sql, *values)
+        return_values = await self.db.execute_prepared(sql, *values)
         return return_values   
 
     @logging()
@@ -349,19 +749,22 @@ class Table():
         set : Dict[str, Any]
             the
         """
-        num_gen = (num for num in range(1,100))
-        update_set_query = ", ".join([f'{col_name}=${i}' for i, col_name in zip(num_gen, set.keys())])
-        next_ = next(num_gen) -1  # otherwise it would be one to high - python bug?
-        sql = (
-            f"UPDATE {self.name} \n"
-            f"SET {update_set_query} \n"
-            f"WHERE {self.__class__.create_where_statement([*where.keys()], dollar_start=next_)}\n"
-        )
-        if returning:
-            sql += f"RETURNING {returning} \n"
+        def build() -> str:
+            num_gen = (num for num in range(1,100))
+            update_set_query = ", ".join([f'{col_name}=${i}' for i, col_name in zip(num_gen, set.keys())])
+            next_ = next(num_gen) -1  # otherwise it would be one to high - python bug?
+            sql = (
+                f"UPDATE {self.name} \n"
+                f"SET {update_set_query} \n"
+                f"WHERE {self.__class__.create_where_statement([*where.keys()], dollar_start=next_)}\n"
+            )
+            if returning:
+                sql += f"RETURNING {returning} \n"
+            return sql
+        sql = self._sql(("update", tuple(set.keys()), tuple(where.keys()), returning), build)
         values = [*set.values(), *where.values()]
         self._create_sql_log_message(sql, values)
-        return_values = await self.db.execute(sql, *values)
+        return_values = await self.db.execute_prepared(sql, *values)
         return return_values   
 
     @logging()
@@ -380,16 +783,17 @@ class Table():
         if where:
             columns = [*where.keys()]
             matching_values = [*where.values()]
-        where = self.__class__.create_where_statement(columns)
-
-        sql = (
-            f"DELETE FROM {self.name}\n"
-            f"WHERE {where}\n"
-            f"RETURNING *"
+        sql = self._sql(
+            ("delete", tuple(columns)),
+            lambda: (
+                f"DELETE FROM {self.name}\n"
+                f"WHERE {self.__class__.create_where_statement(columns)}\n"
+                f"RETURNING *"
+            )
         )
         self._create_sql_log_message(sql, matching_values)
 
-        records = await self.db.fetch(sql, *matching_values)
+        records = await self.db.fetch_prepared(sql, *matching_values)
         return records
 
     @logging()
@@ -426,18 +830,20 @@ class Table():
             for k, v in where.items():
                 columns.append(k)
                 matching_values.append(v)
-        where_stmt = self.__class__.create_where_statement(columns)
-        sql = (
-            f"SELECT {select} FROM {self.name}\n"
-            f"WHERE {where_stmt}"
-        )
-        if order_by:
-            sql += f"\nORDER BY {order_by}"
+        def build() -> str:
+            sql = (
+                f"SELECT {select} FROM {self.name}\n"
+                f"WHERE {self.__class__.create_where_statement(columns)}"
+            )
+            if order_by:
+                sql += f"\nORDER BY {order_by}"
+            return sql
+        sql = self._sql(("select", tuple(columns), order_by, select), build)
         if additional_values:
             matching_values.extend(additional_values)
         self._create_sql_log_message(sql, matching_values)
 
-        records = await self.db.fetch(sql, *matching_values)
+        records = await self.db.fetch_prepared(sql, *matching_values)
         return records
 
     async def select_row(self, columns: List[str], matching_values: List, select: str = "*") -> Optional[asyncpg.Record]:
@@ -483,8 +889,23 @@ class Table():
             where += f"{'AND ' if i > 0 else ''}{item}=${i} "
         return where[4:]  # cut first and
     
+    def _sql(self, shape: Tuple[Any, ...], build: Callable[[], str]) -> str:
+        """
+        Returns the SQL for the operation <`shape`> of this table.
+        The SQL is only built with <`build`> if it's not cached yet.
+        """
+        return self.db.statement_cache.sql((self.name, *shape), build)
+
     def _create_sql_log_message(self, sql:str, values: List):
-        self._executed_sql = (
+        # formatted lazily - only needed when logging
+        self._last_sql = (sql, values)
+
+    @property
+    def _executed_sql(self) -> str:
+        if not self._last_sql:
+            return ""
+        sql, values = self._last_sql
+        return (
             f"SQL:\n"
             f"{sql}\n"
             f"WITH VALUES: {values}"
@@ -0,0 +1,218 @@
+from typing import *
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from . import Singleton, getLogger
+
+log = getLogger(__name__)
+
+__all__: Final[Sequence[str]] = ["HTTPClient", "APILimit"]
+
+
+class APILimit:
+    """
+    Concurrency limit and rate limit state of one API.
+
+    Args:
+    -----
+    name: str
+        name of the API, used for logs
+    concurrency: int
+        max requests which run at once against this API
+    max_retries: int
+        how often a request answered with 429 is retried
+    max_retry_after: float
+        longest Retry-After in seconds, which is waited for. Longer ones return the 429 response
+    """
+    def __init__(
+        self,
+        name: str,
+        concurrency: int = 8,
+        max_retries: int = 2,
+        max_retry_after: float = 30,
+    ):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # monotonic time until requests are blocked because of a 429
+        self._blocked_until: float = 0
+        self.requests = 0
+        self.rate_limited = 0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # created lazily, that it's bound to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def block(self, seconds: float) -> None:
+        """blocks all requests of this API for <`seconds`>"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def wait(self) -> None:
+        """waits until a 429 block is over"""
+        delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.requests} requests / {self.rate_limited} rate limited / {self.concurrency} concurrent"
+
+
+class HTTPClient(metaclass=Singleton):
+    """
+    One pooled `aiohttp.ClientSession` for all REST wrappers.
+
+    Connections are kept alive and reused per host, DNS lookups are cached.
+    Every API has an `APILimit` for its concurrency and 429 handling -
+    APIs are identified by the name given to `request` or by the host of the URL.
+    """
+    LIMIT: int = 100
+    LIMIT_PER_HOST: int = 10
+    DNS_TTL: int = 5 * 60
+    KEEPALIVE_TIMEOUT: float = 30
+    TIMEOUT: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=30, connect=10)
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._limits: Dict[str, APILimit] = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The shared session. Created on first use, that it's bound to the running loop
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.LIMIT,
+                limit_per_host=self.LIMIT_PER_HOST,
+                ttl_dns_cache=self.DNS_TTL,
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.TIMEOUT)
+        return self._session
+
+    def register_api(
+        self,
+        name: str,
+        concurrency: int = 8,
+        max_retries: int = 2,
+        max_retry_after: float = 30,
+    ) -> APILimit:
+        """
+        Sets the limits of the API <`name`>. See `APILimit` for the args.
+
+        Returns:
+        --------
+        APILimit:
+            the limit of the API
+        """
+        limit = APILimit(name, concurrency, max_retries, max_retry_after)
+        self._limits[name] = limit
+        return limit
+
+    def limit_of(self, name: str) -> APILimit:
+        """returns the `APILimit` of <`name`> - unknown APIs get the default limit"""
+        limit = self._limits.get(name)
+        if limit is None:
+            limit = self.register_api(name)
+        return limit
+
+    @property
+    def limits(self) -> List[APILimit]:
+        return list(self._limits.values())
+
+    @staticmethod
+    def _retry_after(resp: aiohttp.ClientResponse) -> float:
+        """
+        Returns the seconds to wait from the Retry-After header. Defaults to 1 second
+        """
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return 1.0
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            # HTTP-date
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return 1.0
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        api: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Makes a request with the shared session.
+
+        Args:
+        -----
+        method: str
+            the HTTP method
+        url: str
+            the url
+        api: str | None
+            the name of the API, which limits this request. Defaults to the host of <`url`>
+        **kwargs: Any
+            passed to `aiohttp.ClientSession.request`
+
+        Returns:
+        --------
+        AsyncContextManager[aiohttp.ClientResponse]:
+            the response. 429 responses are retried after Retry-After,
+            as long as the API allows it
+
+        Example:
+        --------
+        >>> async with HTTPClient().request("GET", url) as resp:
+        ...     data = await resp.json()
+        """
+        limit = self.limit_of(api or urlsplit(url).netloc)
+        async with limit.semaphore:
+            attempt = 0
+            while True:
+                await limit.wait()
+                limit.requests += 1
+                resp = await self.session.request(method, url, **kwargs)
+                if resp.status != 429 or attempt >= limit.max_retries:
+                    break
+                retry_after = self._retry_after(resp)
+                limit.rate_limited += 1
+                if retry_after > limit.max_retry_after:
+                    break
+                resp.release()
+                # other requests of this API wait too
+                limit.block(retry_after)
+                attempt += 1
+                log.warning(f"{limit.name} is rate limited - retrying in {retry_after:.1f}s")
+            try:
+                yield resp
+            finally:
+                resp.release()
+
+    def get(self, url: str, **kwargs: Any) -> AsyncContextManager[aiohttp.ClientResponse]:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> AsyncContextManager[aiohttp.ClientResponse]:
+        return self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """closes the session with all pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
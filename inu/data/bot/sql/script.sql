@@ -104,6 +104,40 @@ CREATE TABLE IF NOT EXISTS current_games (
     PRIMARY KEY (guild_id, game, timestamp)
 );
 
+-- rollups of current_games - maintained by the bot when snapshots are written
+CREATE TABLE IF NOT EXISTS current_games_hourly (
+    guild_id BIGINT NOT NULL,
+    game VARCHAR(100),
+    bucket TIMESTAMP NOT NULL,  -- start of the hour
+    user_amount BIGINT NOT NULL,
+    first_occurrence TIMESTAMP,
+    PRIMARY KEY (guild_id, game, bucket)
+);
+CREATE INDEX IF NOT EXISTS current_games_hourly_guild_bucket ON current_games_hourly (guild_id, bucket);
+
+CREATE TABLE IF NOT EXISTS current_games_daily (
+    guild_id BIGINT NOT NULL,
+    game VARCHAR(100),
+    bucket TIMESTAMP NOT NULL,  -- start of the day
+    user_amount BIGINT NOT NULL,
+    first_occurrence TIMESTAMP,
+    PRIMARY KEY (guild_id, game, bucket)
+);
+CREATE INDEX IF NOT EXISTS current_games_daily_guild_bucket ON current_games_daily (guild_id, bucket);
+
+-- backfill rollups once from the raw records
+INSERT INTO current_games_hourly (guild_id, game, bucket, user_amount, first_occurrence)
+SELECT guild_id, game, date_trunc('hour', timestamp), SUM(user_amount), MIN(timestamp)
+FROM current_games
+WHERE NOT EXISTS (SELECT 1 FROM current_games_hourly)
+GROUP BY 1, 2, 3;
+
+INSERT INTO current_games_daily (guild_id, game, bucket, user_amount, first_occurrence)
+SELECT guild_id, game, date_trunc('day', timestamp), SUM(user_amount), MIN(timestamp)
+FROM current_games
+WHERE NOT EXISTS (SELECT 1 FROM current_games_daily)
+GROUP BY 1, 2, 3;
+
 CREATE TABLE IF NOT EXISTS polls (
     poll_id SERIAL PRIMARY KEY,
     guild_id BIGINT NOT NULL,
@@ -31,6 +31,7 @@ from utils import (
     xkcdAPI,
 )
 from utils.shortcuts import display_name_or_id
+from utils.latex import evaluation_cache
 
 # conditional
 lavalink = None
@@ -281,6 +282,12 @@ async def status(ctx: context.Context):
     )
     embed.add_field(f"Daily DB calls", f"```py\n{bot.db.daily_queries.tail(7)}```", inline=False)
     embed.add_field(f"Hourly DB calls", f"```py\n{bot.db.hourly_queries.tail(24)}```", inline=False)
+    embed.add_field(
+        f"DB statement cache", 
+        f"{bot.db.statement_cache_hits} hits / {bot.db.statement_cache_misses} misses", 
+        inline=False
+    )
+    embed.add_field(f"LaTeX render cache", str(evaluation_cache), inline=False)
     embed.add_field(f"Guilds:", f"{len(bot.cache.get_guilds_view())}")
     await msg.edit(embed=embed, 
         components=[ 
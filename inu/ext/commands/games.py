@@ -20,7 +20,7 @@ from utils.games.connect_four_handler import (
 )
 from utils.games import HikariOnu
 from utils import AkinatorSI, Human
-from core import getLogger, Inu, get_context
+from core import getLogger, Inu, HTTPClient, get_context
 
 
 log = getLogger(__name__)
@@ -203,20 +203,19 @@ CREATE_SESSION_ENDPOINT = f"{REVERSI_BASE_URL}/create_session"
 async def reversi(ctx: Context):
     ctx = get_context(ctx.event)
     # make a get request to inuthebot.duckdns.org:8888/create_session
-    async with aiohttp.ClientSession() as session:
-        async with session.get(CREATE_SESSION_ENDPOINT, ssl=False) as resp:
-            if resp.status != 200:
-                return await ctx.respond("Something went wrong", ephemeral=True)
-            data = await resp.json()
-            await ctx.respond(
-                component=(
-                    MessageActionRowBuilder()
-                    .add_link_button(
-                        data['data']["link"], 
-                        label=f"Reversi Lobby Code: {data['data']['code']}"  
-                    )
-                )          
-            )
+    async with HTTPClient().get(CREATE_SESSION_ENDPOINT, ssl=False) as resp:
+        if resp.status != 200:
+            return await ctx.respond("Something went wrong", ephemeral=True)
+        data = await resp.json()
+        await ctx.respond(
+            component=(
+                MessageActionRowBuilder()
+                .add_link_button(
+                    data['data']["link"], 
+                    label=f"Reversi Lobby Code: {data['data']['code']}"  
+                )
+            )          
+        )
 
 
 
@@ -15,7 +15,7 @@ from lightbulb.context import Context
 from lightbulb.commands import Command, PrefixCommand, PrefixCommandGroup, CommandLike, PrefixSubCommand, PrefixSubGroup
 
 from core import Inu, getLogger
-from utils import Paginator, Colors
+from utils import Paginator, Colors, LazyPages
 
 log = getLogger(__name__)
 
@@ -194,8 +194,9 @@ class CustomHelp(help_command.BaseHelpCommand):
               The Dict inside the second List represents one field of the embed (mapping from name: value)
             - ctx: (Context) the context, to send the message(s)
         """
-        embeds = self.dicts_to_embeds(dicts)
-        pag = Paginator(page_s=embeds, timeout=500)
+        # embeds are built when they are viewed
+        pages = LazyPages(len(dicts), lambda i: self.dict_to_embed(dicts, i))
+        pag = Paginator(page_s=pages, timeout=500)
         await pag.start(ctx)
 
 
@@ -215,19 +216,34 @@ class CustomHelp(help_command.BaseHelpCommand):
         -------
             - (List[Embed]) the list with embeds
         """
-        embeds = []
-        for i, prebuild in enumerate(dicts):
-            name = prebuild[0]["group"]
-            embed = hikari.Embed()
-            if not small:
-                embed.title=f"Help {name}"
-                embed.set_footer(text=f"page {i+1}/{len(dicts)}", icon=self.bot.get_me().avatar_url)
-            # embed.description = "<...> required - I need it\n[...] optional - I don't need it"
-            for field in prebuild:
-                embed.add_field(field["sign"], field["description"])
-            embed.color = Colors.random_color()
-            embeds.append(embed)
-        return embeds
+        return [self.dict_to_embed(dicts, i, small=small) for i in range(len(dicts))]
+
+    def dict_to_embed(
+        self, 
+        dicts: List[List[Dict[str, str]]],
+        index: int,
+        small: bool = False,
+    ) -> hikari.Embed:
+        """
+        ### converts the prebuild with <`index`> of <`dicts`> to an embed
+
+        Args:
+        -----
+            - dicts (List[List[Dict[str, str]]]) the dict prebuild
+            - index (int) the index of the embed to build
+            - small (bool, default=True) wether the embed should have footer and title 
+        """
+        prebuild = dicts[index]
+        name = prebuild[0]["group"]
+        embed = hikari.Embed()
+        if not small:
+            embed.title=f"Help {name}"
+            embed.set_footer(text=f"page {index+1}/{len(dicts)}", icon=self.bot.get_me().avatar_url)
+        # embed.description = "<...> required - I need it\n[...] optional - I don't need it"
+        for field in prebuild:
+            embed.add_field(field["sign"], field["description"])
+        embed.color = Colors.random_color()
+        return embed
             
     
     def commands_to_dicts(self, commands: List[Command], ctx: Context) -> List[Dict[str, str]]:
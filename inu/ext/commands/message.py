@@ -25,7 +25,7 @@ import re
 from expiring_dict import ExpiringDict
 
 from core import getLogger, Inu, get_context, Bash, InuContext
-from utils import Human, calc, evaluation2image
+from utils import Human, calc, render_evaluation
 from utils import prepare_for_latex as replace_unsupported_chars, Paginator
 
 log = getLogger(__name__)
@@ -149,7 +149,7 @@ async def send_result(ctx: InuContext, result: str, calculation: str, base: str
     if base:
         embed.set_footer(f"result with base {base}")
     try:
-        image = evaluation2image(
+        image = await render_evaluation(
             prepare_for_latex(
                 result, 
             ),
@@ -40,6 +40,7 @@ from emoji import replace_emoji
 from core import Inu, get_context, InuContext, getLogger, BotResponseError
 from utils import (
     Paginator,
+    LazyPages,
     Colors, 
     Human, 
     MusicHistoryHandler, 
@@ -803,23 +804,21 @@ async def history(ctx: Context):
     if not ctx.guild_id:
         return
     history = await MusicHistoryHandler.get(ctx.guild_id)
-    embeds = []
-    embed = None
-    for i, record in enumerate(history):
-        if i % 20 == 0:
-            if not embed == None:
-                embeds.append(embed)
-            embed = Embed(
-                title=f"Music history {i} - {i+19}",
-                description="",
-            )
-        embed.description += f"{i} | [{record['title']}]({record['url']})\n"
-    if embed:
-        embeds.append(embed)
+    ITEMS_PER_SITE = 20
+
+    def build_page(index: int) -> Embed:
+        start = index * ITEMS_PER_SITE
+        return Embed(
+            title=f"Music history {start} - {start + ITEMS_PER_SITE - 1}",
+            description="".join(
+                f"{i} | [{record['title']}]({record['url']})\n" 
+                for i, record in enumerate(history[start:start + ITEMS_PER_SITE], start)
+            ),
+        )
     pag = MusicHistoryPaginator(
         history=history,
-        pages=embeds,
-        items_per_site=20,
+        pages=LazyPages(-(-len(history) // ITEMS_PER_SITE), build_page),
+        items_per_site=ITEMS_PER_SITE,
     )
     player = await PlayerManager.get_player(ctx.guild_id, ctx.event)
     # TODO params of player._play have changed
@@ -21,7 +21,7 @@ from expiring_dict import ExpiringDict
 from utils import crumble
 from utils import Paginator
 from utils.tree import tree as tree_
-from core import Inu, InuContext
+from core import Inu, InuContext, Database
 from utils import BaseReminder, HikariReminder, Reminders, Human, Multiple
 from utils.string_crumbler import NumberWordIterator as NWI
 from core import getLogger, get_context
@@ -195,6 +195,40 @@ async def log_(ctx: Context):
     paginator = Paginator(page_s=embeds, timeout=10*60, download=inu_log, default_page_index=-1)
     await paginator.start(ctx)
 
+@plugin.command
+@lightbulb.add_checks(lightbulb.owner_only)
+@lightbulb.option("amount", "how many queries to show", type=int, default=15)
+@lightbulb.option(
+    "sort", "what to sort by", default="p95", choices=["p95", "mean", "max", "total"]
+)
+@lightbulb.command("query-stats", "Shows the slowest database queries since start")
+@lightbulb.implements(commands.PrefixCommand, commands.SlashCommand)
+async def query_stats(ctx: Context):
+    """
+    Shows latency percentiles of the slowest query shapes and the pool wait time
+    """
+    options = ctx.options
+    ctx = get_context(ctx.event)
+    stats = Database().query_stats
+    wait = stats.pool_wait
+    header = (
+        f"pool wait: p50 `{wait.percentile(0.5):.1f}ms` | p95 `{wait.percentile(0.95):.1f}ms` "
+        f"| max `{wait.max:.1f}ms` ({wait.count} acquires)\n\n"
+    )
+    pages = []
+    slowest = stats.slowest(options.amount, key=options.sort)
+    for i in range(0, max(len(slowest), 1), 5):
+        description = header
+        for query, entry in slowest[i:i+5]:
+            description += (
+                f"```sql\n{query[:300]}```"
+                f"calls `{entry.count}` | errors `{entry.errors}` | rows `{entry.rows}`\n"
+                f"p50 `{entry.percentile(0.5):.1f}ms` | p95 `{entry.percentile(0.95):.1f}ms` "
+                f"| p99 `{entry.percentile(0.99):.1f}ms` | max `{entry.max:.1f}ms`\n"
+            )
+        pages.append(hikari.Embed(title="Query latency", description=description[:4000]))
+    await Paginator(page_s=pages, timeout=10*60).start(ctx)
+
 @plugin.command
 @lightbulb.add_checks(lightbulb.owner_only)
 @lightbulb.option("code", "The code I should execute", modifier=OM.CONSUME_REST)
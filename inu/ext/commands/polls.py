@@ -25,7 +25,7 @@ from fuzzywuzzy import fuzz
 from pytimeparse.timeparse import timeparse
 from hikari import TextInputStyle
 
-from utils import Colors, Human, Paginator, crumble, Poll, PollManager
+from utils import Colors, Human, Paginator, crumble, Poll, PollManager, PollStore
 from core import getLogger, Inu, Table, BotResponseError, InteractionContext
 # import Dataset
 
@@ -63,31 +63,25 @@ async def on_interaction_create(event: hikari.InteractionCreateEvent):
         log.debug("message id not in cache")
         return
 
-    record = await PollManager.fetch_poll(message_id=ctx_message_id)
-    if not record:
-        log.debug("no poll record found")
-        return
-
-    option_id = await PollManager.fetch_option_id(
-        record["poll_id"], 
-        letter
-    )
+    state = PollStore.by_message(ctx_message_id)
+    if not state:
+        # not loaded yet
+        record = await PollManager.fetch_poll(message_id=ctx_message_id)
+        if not record:
+            log.debug("no poll record found")
+            return
+        state = await PollStore.get_or_load(record["poll_id"])
+        if not state:
+            return
+
+    option_id = state.option_by_reaction.get(letter)
     if not option_id:
         log.debug("no option id found")
         return
-    
-    await PollManager.remove_vote(record["poll_id"], ictx.author.id)
-    # check if option in fetched record
-    # if yes update poll and insert to votes
-    await PollManager.add_vote(
-        poll_id=record["poll_id"], 
-        user_id=ictx.author.id, 
-        option_id=option_id,
-    )
-    # create poll object
-    poll = Poll(record, bot)
-    # update all poll values to the current status
-    await poll.fetch()
+    # updates the tally and queues the vote for the db
+    PollStore.vote(state.poll_id, ictx.author.id, option_id)
+    poll = Poll(state.record, bot)
+    poll.load_state(state)
     # dispatch the message
     await poll.dispatch_embed(ictx)
 
@@ -229,8 +223,7 @@ async def make_poll(ctx: context.SlashContext):
     poll = Poll(record, bot)
     await poll.fetch()
     await poll.dispatch_embed(ictx, content="")
-    if poll.expires < datetime.now() + timedelta(seconds=POLL_SYNC_TIME):
-        await poll.finalize()
+    poll.schedule_finalize()
 
 
 
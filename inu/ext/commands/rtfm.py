@@ -2,10 +2,14 @@ from doctest import DocTestSuite
 import traceback
 import typing
 from typing import (
+    Any,
+    Dict,
     Iterable,
     Union,
     Optional,
     List,
+    Tuple,
+    Counter,
 )
 import asyncio
 import logging
@@ -13,6 +17,11 @@ import re
 import zlib
 import io
 import os
+import json
+import time
+import heapq
+from array import array
+from bisect import bisect_left
 import ssl
 ssl._create_default_https_context = ssl._create_unverified_context
 
@@ -31,9 +40,9 @@ from fuzzywuzzy import fuzz
 from cachetools import LRUCache, cached
 
 from utils import Colors
-from utils import Paginator
+from utils import Paginator, single_flight
 
-from core import getLogger, Inu
+from core import getLogger, Inu, HTTPClient
 
 log = getLogger(__name__)
 
@@ -140,32 +149,148 @@ class SpecificSphinxFileReader(SphinxObjectFileReader):
 
         return result
 
-@cached(LRUCache(128*1024))
+class DocsIndex:
+    """
+    Search index over the names of one Sphinx inventory.
+
+    - prefix index: every name is stored once per word (split at `.`, `:`, `_`, ...)
+      as sorted list, hence prefixes of any word are found with a binary search
+    - trigram index: maps every trigram of the lowercased names to the names containing it.
+      Names sharing the most trigrams with the query are the candidates for fuzzy matching
+
+    Only the best candidates are scored with `fuzz.token_sort_ratio`.
+    """
+    MAX_PREFIX_HITS = 300
+    MAX_CANDIDATES = 200
+    _word_start = re.compile(r"(?:^|(?<=[.:_\-\s/]))\w")
+
+    def __init__(self, inventory: Dict[str, str]):
+        self.names: List[str] = list(inventory.keys())
+        lowered = [name.lower() for name in self.names]
+        # (suffix starting at a word, index of name)
+        prefixes: List[Tuple[str, int]] = []
+        trigrams: Dict[str, List[int]] = {}
+        for i, name in enumerate(lowered):
+            for match in self._word_start.finditer(name):
+                prefixes.append((name[match.start():], i))
+            for gram in {name[j:j + 3] for j in range(len(name) - 2)}:
+                trigrams.setdefault(gram, []).append(i)
+        prefixes.sort()
+        self._prefix_keys: List[str] = [key for key, _ in prefixes]
+        self._prefix_ids = array("I", (i for _, i in prefixes))
+        self._trigrams: Dict[str, array] = {gram: array("I", ids) for gram, ids in trigrams.items()}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _prefix_candidates(self, query: str) -> List[int]:
+        start = bisect_left(self._prefix_keys, query)
+        stop = bisect_left(self._prefix_keys, query + "\uffff", lo=start)
+        ids = dict.fromkeys(self._prefix_ids[start:min(stop, start + self.MAX_PREFIX_HITS)])
+        return list(ids)
+
+    def _trigram_candidates(self, query: str) -> List[int]:
+        grams = {query[j:j + 3] for j in range(len(query) - 2)}
+        counts: Counter[int] = Counter()
+        for gram in grams:
+            counts.update(self._trigrams.get(gram, ()))
+        if not counts:
+            return []
+        # most shared trigrams first, shorter names are closer to the query
+        best = heapq.nsmallest(
+            self.MAX_CANDIDATES,
+            counts.items(),
+            key=lambda item: (-item[1], len(self.names[item[0]])),
+        )
+        return [i for i, _ in best]
+
+    def search(self, search_for: str, limit: int = 24) -> List[Dict[str, Any]]:
+        """
+        Returns:
+        --------
+        List[Dict[str, Any]]:
+            dicts with the `item` (name) and its fuzzy `ratio`; best first.
+            Names containing <`search_for`> are preferred
+        """
+        query = search_for.lower()
+        if not query:
+            return [{"item": name, "ratio": 0} for name in self.names[:limit]]
+        candidates = dict.fromkeys(self._prefix_candidates(query))
+        candidates.update(dict.fromkeys(self._trigram_candidates(query)))
+        ratios = []
+        for i in candidates:
+            item = self.names[i]
+            r = fuzz.token_sort_ratio(search_for, item)
+            if r > 40 or search_for in item:
+                ratios.append({"item": item, "ratio": r})
+        if (new_r := [r for r in ratios if search_for in r["item"]]):
+            ratios = new_r
+        ratios.sort(key=lambda d: d["ratio"], reverse=True)
+        return ratios[:limit]
+
+
+class InventoryStore:
+    """
+    Stores parsed inventories on disk, that they are available right after a restart.
+
+    One file per docs as zlib compressed JSON with the inventory
+    and the ETag and Last-Modified of the response, for conditional refreshes
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json.z")
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns:
+        --------
+        Dict[str, Any] | None:
+            the stored entry with keys `url`, `etag`, `last_modified`, `fetched` and `inventory`
+            or None if there is no (valid) file
+        """
+        try:
+            with open(self._path(name), "rb") as f:
+                return json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, ValueError):
+            log.warning(f"stored inventory of {name} is broken:\n{traceback.format_exc()}")
+            return None
+
+    def save(self, name: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(name)
+        data = zlib.compress(json.dumps(entry, separators=(",", ":")).encode("utf-8"), 6)
+        # replace at once - a crash while writing must not break the stored inventory
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+
+
+inventory_store = InventoryStore(os.path.join(os.getcwd(), "inu/data/bot/rtfm"))
+_search_cache: LRUCache = LRUCache(16*1024)
+
+@cached(_search_cache)
 def search(search_for, docs: tuple, case_sensitive=True):
-    found = []
-    # if not case_sensitive:
-    #     search_for = search_for.lower()
-    # for item in iterable:
-    #     if (start := item.lower().find(search_for)) >= 0:
-    #         found.append((start, item))
-    iterable = [item for d in docs for item in plugin.d.rtfm_cache[plugin.d.docs[d]]]
     ratios = []
-    for item in iterable:
-        r = fuzz.token_sort_ratio(search_for, item)
-        if r > 40 or search_for in item:
-            ratios.append({"item": item, "ratio": r})
-    if (new_r := [r for r in ratios if search_for in r["item"]]):
-        ratios = new_r
-    def sort_key(tup):
-        return tup[0]
-
-    # return [name for distance, name in sorted(found, key=sort_key) if distance <= max_distance]
+    for d in docs:
+        index: Optional[DocsIndex] = plugin.d.rtfm_index.get(plugin.d.docs[d])
+        if index is not None:
+            ratios.extend(index.search(search_for))
     ratios.sort(key=lambda d: d["ratio"], reverse=True)
     return ratios[:24]
 
 
 plugin = lightbulb.Plugin("Read the FUCKING manual", "Extends the commands with rtfm commands", include_datastore=True)
 plugin.d.rtfm_cache = {}
+# docs url -> DocsIndex
+plugin.d.rtfm_index = {}
+# docs url -> {"etag": ..., "last_modified": ...} of the cached inventory
+plugin.d.rtfm_validators = {}
+# the background refresh on start - referenced, that it's not garbage collected
+plugin.d.rtfm_update_task = None
 plugin.d.docs = {
             'hikari-lightbulb': 'https://hikari-lightbulb.readthedocs.io/en/latest',
             'python': 'https://docs.python.org/3',
@@ -182,6 +307,10 @@ async def on_ready(event: lightbulb.LightbulbStartedEvent):
             return
     except Exception:
         log.error(traceback.format_exc())
+    if not plugin.d.rtfm_cache:
+        await _load_stored_inventories()
+    # only changed inventories are downloaded
+    plugin.d.rtfm_update_task = asyncio.create_task(_update_rtfm_cache())
     try:
         await asyncio.sleep(10)
         trigger = IntervalTrigger(hours=8)
@@ -242,24 +371,75 @@ async def send_manual(ctx, key: Union[str, list], obj):
     )
     await paginator.start(ctx)
 
+@single_flight()
 async def _update_rtfm_cache() -> None:
-    session = aiohttp.ClientSession(loop=asyncio.get_running_loop())
+    """
+    Downloads and indexes the inventories, which changed since the last update
+    """
+    updated = False
     for name, url in plugin.d.docs.items():
         try:
-            async with session.get(url + "/objects.inv") as resp:
+            headers = {}
+            if url in plugin.d.rtfm_cache and (validators := plugin.d.rtfm_validators.get(url)):
+                if validators.get("etag"):
+                    headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    headers["If-Modified-Since"] = validators["last_modified"]
+            async with HTTPClient().get(url + "/objects.inv", headers=headers) as resp:
+                if resp.status == 304:
+                    log.debug(f"inventory of {name} is up to date")
+                    continue
                 if resp.status != 200:
                     raise RuntimeError(f"{url} can't be fetched. Exited with Error code {resp.status}")
-                inv_file = SpecificSphinxFileReader(
-                    await resp.read(),
-                    url,
-                    auto=True,
-                )
-                plugin.d.rtfm_cache[url] = inv_file.result
+                data = await resp.read()
+                validators = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                }
+            # parsing and indexing the python inventory takes a while
+            result, index = await asyncio.to_thread(_parse_inventory, data, url)
+            plugin.d.rtfm_cache[url] = result
+            plugin.d.rtfm_index[url] = index
+            plugin.d.rtfm_validators[url] = validators
+            updated = True
+            await asyncio.to_thread(
+                inventory_store.save, 
+                name, 
+                {"url": url, "fetched": time.time(), "inventory": result, **validators}
+            )
         except Exception:
             log.error(traceback.format_exc())
-    await session.close()
+    if updated:
+        _search_cache.clear()
     return
 
+async def _load_stored_inventories() -> None:
+    """
+    Loads and indexes the inventories stored by `_update_rtfm_cache`
+    """
+    def load() -> Dict[str, Tuple[Dict[str, Any], DocsIndex]]:
+        loaded = {}
+        for name, url in plugin.d.docs.items():
+            entry = inventory_store.load(name)
+            if not entry or entry.get("url") != url:
+                continue
+            loaded[url] = (entry, DocsIndex(entry["inventory"]))
+        return loaded
+
+    for url, (entry, index) in (await asyncio.to_thread(load)).items():
+        plugin.d.rtfm_cache[url] = entry["inventory"]
+        plugin.d.rtfm_index[url] = index
+        plugin.d.rtfm_validators[url] = {
+            "etag": entry.get("etag"), 
+            "last_modified": entry.get("last_modified")
+        }
+    _search_cache.clear()
+    log.info(f"loaded {len(plugin.d.rtfm_index)} stored inventories", prefix="init")
+
+def _parse_inventory(data: bytes, url: str) -> Tuple[Dict[str, str], DocsIndex]:
+    inv_file = SpecificSphinxFileReader(data, url, auto=True)
+    return inv_file.result, DocsIndex(inv_file.result)
+
 @plugin.command
 @lightbulb.option("obj", "the thing you want to search")
 @lightbulb.command("rtfm", "read(s) the fucking manual", aliases=["rtfd"])
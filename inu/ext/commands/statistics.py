@@ -42,7 +42,8 @@ from utils import (
     SettingsManager,
     get_date_format_by_timedelta,
     ts_round,
-    Games
+    Games,
+    RenderPool,
 )
 from core import (
     BotResponseError, 
@@ -416,13 +417,31 @@ class GameViews:
 
         """
 
-        picture_buffer = BytesIO()
-
         df = await CurrentGamesManager.fetch_activities(
             guild_id=guild_id, 
             since=datetime.now() - since,
             activity_filter=activities,
+            # longer ranges are resampled to at least hours anyway
+            resolution=timedelta(hours=1) if since >= timedelta(days=4) else None,
+        )
+        tz = await TimezoneManager.fetch_timezone(guild_or_author_id=guild_id)
+        png, df_summarized = await RenderPool.render(
+            self._render_activity_graph, guild_id, df, activities, distinguishable_colors, tz
         )
+        return BytesIO(png), df_summarized
+
+    def _render_activity_graph(
+        self,
+        guild_id: int,
+        df: pd.DataFrame,
+        activities: List[str],
+        distinguishable_colors: bool,
+        tz: Any,
+    ) -> Tuple[bytes, Dataset]:
+        """
+        Resamples the activities of <`df`> and draws the graph. Runs in a `RenderPool` worker
+        """
+        picture_buffer = BytesIO()
         old_row_amount = len(df.index)
         # drop NaN values (r_timestamp bc of rounding issues)
         df.dropna(axis=0, how='any', subset=None, inplace=True)
@@ -586,7 +605,6 @@ class GameViews:
 
         # set date formatter with guild tz
         date_format = get_date_format_by_timedelta(df_timedelta)
-        tz = await TimezoneManager.fetch_timezone(guild_or_author_id=guild_id)
         date_form = DateFormatter(date_format, tz=tz)
         ax.xaxis.set_major_formatter(date_form)
 
@@ -604,8 +622,7 @@ class GameViews:
         # save chart
         figure = fig.get_figure()    
         figure.savefig(picture_buffer, dpi=100)
-        picture_buffer.seek(0)
-        return picture_buffer, df_summarized
+        return picture_buffer.getvalue(), df_summarized
 
 
     async def build_week_activity_chart(
@@ -631,7 +648,17 @@ class GameViews:
             datetime.now() - since,
             ignore_activities=remove,
         )
+        png, df = await RenderPool.render(self._render_week_activity_chart, df, since)
+        return BytesIO(png), df
 
+    def _render_week_activity_chart(
+        self,
+        df: pd.DataFrame,
+        since: timedelta,
+    ) -> Tuple[bytes, Dataset]:
+        """
+        Adds the mean lines to <`df`> and draws the chart. Runs in a `RenderPool` worker
+        """
         #rolling_mean_days = 3
         mean_hours = df["hours"].median()
         
@@ -699,8 +726,7 @@ class GameViews:
         # save graph
         figure = fig.get_figure()    
         figure.savefig(picture_buffer, dpi=100)
-        picture_buffer.seek(0)
-        return picture_buffer, df
+        return picture_buffer.getvalue(), df
 
 
 
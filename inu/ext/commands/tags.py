@@ -40,8 +40,11 @@ from utils import (
     TagHandler, Tag,
     add_row_when_filled, 
     TagCustomID,
+    CustomID,
+    CustomIDCodec,
     mockup_action_row
 )
+from utils.paginators.custom_id_codec import UINT
 from utils.paginators.base import navigation_row
 from core import (
     Inu,
@@ -129,6 +132,8 @@ class CheckForTagType:
         return ctx
 
 
+CustomIDCodec.register("stl-tag", 3, tid=UINT)
+
 class TagPaginator(StatelessPaginator):
     def __init__(self, tag: Tag, **kwargs):
         self.tag = tag
@@ -161,8 +166,7 @@ class TagPaginator(StatelessPaginator):
                 )
                     .set_tag_id(self.tag.id)
                     .set_position(0)
-                    .serialize_custom_id()
-                    .as_json(),
+                    .encode(),
                 label=f"Edit {tag.name} instead",
                 emoji="📝"
             )
@@ -213,10 +217,10 @@ async def on_tag_paginator_interaction(event: hikari.InteractionCreateEvent):
     if not isinstance(event.interaction, hikari.ComponentInteraction):
         return
     tag_id: Optional[int] = None
+    custom_id = CustomID.from_custom_id(event.interaction.custom_id)
     try:
-        custom_id = json.loads(event.interaction.custom_id)
-        if not custom_id["t"] == "stl-tag": return
-        if not (tag_id := custom_id.get("tid")) is not None: return
+        if not custom_id.type == "stl-tag": return
+        if not (tag_id := custom_id.get("tid")) is not None: return  # type: ignore
     except:
         return
     
@@ -10,11 +10,10 @@ import hikari
 import apscheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
-from utils import AutoroleManager, AutoroleAllEvent, VoiceActivityEvent, VoiceAutoroleCache, Human
+from utils import AutoroleManager, AutoroleAllEvent, AutoroleRegistry, VoiceActivityEvent, Human
 from core import Table, getLogger, Inu
 
 log = getLogger(__name__)
-METHOD_SYNC_TIME: int = 60*10
 SYNCING = False
 bot: Inu
 plugin = lightbulb.Plugin("poll loader", "loads polls from database")
@@ -29,27 +28,21 @@ async def load_tasks(event: hikari.ShardReadyEvent):
     else:
         SYNCING = True
     await asyncio.sleep(3)
-    await remove_expired_autoroles()
-
-    trigger = IntervalTrigger(seconds=METHOD_SYNC_TIME)
-    plugin.bot.scheduler.add_job(remove_expired_autoroles, trigger)
-    logging.getLogger('apscheduler.executors.default').setLevel(logging.WARNING)
+    await schedule_autorole_expiries()
     await init_method()
 
 
 
 async def init_method():
-    await VoiceAutoroleCache.sync()
+    await AutoroleRegistry.load()
 
 
 
-async def remove_expired_autoroles():
-    """removes expired autoroles"""
+async def schedule_autorole_expiries():
+    """schedules the expiry of all autoroles in the database"""
     try:
-        log.debug("removing expired autoroles", prefix="task")
-        number = await AutoroleManager.remove_expired_autoroles(expires_in=METHOD_SYNC_TIME)
-        if number > 0:
-            log.info(f"removed {Human.plural_('expired autorole', number)}", prefix="task")
+        number = await AutoroleManager.schedule_expiries()
+        log.info(f"scheduled the expiry of {Human.plural_('autorole', number)}", prefix="task")
     except Exception:
         log.warning(traceback.format_exc())
 
@@ -58,7 +51,7 @@ async def remove_expired_autoroles():
 @plugin.listener(hikari.MemberCreateEvent)
 async def on_member_join(event: hikari.MemberCreateEvent):
     """used to call the default role callback"""
-    events = await AutoroleManager.fetch_events(event.guild_id, AutoroleAllEvent)
+    events = await AutoroleRegistry.get(event.guild_id, AutoroleAllEvent)
     log.debug(f"found {len(events)} events for guild {event.guild_id}", prefix="task")
     tasks: List[asyncio.Task] = []
     for task in events:
@@ -86,18 +79,12 @@ async def on_voice_state_update(event: hikari.VoiceStateUpdateEvent):
         # nor a join or a leave event
         return
     
-    if not event.guild_id in VoiceAutoroleCache:
-        # to prevent to many db calls
-        log.debug(f"guild {event.guild_id} not in VoiceAutoroleCache", prefix="task")
+    events = await AutoroleRegistry.get(event.guild_id, VoiceActivityEvent)
+    if not events:
         return
-    events: List[VoiceActivityEvent] = await AutoroleManager.fetch_events(event.guild_id, VoiceActivityEvent)
     log.debug(f"found {len(events)} events for guild {event.guild_id}", prefix="task")
-    tasks: List[asyncio.Task] = []
-    for task in events:
-        tasks.append(asyncio.create_task(
-            task.renew_user_duration(event.state.user_id, event.guild_id)
-        ))
-    await asyncio.gather(*tasks)
+    # one upsert for all voice autoroles of the member, written together with others
+    AutoroleManager.queue_renewal(event.guild_id, event.state.user_id)
 
 
 def load(inu: Inu):
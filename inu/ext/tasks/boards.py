@@ -26,6 +26,8 @@ from utils import make_message_link, Colors, Multiple, Human
 
 log = getLogger(__name__)
 BOARD_SYNC_TIME = 60*60*24
+# seconds in which reaction events of a message are collected before they are applied
+REACTION_DEBOUNCE = 3
 SYNCING = False
 bot: Inu
 
@@ -59,78 +61,87 @@ async def clean_boards():
             f"WHERE created_at < $1"
         ), max_age
     )
+    BoardManager.clear_entry_cache()
     if records:
         log.info(f"deleted {Human.plural_('board-entry', len(records), with_number=True)}", prefix="task")
 
+class ReactionBatch:
+    """Reaction changes of one (guild, message, emoji) which are not written yet"""
+    def __init__(self, channel_id: int):
+        self.channel_id = channel_id
+        self.added: Set[int] = set()
+        self.removed: Set[int] = set()
+        self.last_user_id: Optional[int] = None
+
+    def add(self, user_id: int):
+        self.removed.discard(user_id)
+        self.added.add(user_id)
+        self.last_user_id = user_id
+
+    def remove(self, user_id: int):
+        self.added.discard(user_id)
+        self.removed.add(user_id)
+        self.last_user_id = user_id
+
+
+class ReactionAggregator:
+    """
+    Coalesces reaction events of a (guild, message, emoji) which arrive within
+    <`REACTION_DEBOUNCE`> seconds into one DB write batch and one board message edit.
+    """
+    _pending: Dict[Tuple[int, int, str], ReactionBatch] = {}
+    _locks: Dict[Tuple[int, int, str], asyncio.Lock] = {}
+    # running flushes - referenced, that they are not garbage collected
+    _tasks: Set["asyncio.Task[None]"] = set()
+
+    @classmethod
+    def batch(cls, guild_id: int, message_id: int, emoji: str, channel_id: int) -> ReactionBatch:
+        key = (guild_id, message_id, emoji)
+        if (batch := cls._pending.get(key)) is None:
+            batch = ReactionBatch(channel_id)
+            cls._pending[key] = batch
+            asyncio.get_running_loop().call_later(
+                REACTION_DEBOUNCE, cls._flush_soon, key
+            )
+        return batch
+
+    @classmethod
+    def _flush_soon(cls, key: Tuple[int, int, str]) -> None:
+        task = asyncio.create_task(cls.flush(key))
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    def is_pending(cls, guild_id: int, message_id: int, emoji: str) -> bool:
+        return (guild_id, message_id, emoji) in cls._pending
+
+    @classmethod
+    async def flush(cls, key: Tuple[int, int, str]):
+        lock = cls._locks.setdefault(key, asyncio.Lock())
+        try:
+            # a running flush of the same message has to finish first (board message creation)
+            async with lock:
+                if (batch := cls._pending.pop(key, None)) is None:
+                    return
+                await apply_reaction_batch(*key, batch)
+        except Exception:
+            log.error(f"failed to apply reactions of {key}:\n{traceback.format_exc()}")
+        finally:
+            if not lock.locked() and key not in cls._pending:
+                cls._locks.pop(key, None)
+
+
 @plugin.listener(hikari.GuildReactionAddEvent)
 async def on_reaction_add(event: hikari.GuildReactionAddEvent):
     log.debug(f"REACTION ADD receiving: {event.emoji_name}")
-    # insert to board
-
     # guild has no board with this reaction
     if not BoardManager.has_emoji(event.guild_id, event.emoji_name):
         log.debug(f"emoji not tracked")
         return
-    
-    message: Optional[hikari.Message] = None
-    entry = await BoardManager.fetch_entry(event.message_id, event.emoji_name)
-    if not entry:
-        log.debug(f"no entry found => add entry")
-        message = await bot.rest.fetch_message(event.channel_id, event.message_id)
-        if not message:
-            log.debug(f"reaction message not found")
-            return
-        attachment_urls = [str(a.url) for a in message.attachments]
-        content = message.content or ""
-        # add first embed to content
-        if len(message.embeds) > 0:
-            if message.embeds[0].title:
-                content += f"\n**{message.embeds[0].title}**"
-            if message.embeds[0].description:
-                content += f"\n{message.embeds[0].description}"
-            if message.embeds[0].image:
-                attachment_urls.append(str(message.embeds[0].image.url))
-        # put picture things in front. Otherwise Python bug
-        attachment_urls.sort(key=lambda a: Multiple.endswith_(a, [".jpg", ".png", ".webp"]), reverse=True)
-        if not message:
-            log.debug("message not found")
-            return
-        # add entry
-        entry = (await BoardManager.add_entry(
-            guild_id=event.guild_id,
-            message_id=event.message_id,
-            author_id=message.author.id or event.user_id,
-            channel_id=message.channel_id,
-            emoji=event.emoji_name,
-            content=content,
-            attachment_urls=attachment_urls,
-        ))[0]
-
-    # add a reaction
-    log.debug(f"{entry=}")
-    log.debug("add a reaction to db")
-    try:
-        await BoardManager.add_reaction(
-            guild_id=event.guild_id,
-            message_id=event.message_id,
-            reacter_id=event.user_id,
-            emoji=event.emoji_name,
-        )
-    except asyncpg.UniqueViolationError:
-        log.debug(f"Violation error - reaction was already added")
-    try:
-        await update_message(entry, message, optional_author_id=event.user_id)
-    except hikari.NotFoundError as e:
-        if not e.code == 10003:
-            # not a unknown channel
-            return
-        log.info(f"[Deleted] {event.emoji_name}-baord in guild {event.guild_id} because of unknown channel")
-        await BoardManager.remove_board(event.guild_id, event.emoji_name)
-
-
-
+    ReactionAggregator.batch(
+        event.guild_id, event.message_id, event.emoji_name, event.channel_id
+    ).add(event.user_id)
 
-    # method for updating a message in a board
 
 @plugin.listener(hikari.GuildReactionDeleteEvent)
 async def on_reaction_remove(event: hikari.GuildReactionDeleteEvent):
@@ -144,37 +155,96 @@ async def on_reaction_remove(event: hikari.GuildReactionDeleteEvent):
         log.debug(f"emoji not tracked")
         return
 
-    # board don't has this message -> create entry
-    if not BoardManager.has_message_id(event.guild_id, event.emoji_name, event.message_id):
+    # board don't has this message
+    if (
+        not BoardManager.has_message_id(event.guild_id, event.emoji_name, event.message_id)
+        and not ReactionAggregator.is_pending(event.guild_id, event.message_id, emoji)
+    ):
         log.debug(f"message not tracked")
         return
-    try:
-        removed_records = await BoardManager.remove_reaction(
-            guild_id=event.guild_id,
-            message_id=event.message_id,
-            reacter_id=event.user_id,
-            emoji=event.emoji_name,
-        )
-    except Exception:
-        log.warning(f"insertion error, which shouldn't occure.\n{traceback.format_exc()}")
-    # TODO: when a message has no reactions any more, delete it 
-    # (db will be cleared automatically -> when updating message results in error, delete message)
-    if not removed_records:
-        return
-    
-    if (amount := await BoardManager.fetch_entry_reaction_amount(event.message_id, emoji)) == 0:
+    ReactionAggregator.batch(
+        event.guild_id, event.message_id, emoji, event.channel_id
+    ).remove(event.user_id)
+
+
+async def create_entry(guild_id: int, channel_id: int, message_id: int, emoji: str, user_id: Optional[int]):
+    """
+    Creates a board entry for a message
+
+    Returns:
+    --------
+    Tuple[Optional[Dict[str, Any]], Optional[hikari.Message]] :
+        the entry and the original message or (None, None) if the message was not found
+    """
+    message = await bot.rest.fetch_message(channel_id, message_id)
+    if not message:
+        log.debug(f"reaction message not found")
+        return None, None
+    attachment_urls = [str(a.url) for a in message.attachments]
+    content = message.content or ""
+    # add first embed to content
+    if len(message.embeds) > 0:
+        if message.embeds[0].title:
+            content += f"\n**{message.embeds[0].title}**"
+        if message.embeds[0].description:
+            content += f"\n{message.embeds[0].description}"
+        if message.embeds[0].image:
+            attachment_urls.append(str(message.embeds[0].image.url))
+    # put picture things in front. Otherwise Python bug
+    attachment_urls.sort(key=lambda a: Multiple.endswith_(a, [".jpg", ".png", ".webp"]), reverse=True)
+    entry = (await BoardManager.add_entry(
+        guild_id=guild_id,
+        message_id=message_id,
+        author_id=message.author.id or user_id,
+        channel_id=message.channel_id,
+        emoji=emoji,
+        content=content,
+        attachment_urls=attachment_urls,
+    ))[0]
+    return entry, message
+
+
+async def apply_reaction_batch(guild_id: int, message_id: int, emoji: str, batch: ReactionBatch):
+    """
+    Writes the reaction changes of <`batch`> and updates the board message once
+    """
+    message: Optional[hikari.Message] = None
+    entry = await BoardManager.fetch_entry(message_id, emoji)
+    if not entry:
+        if not batch.added:
+            return
+        log.debug(f"no entry found => add entry")
+        entry, message = await create_entry(guild_id, batch.channel_id, message_id, emoji, batch.last_user_id)
+        if not entry:
+            return
+
+    log.debug(f"{entry=}; +{len(batch.added)} -{len(batch.removed)} reactions")
+    if batch.added:
+        await BoardManager.add_reactions(guild_id, message_id, batch.added, emoji)
+    if batch.removed:
+        await BoardManager.remove_reactions(message_id, batch.removed, emoji)
+
+    if (amount := await BoardManager.fetch_entry_reaction_amount(message_id, emoji)) == 0:
         # delete board entry
         log.debug(f"entry has {amount} reactions -> removing it")
-        entry = await BoardManager.remove_entry(event.message_id, emoji)
-        if not entry:
-            log.debug(f"No entry was deleted ")
+        removed = await BoardManager.remove_entry(message_id, emoji)
+        if not removed or not removed[0]["board_message_id"]:
             return
-        board = await BoardManager.fetch_board(event.guild_id, emoji)
-        await bot.rest.delete_message(board["channel_id"], entry[0]["board_message_id"])
-        log.debug(f"message {entry[0]['board_message_id']} deleted")
-    else:
-        entry = await BoardManager.fetch_entry(event.message_id, emoji)
-        await update_message(entry, reaction_amount=amount, optional_author_id=event.user_id)
+        board = await BoardManager.fetch_board(guild_id, emoji)
+        await bot.rest.delete_message(board["channel_id"], removed[0]["board_message_id"])
+        log.debug(f"message {removed[0]['board_message_id']} deleted")
+        return
+
+    if not entry["board_message_id"] and not message:
+        message = await bot.rest.fetch_message(entry["channel_id"], message_id)
+    try:
+        await update_message(entry, message, reaction_amount=amount, optional_author_id=batch.last_user_id)
+    except hikari.NotFoundError as e:
+        if not e.code == 10003:
+            # not a unknown channel
+            return
+        log.info(f"[Deleted] {emoji}-baord in guild {guild_id} because of unknown channel")
+        await BoardManager.remove_board(guild_id, emoji)
 
 
 
@@ -255,9 +325,10 @@ async def update_message(
     embeds.append(embed)
 
     # move attachment pics into embeds
-    if (attachments:=board_entry['attachment_urls']):
+    attachment_urls: List[str] = list(board_entry['attachment_urls'] or [])
+    if (attachments:=list(attachment_urls)):
         to_remove: List[str] = []
-        for attachment in board_entry['attachment_urls']:
+        for attachment in attachments:
             if Multiple.endswith_(attachment, [".jpg", ".png", ".webp"]):
                 if len(to_remove) == 0:
                     embeds[0].set_image(attachments[0])
@@ -269,7 +340,7 @@ async def update_message(
                 embeds.append(embed)
                 to_remove.append(attachment)
         for r_attachment in to_remove:
-            board_entry['attachment_urls'].remove(r_attachment)
+            attachment_urls.remove(r_attachment)
 
     if not board_entry["board_message_id"]:
         # create new message and add message_id to entry
@@ -279,7 +350,7 @@ async def update_message(
             )
 
         kwargs = {
-            "attachments": board_entry['attachment_urls'],
+            "attachments": attachment_urls,
             "embeds": embeds,
             "content": reaction_content,
             # "components": message.components,
@@ -14,12 +14,11 @@ import lightbulb
 from lightbulb import Plugin
 import apscheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from asyncpg import StringDataRightTruncationError
 
 from utils import Reddit
 from core.db import Database
 from core import Inu
-from utils import CurrentGamesManager, Games
+from utils import CurrentGamesManager, Games, SettingsManager
 from utils import Columns as Col
 
 
@@ -37,40 +36,130 @@ plugin = lightbulb.Plugin(
 games: Dict[int, Dict[str, int]] = {}
 banned_act_names = ["Custom Status", "Hang Status"]
 
+# max concurrent REST member crawls, when a guild is not cached
+REST_FALLBACK_CONCURRENCY = 4
+
+
+def activity_name(activity: hikari.RichActivity) -> Optional[str]:
+    """
+    Returns:
+    --------
+    Optional[str] :
+        the name under which the activity is stored or None if it should be ignored
+    """
+    act_name = activity.name
+    if act_name in banned_act_names:
+        return None
+    if act_name in Games.EMULATORS and activity.details:
+        # if the activity is an emulator, add the game name to the activity name
+        # format: "Game (Emulator)"
+        game_name = activity.details.splitlines()[0]
+        if game_name.startswith("Playing "):
+            game_name = game_name[8:]
+        act_name = f"{game_name} ({act_name})"
+    return act_name
+
+
+def count_activities(presences: Iterable[hikari.MemberPresence]) -> Dict[str, int]:
+    """
+    Returns:
+    --------
+    Dict[str, int] :
+        Mapping from activity name to amount of users doing it
+    """
+    counter: Dict[str, int] = {}
+    for presence in presences:
+        for activity in presence.activities:
+            if not (act_name := activity_name(activity)):
+                continue
+            counter[act_name] = counter.get(act_name, 0) + 1
+    return counter
+
+
+def cached_presences(bot: Inu, guild_id: int) -> Optional[List[hikari.MemberPresence]]:
+    """
+    Returns:
+    --------
+    Optional[List[hikari.MemberPresence]] :
+        the presences of all non bot members of <`guild_id`> 
+        or None if the guild is not cached
+    """
+    if not bot.cache.get_available_guild(guild_id):
+        return None
+    presences = []
+    for user_id, presence in bot.cache.get_presences_view_for_guild(guild_id).items():
+        member = bot.cache.get_member(guild_id, user_id)
+        if member and member.is_bot:
+            continue
+        presences.append(presence)
+    return presences
+
+
+async def rest_presences(bot: Inu, guild_id: int, semaphore: asyncio.Semaphore) -> List[hikari.MemberPresence]:
+    """fallback for `cached_presences` - fetches the members with REST"""
+    async with semaphore:
+        members = await bot.rest.fetch_members(guild_id)
+    return [
+        presence for member in members 
+        if not member.is_bot and (presence := member.get_presence())
+    ]
+
+
+async def fetch_activity_snapshot(bot: Inu) -> Dict[int, Dict[str, int]]:
+    """
+    Builds the current activities of all guilds with activity tracking enabled.
+    Presences are taken from the cache. Only tracked guilds which are not available
+    in the cache are crawled with REST.
+
+    Returns:
+    --------
+    Dict[int, Dict[str, int]] :
+        Mapping from guild_id to a mapping from activity name to amount of users doing it
+    """
+    tracking = await SettingsManager.fetch_activity_tracking_all()
+    guild_ids = [guild_id for guild_id, enabled in tracking.items() if enabled]
+
+    snapshot: Dict[int, Dict[str, int]] = {}
+    not_cached: List[int] = []
+    for guild_id in guild_ids:
+        presences = cached_presences(bot, guild_id)
+        if presences is None:
+            not_cached.append(guild_id)
+            continue
+        if (counter := count_activities(presences)):
+            snapshot[guild_id] = counter
+
+    if not_cached:
+        # unavailable guilds (outage, startup) - skip guilds the bot is not in anymore
+        member_of = {guild.id for guild in await bot.rest.fetch_my_guilds()}
+        not_cached = [guild_id for guild_id in not_cached if guild_id in member_of]
+    if not_cached:
+        log.debug(f"{len(not_cached)} guilds not cached - fetching members with REST", prefix="task")
+        semaphore = asyncio.Semaphore(REST_FALLBACK_CONCURRENCY)
+        results = await asyncio.gather(
+            *[rest_presences(bot, guild_id, semaphore) for guild_id in not_cached],
+            return_exceptions=True,
+        )
+        for guild_id, presences in zip(not_cached, results):
+            if isinstance(presences, BaseException):
+                log.warning(f"failed to fetch members of {guild_id}: {presences}", prefix="task")
+                continue
+            if (counter := count_activities(presences)):
+                snapshot[guild_id] = counter
+    return snapshot
+
+
 async def fetch_current_games(bot: Inu):
-    games: Dict[int, Dict[str, int]] = {}
-    guild: hikari.Guild
-    now = datetime.now()
-    if now.hour == 0:
-        # TODO: write games to database
-        games = {}
-    for guild in await bot.rest.fetch_my_guilds():
-        for member in await bot.rest.fetch_members(guild.id):
-            if (presence := member.get_presence()) and not member.is_bot:
-                for activity in presence.activities:
-                    act_name = activity.name
-                    if act_name in banned_act_names:
-                        continue
-                    if act_name in Games.EMULATORS and activity.details:
-                        # if the activity is an emulator, add the game name to the activity name
-                        # format: "Game (Emulator)"
-                        game_name = activity.details.splitlines()[0]
-                        if game_name.startswith("Playing "):
-                            game_name = game_name[8:]
-                        act_name = f"{game_name} ({act_name})"
-                    if not games.get(guild.id):
-                        games[guild.id] = {}
-                    if act_name in games[guild.id]:
-                        games[guild.id][act_name] += 1
-                    else:
-                        games[guild.id][act_name] = 1
+    games = await fetch_activity_snapshot(bot)
     for guild_id, game_dict in games.items():
         for game, amount in game_dict.items():
-            try:
-                await CurrentGamesManager.add(guild_id, game, amount)
-            except StringDataRightTruncationError:
+            if len(game) > CurrentGamesManager.MAX_GAME_LENGTH:
                 log.warning(f"Current Games ignored: `{game}` with len of {len(game)}", prefix="task")
                 banned_act_names.append(game)
+                continue
+            await CurrentGamesManager.add(guild_id, game, amount)
+    # write the whole snapshot with one round trip
+    await CurrentGamesManager.flush()
 
 
 
@@ -15,7 +15,7 @@ from lightbulb.commands.base import OptionModifier as OM
 import hikari
 import apscheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from utils import PollManager, Poll
+from utils import PollManager, PollStore, Poll
 
 from core import Table, getLogger, Inu
 
@@ -35,49 +35,34 @@ async def load_tasks(event: hikari.ShardReadyEvent):
         SYNCING = True
     await asyncio.sleep(3)
     await load_active_polls()
-
-    trigger = IntervalTrigger(seconds=POLL_SYNC_TIME)
-    plugin.bot.scheduler.add_job(load_active_polls, trigger)
-    logging.getLogger('apscheduler.executors.default').setLevel(logging.WARNING)
     await initial_load_all_polls()
 
 async def initial_load_all_polls():
-    sql = """
-    SELECT * FROM polls 
-    """
-    loaded_poll_count = 0
-    poll_table = Table("polls", debug_log=False)
-    records_polls = await poll_table.fetch(sql)
-    count = 0
-    for record in records_polls:
-        count += 1
-        PollManager.message_id_cache.add(record["message_id"])
+    # polls, options and votes of all running polls
+    count = await PollStore.load_all()
+    for state in PollStore.all():
+        PollManager.message_id_cache.add(state.message_id)
     log.info(f"Added {count} polls to cache", prefix="cache")
 
     sql = """
     DELETE FROM polls
     WHERE expires < $1
     """
+    poll_table = Table("polls", debug_log=False)
     await poll_table.execute(sql, datetime.now())
 
 
 async def load_active_polls():
+    """schedules the finalization of all polls - needed once after a restart"""
     try:
-        async def create_poll(poll_record: dict):
-            poll = await Poll.from_record(poll_record, bot)
-            await PollManager.add_poll(poll)
-
         sql = """
-        SELECT * FROM polls 
-        WHERE expires < $1
+        SELECT * FROM polls
         """
-        loaded_poll_count = 0
         poll_table = Table("polls", debug_log=False)
-        records_polls = await poll_table.fetch(sql, datetime.now() + timedelta(seconds=POLL_SYNC_TIME))
-
-        #load polls and fetch further information
+        records_polls = await poll_table.fetch(sql)
         for poll_record in records_polls:
-            asyncio.create_task((Poll(poll_record, bot)).finalize())
+            Poll(poll_record, bot).schedule_finalize()
+        log.info(f"scheduled the finalization of {len(records_polls)} polls", prefix="task")
     except Exception as e:
         log.error(traceback.format_exc())
         
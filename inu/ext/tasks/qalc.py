@@ -22,7 +22,7 @@ from utils import DailyContentChannels
 from utils import Columns as Col
 
 
-from core import getLogger, Bash
+from core import getLogger, Bash, QalcPool
 
 log = getLogger(__name__)
 loaded = False
@@ -34,6 +34,8 @@ async def update_qalc_currency():
     global i
     # -e = updating currency
     result = await Bash.execute(["qalc", "-t", "-e", "x EUR = 1 BTC"])
+    # running workers still have the old exchange rates loaded
+    await QalcPool.refresh()
     i += 1
     if i % 5 == 0:
         log.info(f"Updated qalculate currencies ({i}th time)", prefix="Cache")
@@ -54,6 +56,7 @@ async def load_tasks(event: ShardReadyEvent):
         bot.scheduler.add_job(update_qalc_currency, trigger)
         
         await update_qalc_currency()
+        await QalcPool.start()
     except:
         log.error(traceback.format_exc())
 
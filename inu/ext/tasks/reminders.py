@@ -5,16 +5,11 @@ from typing import (
     List,
 )
 import asyncio
-import logging
-import datetime
-import time
 
 import lightbulb
 from lightbulb.commands.base import OptionModifier as OM
 import hikari
-import apscheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from utils import REMINDER_UPDATE, Reminders
+from utils import Reminders
 
 
 plugin = lightbulb.Plugin("reminder loader", "loads reminders from database")
@@ -22,23 +17,15 @@ plugin = lightbulb.Plugin("reminder loader", "loads reminders from database")
 @plugin.listener(hikari.ShardReadyEvent)
 async def load_tasks(event: hikari.ShardReadyEvent):
     await asyncio.sleep(3)
-    await load_upcoming_reminders()
+    await load_reminders()
 
-    trigger = IntervalTrigger(seconds=REMINDER_UPDATE)
-    plugin.bot.scheduler.add_job(load_upcoming_reminders, trigger)
-    logging.getLogger('apscheduler.executors.default').setLevel(logging.WARNING)
-
-async def load_upcoming_reminders():
-    sql = """
-    SELECT * FROM reminders
-    WHERE remind_time < $1
+async def load_reminders():
+    """
+    Schedules all stored reminders. New reminders are scheduled when they are created,
+    hence this is only needed once after startup
     """
-    timestamp = datetime.datetime.fromtimestamp((time.time() + (REMINDER_UPDATE+10)))
-    records = await plugin.bot.db.fetch(
-        sql,
-        timestamp,
-    )
-    Reminders.add_reminders_to_set(records)
+    records = await plugin.bot.db.fetch("SELECT * FROM reminders")
+    Reminders.schedule_records(records)
 
 def load(bot: lightbulb.BotApp):
     bot.add_plugin(plugin)
\ No newline at end of file
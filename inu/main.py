@@ -14,19 +14,21 @@ import miru
 import hikari
 import lightbulb
 from lightbulb.ext import tasks
-from core import Inu, Table
+from core import Inu, Table, HTTPClient, QalcPool
 from utils import (
     tmdb_setup,
     InvokationStats, 
     Reminders, 
     TagManager, 
     PollManager, 
+    PollStore,
     Urban, 
     MyAnimeListAIOClient,
     CurrentGamesManager,
     BoardManager,
     set_bot,
-    AutoroleManager
+    AutoroleManager,
+    RenderPool,
 )
 import lavasnek_rs
 from core import getLogger
@@ -57,9 +59,7 @@ def main():
         member_of = inu.db.bot.cache.get_available_guilds_view()
         to_remove = [(guild_id,) for guild_id in set(stored) - set(member_of)]
         await inu.db.execute_many("DELETE FROM guilds WHERE guild_id = $1;", to_remove)
-        records = await inu.db.fetch("SELECT * FROM guilds")
-        for record in records:
-            inu.db.bot._prefixes[record["guild_id"]] = record["prefixes"]
+        await inu.prefix_cache.load()
         log.debug("Synced Prefixes", prefix="init")
 
     @inu.listen(hikari.StartingEvent)
@@ -95,13 +95,27 @@ def main():
             log.error(traceback.format_exc())
 
 
+    @inu.listen(hikari.StoppingEvent)
+    async def on_stopping(event: hikari.StoppingEvent):
+        # drains write buffers before the pool is closed
+        try:
+            if inu.db.is_connected:
+                await InvokationStats.flush()
+                await PollStore.flush()
+                await AutoroleManager.flush_renewals()
+                await inu.db.close()
+        except Exception:
+            log.error(traceback.format_exc())
+        RenderPool.shutdown()
+        await inu.http_client.close()
+        await QalcPool.shutdown()
+
     @inu.listen(lightbulb.LightbulbStartedEvent)
     async def on_bot_ready(event : lightbulb.LightbulbStartedEvent):
         async def fetch_response(number: int):
             """Fetches a response from the numbersapi.com API"""
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"http://numbersapi.com/{number}") as resp:
-                    return (await resp.read()).decode("utf-8")
+            async with HTTPClient().get(f"http://numbersapi.com/{number}") as resp:
+                return (await resp.read()).decode("utf-8")
                 
 
         table = Table("bot")
@@ -133,6 +147,8 @@ def main():
             )
         except Exception:
             log.error(f"failed to set presence: {traceback.format_exc()}", prefix="start")
+        # extensions are loaded - forked workers inherit their modules
+        RenderPool.start()
 
     
     stop = False
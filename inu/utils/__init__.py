@@ -7,14 +7,18 @@ from .string_crumbler import crumble, StringCutter, WordIterator
 from .language import Human, Multiple, get_date_format_by_timedelta
 from .string_calculator import NumericStringParser, calc
 from .list_parser import ListParser
-from .latex import latex2image, evaluation2image, prepare_for_latex
+from .latex import latex2image, evaluation2image, evaluation2png, render_evaluation, prepare_for_latex
 
 from .grid import Grid
+from .timer_wheel import TimerWheel
+from .timers import Timers
+from .single_flight import SingleFlight, single_flight
 from .rest import *
 from .db import *
 from .view import *
 from .logger import *
 from .poll import Poll
+from .render import RenderPool, RenderTimeout, RenderCache
 
 
 from .emojis import Emoji
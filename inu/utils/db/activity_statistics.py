@@ -4,7 +4,7 @@ import pickle
 import pandas as pd
 #from dataenforce import Dataset
 
-from core import Database, Table
+from core import Database, Table, WriteBuffer
 
 
 # how many minutes does python takes the records?
@@ -67,6 +67,100 @@ class Games:
 
 
 class CurrentGamesManager:
+    # max length of the `game` column
+    MAX_GAME_LENGTH = 100
+    # rollup tables of `current_games` from fine to coarse
+    ROLLUPS: Dict[str, timedelta] = {
+        "current_games_hourly": timedelta(hours=1),
+        "current_games_daily": timedelta(days=1),
+    }
+
+    @classmethod
+    def _buffer(cls) -> WriteBuffer:
+        return Database().write_buffer(
+            "current_games", 
+            ["guild_id", "game", "user_amount", "timestamp"],
+            max_rows=1000,
+            flush_interval=30,
+        )
+
+    @classmethod
+    def _rollup_buffer(cls, table_name: str) -> WriteBuffer:
+        return Database().write_buffer(
+            table_name,
+            ["guild_id", "game", "bucket", "user_amount", "first_occurrence"],
+            on_conflict=(
+                f"(guild_id, game, bucket) DO UPDATE\n"
+                f"SET user_amount = {table_name}.user_amount + EXCLUDED.user_amount,\n"
+                f"first_occurrence = LEAST({table_name}.first_occurrence, EXCLUDED.first_occurrence)"
+            ),
+            max_rows=1000,
+            flush_interval=30,
+        )
+
+    @staticmethod
+    def _bucket_start(timestamp: datetime, resolution: timedelta) -> datetime:
+        """floors <`timestamp`> to the start of its hour or day"""
+        if resolution >= timedelta(days=1):
+            return datetime(timestamp.year, timestamp.month, timestamp.day)
+        return datetime(timestamp.year, timestamp.month, timestamp.day, timestamp.hour)
+
+    @classmethod
+    def _activity_source(
+        cls, 
+        since: datetime, 
+        resolution: Optional[timedelta],
+        since_param: int,
+        next_param: int,
+    ) -> Tuple[str, List[datetime]]:
+        """
+        Builds a subquery with the columns `guild_id`, `game`, `ts`, `user_amount` and `first_occurrence`
+        which covers all activities after <`since`>.
+        The range is read from the coarsest rollup which still has the given <`resolution`>.
+        Only the edge which is not covered by a complete bucket is read from finer tables.
+
+        Args:
+        -----
+        since : datetime
+            where the range starts (exclusive)
+        resolution : Optional[timedelta]
+            the needed resolution. None for raw records
+        since_param : int
+            the number of the query argument, which is <`since`>
+        next_param : int
+            the number of the next free query argument
+
+        Returns:
+        --------
+        Tuple[str, List[datetime]]:
+            the subquery and the additional query arguments, starting with <`next_param`>
+        """
+        selects = []
+        args: List[datetime] = []
+        for table_name, bucket_size in cls.ROLLUPS.items():
+            if resolution is None or resolution < bucket_size:
+                break
+            # first bucket which is completely after `since`
+            bucket_start = cls._bucket_start(since, bucket_size) + bucket_size
+            args.append(bucket_start)
+            upper = f"${next_param + len(args) - 1}"
+            if not selects:
+                selects.append(
+                    f"SELECT guild_id, game, timestamp AS ts, user_amount, timestamp AS first_occurrence\n"
+                    f"FROM current_games WHERE timestamp > ${since_param} AND timestamp < {upper}"
+                )
+            else:
+                selects[-1] += f" AND bucket < {upper}"
+            selects.append(
+                f"SELECT guild_id, game, bucket AS ts, user_amount, first_occurrence\n"
+                f"FROM {table_name} WHERE bucket >= {upper}"
+            )
+        if not selects:
+            selects.append(
+                f"SELECT guild_id, game, timestamp AS ts, user_amount, timestamp AS first_occurrence\n"
+                f"FROM current_games WHERE timestamp > ${since_param}"
+            )
+        return "(\n" + "\nUNION ALL\n".join(selects) + "\n) AS activities", args
 
     @classmethod
     async def add(
@@ -74,9 +168,14 @@ class CurrentGamesManager:
         guild_id: int,
         game: str,
         amount: int,
-    ) -> Optional[Mapping[str, Any]]:
-        """inserts guild_id and game into database. Timestamp will be time of method call"""
-        table = Table("current_games", error_log=False)
+    ) -> None:
+        """
+        queues guild_id and game for insertion into database. Timestamp will be time of method call
+
+        Note:
+        -----
+        The record is written with the next `flush` or when the write buffer flushes itself
+        """
         now = datetime.now()
         about_now = datetime(
             year=now.year,
@@ -85,15 +184,33 @@ class CurrentGamesManager:
             hour=now.hour,
             minute=now.minute,
         )
-        return await table.insert(
-            which_columns=["guild_id", "game", "user_amount", "timestamp"],
-            values=[guild_id, game, amount, about_now],
-        )
+        cls._buffer().add(guild_id, game, amount, about_now)
+        for table_name, bucket_size in cls.ROLLUPS.items():
+            cls._rollup_buffer(table_name).add(
+                guild_id, game, cls._bucket_start(about_now, bucket_size), amount, about_now
+            )
+
+    @classmethod
+    async def flush(cls) -> int:
+        """
+        writes all queued records and their rollups into the database. 
+        Returns the amount of written records
+        """
+        written = await cls._buffer().flush()
+        for table_name in cls.ROLLUPS.keys():
+            await cls._rollup_buffer(table_name).flush()
+        return written
 
     @classmethod
     async def delete(cls, when_older_than: datetime) -> Optional[List[Mapping[str, Any]]]:
         """deletes all records which are older than <`when_older_than`>"""
         table = Table("current_games")
+        for table_name, bucket_size in cls.ROLLUPS.items():
+            # only drop buckets which are completely older
+            await table.fetch(
+                f"DELETE FROM {table_name} WHERE bucket < $1",
+                cls._bucket_start(when_older_than, bucket_size),
+            )
         sql = (
             f"DELETE FROM {table.name}\n"
             f"WHERE timestamp < $1"
@@ -118,13 +235,14 @@ class CurrentGamesManager:
             Mapping from game name to the time in minutes played it
         """
         table = Table("current_games")
+        source, source_args = cls._activity_source(since, timedelta(days=1), since_param=2, next_param=3)
         sql = (
-            f"SELECT game, SUM(user_amount) AS amount, MIN(timestamp) AS first_occurrence\n"
-            f"FROM {table.name}\n"
-            f"WHERE guild_id = $1 AND timestamp > $2\n"
+            f"SELECT game, SUM(user_amount) AS amount, MIN(first_occurrence) AS first_occurrence\n"
+            f"FROM {source}\n"
+            f"WHERE guild_id = $1\n"
             f"GROUP BY game"
         )
-        return await table.fetch(sql, guild_id, since)
+        return await table.fetch(sql, guild_id, since, *source_args)
 
     @classmethod
     async def fetch_raw_activities(
@@ -216,6 +334,7 @@ class CurrentGamesManager:
         guild_id: int,
         since: datetime,
         activity_filter: Optional[List[str]] = None,
+        resolution: Optional[timedelta] = None,
     ) -> pd.DataFrame:
         """
         fetches activies from a guild
@@ -227,6 +346,10 @@ class CurrentGamesManager:
             timepoint where return data starts
         activity_filter: List[str]
             list of activities to filter by (only list element will be returned)
+        resolution: Optional[timedelta]
+            the resolution which is needed by the caller. If it's at least an hour or a day,
+            records are read from the rollups and represent a whole hour/day.
+            Default are the raw 10 minute records
 
         Returns:
         --------
@@ -247,13 +370,16 @@ class CurrentGamesManager:
         table.return_as_dataframe(True)
         additional_activity_filter = f"AND game = ANY($3)" if activity_filter else ""
         optional_arg = [activity_filter] if activity_filter else []
-        # ts_round(timestamp, 300) -> round timestamp to nearest 10 minutes
+        source, source_args = cls._activity_source(
+            since, resolution, since_param=2, next_param=3 + len(optional_arg)
+        )
+        # ts_round(ts, 300) -> round timestamp to nearest 10 minutes
         sql = ( 
-            f"SELECT ts_round(timestamp, 300) AS r_timestamp, game, CAST(user_amount AS FLOAT)*{USER_AMOUNT_TO_MINUTES}/60 AS hours\n"
-            f"FROM {table.name}\n"
-            f"WHERE guild_id = $1 AND timestamp > $2 {additional_activity_filter}\n"
+            f"SELECT ts_round(ts, 300) AS r_timestamp, game, CAST(user_amount AS FLOAT)*{USER_AMOUNT_TO_MINUTES}/60 AS hours\n"
+            f"FROM {source}\n"
+            f"WHERE guild_id = $1 {additional_activity_filter}\n"
         )
-        return await table.fetch(sql, guild_id, since, *optional_arg)
+        return await table.fetch(sql, guild_id, since, *optional_arg, *source_args)
 
     @classmethod
     async def fetch_top_games(
@@ -284,15 +410,18 @@ class CurrentGamesManager:
         table = Table("current_games")
         additional_filter = f"AND game != ALL($4)" if remove_activities else ""
         optional_arg = [remove_activities] if remove_activities else []
+        source, source_args = cls._activity_source(
+            since, timedelta(days=1), since_param=2, next_param=4 + len(optional_arg)
+        )
         sql = (
             f"SELECT game, SUM(user_amount) AS amount\n"
-            f"FROM {table.name}\n"
-            f"WHERE guild_id = $1 AND timestamp > $2 {additional_filter}\n"
+            f"FROM {source}\n"
+            f"WHERE guild_id = $1 {additional_filter}\n"
             f"GROUP BY game\n"
             f"ORDER BY amount DESC\n"
             f"LIMIT $3"
         )
-        records = await table.fetch(sql, guild_id, since, limit, *optional_arg)
+        records = await table.fetch(sql, guild_id, since, limit, *optional_arg, *source_args)
         return [{r["game"]: r["amount"]} for r in records]
 
     @classmethod
@@ -319,14 +448,17 @@ class CurrentGamesManager:
 
         additional_filter = f"AND game != ALL($3)" if ignore_activities else ""
         additional_args = [ignore_activities] if ignore_activities else []
+        source, source_args = cls._activity_source(
+            since, timedelta(days=1), since_param=2, next_param=3 + len(additional_args)
+        )
         sql = f"""
-        SELECT date_trunc('day', timestamp)::TIMESTAMP WITH TIME ZONE AS datetime, SUM(user_amount)/6 AS hours\n
-        FROM current_games\n
-        WHERE guild_id = $1 AND timestamp > $2 {additional_filter}\n
+        SELECT date_trunc('day', ts)::TIMESTAMP WITH TIME ZONE AS datetime, SUM(user_amount)/6 AS hours\n
+        FROM {source}\n
+        WHERE guild_id = $1 {additional_filter}\n
         GROUP BY datetime \n
         ORDER BY datetime ASC
         """
         table = Table("current_games")
         table.return_as_dataframe(True)
-        return await table.fetch(sql, guild_id, since, *additional_args)
+        return await table.fetch(sql, guild_id, since, *additional_args, *source_args)
 
@@ -7,11 +7,13 @@ import time
 import traceback
 from urllib.parse import quote
 
+import asyncio
 import aiohttp
 from jikanpy import AioJikan
+from cachetools import LRUCache, TTLCache
 
 from core import Database, Table, getLogger
-from utils import Multiple, MyAnimeListAIOClient, MALRatings
+from utils import Multiple, MyAnimeListAIOClient, MALRatings, single_flight
 
 log = getLogger(__name__)
 
@@ -469,7 +471,19 @@ class Anime:
 
 
 class MyAnimeList:
-    """A class, which stores MyAnimeList data for caching purposes in a Database, or fetches it from jikan"""
+    """
+    A class, which stores MyAnimeList data for caching purposes in a Database, or fetches it from jikan
+
+    Cache tiers:
+        - memory LRU with the last used `Anime`s
+        - the `myanimelist` table
+    Outdated `Anime`s are returned immediately and refreshed in the background (stale-while-revalidate)
+    """
+    _memory: LRUCache = LRUCache(maxsize=512)
+    # mal_id -> running refresh task
+    _refreshing: Dict[int, asyncio.Task] = {}
+    # mal_ids, which failed to update recently - these aren't retried on every request
+    _failed_updates: TTLCache = TTLCache(maxsize=1024, ttl=5*60)
 
     @classmethod
     async def search_anime(cls, query: str) -> Dict[str, Any]:
@@ -489,19 +503,38 @@ class MyAnimeList:
         Note:
         -----
             - The `Anime` will be stored in a database for caching puprposes
-            - The internal db/cache will be checked first, before making a request to jikan
+            - The memory cache and the db will be checked first, before making a request to jikan
+            - An outdated `Anime` is returned as it is and updated in the background
+        """
+        anime = cls._memory.get(mal_id)
+        if anime is None:
+            anime = await cls._load_anime(mal_id)
+        if anime.needs_update:
+            cls._update_in_background(mal_id)
+        return anime
+
+    @classmethod
+    @single_flight()
+    async def _load_anime(cls, mal_id: int) -> Anime:
+        """
+        Loads the anime from the db or from REST, if it's not cached yet.
+        Concurrent calls with the same id share one lookup
         """
         anime = await cls._fetch_anime_by_id_db(mal_id)
-        if anime:
-            if anime.needs_update:
-                log.debug(f"update anime cache: {anime}")
-                anime = await cls._fetch_anime_by_id_rest(mal_id)
-                await cls._cache_anime(anime)
-        else:
+        if not anime:
             anime = await cls._fetch_anime_by_id_rest(mal_id)
             await cls._cache_anime(anime)
+        cls._memory[mal_id] = anime
         return anime
 
+    @classmethod
+    def _update_in_background(cls, mal_id: int) -> None:
+        if mal_id in cls._refreshing or mal_id in cls._failed_updates:
+            return
+        task = asyncio.create_task(cls._update_anime_by_id(mal_id))
+        cls._refreshing[mal_id] = task
+        task.add_done_callback(lambda _: cls._refreshing.pop(mal_id, None))
+
     @classmethod
     async def _fetch_anime_by_id_rest(
         cls,
@@ -537,8 +570,19 @@ class MyAnimeList:
         return anime
 
     @classmethod
-    async def _update_anime_by_id(cls, mal_id: int):
-        pass
+    async def _update_anime_by_id(cls, mal_id: int) -> None:
+        """
+        Fetches the anime from REST and replaces it in the db and memory cache.
+        The outdated `Anime` stays cached, if the request fails
+        """
+        try:
+            log.debug(f"update anime cache: {mal_id}")
+            anime = await cls._fetch_anime_by_id_rest(mal_id)
+            await cls._cache_anime(anime)
+            cls._memory[mal_id] = anime
+        except Exception:
+            cls._failed_updates[mal_id] = True
+            log.warning(f"can't update anime {mal_id}:\n{traceback.format_exc()}")
 
     @classmethod
     async def _cache_anime(cls, anime: Anime):
@@ -3,12 +3,15 @@ from typing import *
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod, abstractproperty
 import asyncio
+import traceback
+import time
 
 import hikari
 from hikari.impl import MessageActionRowBuilder
 from hikari import Member
 
 from core import Table, Inu, getLogger
+from utils import Timers, single_flight
 
 log = getLogger(__name__)
 
@@ -174,7 +177,8 @@ class VoiceActivityEvent(AutoroleEvent):
     
     async def renew_user_duration(self, user_id: int, guild_id: int, event_id: int = 1) -> None:
             """
-            Renews the duration of a user's role in the autoroles system.
+            Renews the duration of a user's role in the autoroles system immediately.
+            Use `AutoroleManager.queue_renewal` for renewals which can be coalesced.
 
             Args:
                 user_id (int): The ID of the user.
@@ -184,19 +188,7 @@ class VoiceActivityEvent(AutoroleEvent):
             Returns:
                 None
             """
-            record = await autorole_user_table.fetch(
-                """
-                INSERT INTO autoroles.instances (user_id, guild_role, expires_at)
-                SELECT $1, gr.id, NOW() + gr.duration
-                FROM autoroles.events AS gr
-                WHERE gr.event_id = $2 AND gr.guild_id = $3
-                ON CONFLICT (user_id, guild_role) DO UPDATE
-                SET expires_at = EXCLUDED.expires_at;
-                """, user_id, event_id, guild_id
-            )
-            member: hikari.Member = self.bot.cache.get_member(guild_id, user_id)
-            if not self.role_id in member.role_ids:
-                await member.add_role(self.role_id)
+            await AutoroleManager.renew(((guild_id, user_id),), event_id)
 
     async def delete_user_roles(self, user_id: int, guild_id: int, event_id: int = 1) -> None:
             """
@@ -230,6 +222,18 @@ class VoiceActivityEvent(AutoroleEvent):
                 None
             """
             await autorole_user_table.delete_by_id("id", record["id"])
+            await self.remove_user_role(record)
+
+    async def remove_user_role(self, record: Dict[str, Any]) -> None:
+            """
+            Removes the role from the user of <record>. The database entry is not touched.
+
+            Args:
+                record (Dict[str, Any]): The record containing `guild_id` and `user_id`.
+
+            Returns:
+                None
+            """
             try:
                 member = await self.bot.mrest.fetch_member(record["guild_id"], record["user_id"])
             except hikari.NotFoundError:
@@ -249,7 +253,6 @@ class VoiceActivityEvent(AutoroleEvent):
                     "event_id": self.event_id
                 }
             )
-            VoiceAutoroleCache.add(self.guild_id)
             return value
 
     async def remove_from_db(self):
@@ -257,7 +260,6 @@ class VoiceActivityEvent(AutoroleEvent):
         if self.id is None:
             raise ValueError("id is None")
         await autorole_table.delete_by_id("id", self.id)
-        VoiceAutoroleCache.remove(self.guild_id)
 
     async def sync_to_db(self):
         """syncs the autorole to the database"""
@@ -276,7 +278,7 @@ class VoiceActivityEvent(AutoroleEvent):
     async def on_delete(self, record:Dict[str, Any]):
         """removes the role from the user"""
         log.info(f"deleting {record=}")
-        await self.delete_user_role_by_id(record)
+        await self.remove_user_role(record)
 
 
 
@@ -366,7 +368,7 @@ class AutoroleBuilder:
                     return False
             
                 event: AutoroleEvent = self.build()
-                await event.sync_to_db()
+                await AutoroleManager.update_event(event)
                 self._changed = False
                 return True
             else:
@@ -375,7 +377,7 @@ class AutoroleBuilder:
                     return False
                 event: AutoroleEvent = self.build()
                 await event.initial_call()
-                value = await event.add_to_db()
+                value = await AutoroleManager.add_event(event)
                 self.id = value[0]["id"]
                 return True
         
@@ -385,7 +387,7 @@ class AutoroleBuilder:
         """
         if self.id:
             event: AutoroleEvent = self.build()
-            await event.remove_from_db()
+            await AutoroleManager.remove_event(event)
             return True
         return False
         
@@ -457,8 +459,14 @@ class AutoroleManager():
         1: VoiceActivityEvent
     }
     bot: Inu
-    deletion_scheduled: set[int] = set()
-    
+    RENEW_INTERVAL: float = 2
+    # seconds until expiries are tried again after a database error
+    EXPIRY_RETRY: float = 60
+    # (guild_id, user_id) of voice activity renewals, which are not written yet
+    _pending_renewals: Set[Tuple[int, int]] = set()
+    _renew_timer: Optional[asyncio.TimerHandle] = None
+    _renew_task: Optional[asyncio.Task] = None
+
     @classmethod
     def set_bot(cls, bot: Inu) -> None:
         cls.bot = bot
@@ -578,9 +586,8 @@ class AutoroleManager():
         return event
     
     @classmethod
-    async def add_event(cls, event: AutoroleEvent) -> None:
-        """adds an AutoroleEvent to the database
-        this just calls the event method `add_to_db`
+    async def add_event(cls, event: AutoroleEvent) -> Optional[List[Dict[str, Any]]]:
+        """adds an AutoroleEvent to the database and the `AutoroleRegistry`
         
         Args:
         -----
@@ -589,51 +596,209 @@ class AutoroleManager():
         
         Returns:
         --------
-        `None`
+        `List[Dict[str, Any]] | None`
+            the inserted record or None, if the event already has an id
         """
-        await event.add_to_db()
+        value = await event.add_to_db()
+        if value:
+            event.id = value[0]["id"]
+            AutoroleRegistry.add(event)
+        return value
+
+    @classmethod
+    async def update_event(cls, event: AutoroleEvent) -> None:
+        """updates an AutoroleEvent in the database and the `AutoroleRegistry`"""
+        await event.sync_to_db()
+        AutoroleRegistry.add(event)
+
+    @classmethod
+    async def remove_event(cls, event: AutoroleEvent) -> None:
+        """removes an AutoroleEvent from the database and the `AutoroleRegistry`"""
+        await event.remove_from_db()
+        AutoroleRegistry.remove(event)
 
     @classmethod
-    async def remove_expired_autoroles(cls, expires_in: int) -> int:
+    async def renew(cls, members: Iterable[Tuple[int, int]], event_id: int = 1) -> int:
+        """
+        Renews the instances of all autoroles with <`event_id`> for <`members`>
+        with one upsert, schedules their expiry and adds missing roles.
+
+        Args:
+        -----
+        `members : Iterable[Tuple[int, int]]`
+            (guild_id, user_id) pairs - they have to be unique
+        `event_id : int`
+            the event type of the autoroles to renew
+
+        Returns:
+        --------
+        `int`
+            the amount of renewed instances
+        """
+        members = list(members)
+        if not members:
+            return 0
+        records = await autorole_user_table.fetch(
             """
-            Removes expired autoroles from the autorole_user_table.
+            WITH renewed AS (
+                INSERT INTO autoroles.instances (user_id, guild_role, expires_at)
+                SELECT m.user_id, gr.id, NOW() + gr.duration
+                FROM UNNEST($1::BIGINT[], $2::BIGINT[]) AS m(guild_id, user_id)
+                INNER JOIN autoroles.events AS gr ON gr.guild_id = m.guild_id
+                WHERE gr.event_id = $3
+                ON CONFLICT (user_id, guild_role) DO UPDATE
+                SET expires_at = EXCLUDED.expires_at
+                RETURNING id, user_id, guild_role, expires_at
+            )
+            SELECT r.id, r.user_id, r.expires_at, gr.guild_id, gr.role_id, gr.event_id, gr.duration, gr.id AS guild_role
+            FROM renewed r
+            INNER JOIN autoroles.events gr ON gr.id = r.guild_role
+            """, [guild_id for guild_id, _ in members], [user_id for _, user_id in members], event_id
+        )
+        tasks: List[asyncio.Task] = []
+        for record in records:
+            cls.schedule_expiry(record)
+            member = cls.bot.cache.get_member(record["guild_id"], record["user_id"])
+            if member and not record["role_id"] in member.role_ids:
+                tasks.append(asyncio.create_task(member.add_role(record["role_id"])))
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                log.warning(f"failed to add autorole: {result!r}")
+        return len(records)
 
-            Args:
-                expires_in (int): The number of seconds to delete autoroles. now + this.
+    @classmethod
+    def queue_renewal(cls, guild_id: int, user_id: int) -> None:
+        """
+        Queues the renewal of the voice activity autoroles of <`user_id`>.
+        Renewals are written together every `RENEW_INTERVAL` seconds,
+        multiple renewals of one member in this time become one.
+        """
+        cls._pending_renewals.add((guild_id, user_id))
+        cls._schedule_renewal_flush()
+
+    @classmethod
+    def _schedule_renewal_flush(cls) -> None:
+        if cls._renew_timer is None:
+            cls._renew_timer = asyncio.get_running_loop().call_later(
+                cls.RENEW_INTERVAL, cls._start_renewal_flush
+            )
+
+    @classmethod
+    def _start_renewal_flush(cls) -> None:
+        # referenced, that the flush is not garbage collected
+        cls._renew_task = asyncio.create_task(cls.flush_renewals())
+
+    @classmethod
+    async def flush_renewals(cls) -> int:
+        """
+        Writes all queued renewals.
+
+        Returns:
+        --------
+        `int`
+            the amount of renewed instances
+        """
+        if cls._renew_timer is not None:
+            cls._renew_timer.cancel()
+            cls._renew_timer = None
+        pending, cls._pending_renewals = cls._pending_renewals, set()
+        try:
+            return await cls.renew(pending, VoiceActivityEvent.event_id)
+        except Exception:
+            log.error(f"failed to renew {len(pending)} voice autoroles:\n{traceback.format_exc()}")
+            # keep them for the next flush
+            cls._pending_renewals |= pending
+            cls._schedule_renewal_flush()
+            return 0
+
+    @classmethod
+    async def schedule_expiries(cls) -> int:
+            """
+            Schedules the expiry of all autorole instances. Needed once after a restart,
+            renewed instances are scheduled by themselves.
 
             Returns:
-                int: The number of autoroles deleted.
+                int: The number of scheduled instances.
             """
             records = await autorole_user_table.fetch(
                 """
-                SELECT ur.id AS id, ur.user_id, ur.expires_at, gr.guild_id, gr.role_id, gr.event_id, gr.duration FROM autoroles.instances ur
+                SELECT ur.id AS id, ur.user_id, ur.expires_at, gr.guild_id, gr.role_id, gr.event_id, gr.duration, gr.id AS guild_role
+                FROM autoroles.instances ur
                 INNER JOIN autoroles.events gr ON gr.id = guild_role
-                WHERE expires_at < $1
-                """, datetime.now() + timedelta(seconds=expires_in)
+                WHERE expires_at IS NOT NULL
+                """
             )
             for record in records:
-                await cls._schedule_deletion(record, (record["expires_at"] - datetime.now()).total_seconds())
+                cls.schedule_expiry(record)
             return len(records)
+
     @classmethod
-    async def _schedule_deletion(cls, record: Dict[str, Any], delay: int) -> None:
+    def schedule_expiry(cls, record: Dict[str, Any]) -> None:
         """
-        Schedules the deletion of an autorole.
+        Schedules the removal of an autorole instance at its `expires_at`.
+        A renewed instance is moved, not added twice.
 
         Args:
-            event (AutoroleEvent): The autorole event.
-            delay (int): The delay in seconds.
+            record (Dict[str, Any]): The instance joined with its event.
+        """
+        Timers.schedule("autorole", record["id"], record["expires_at"], dict(record))
 
-        Returns:
-            None
+    @classmethod
+    async def _expire(cls, jobs: Dict[int, Dict[str, Any]]) -> None:
         """
-        event = cls._build_event(record)
-        if event.id in cls.deletion_scheduled:
+        Timer handler - deletes all due instances with one query and removes their roles.
+        Instances, which were renewed in the meantime or are not due by the clock
+        of the bot yet, are scheduled again with their current `expires_at`.
+
+        Args:
+            jobs (Dict[int, Dict[str, Any]]): instance id -> record
+        """
+        try:
+            deleted = await autorole_user_table.fetch(
+                """
+                DELETE FROM autoroles.instances
+                WHERE id = ANY($1::INT[]) AND expires_at <= $2
+                RETURNING id
+                """, list(jobs), datetime.now()
+            )
+        except Exception:
+            log.error(f"failed to expire {len(jobs)} autoroles - retrying later:\n{traceback.format_exc()}")
+            cls._retry_expiry(jobs)
             return
-        log.debug(f"scheduling deletion of {event.id} in {delay} seconds", prefix="task")
-        cls.deletion_scheduled.add(event.id)
-        await asyncio.sleep(delay)
-        await event.on_delete(record)
-        cls.deletion_scheduled.remove(event.id)
+        skipped = {id: jobs[id] for id in set(jobs) - {row["id"] for row in deleted}}
+        if skipped:
+            try:
+                remaining = await autorole_user_table.fetch(
+                    """
+                    SELECT ur.id AS id, ur.user_id, ur.expires_at, gr.guild_id, gr.role_id, gr.event_id, gr.duration, gr.id AS guild_role
+                    FROM autoroles.instances ur
+                    INNER JOIN autoroles.events gr ON gr.id = guild_role
+                    WHERE ur.id = ANY($1::INT[]) AND expires_at IS NOT NULL
+                    """, list(skipped)
+                )
+                for record in remaining:
+                    cls.schedule_expiry(record)
+            except Exception:
+                log.error(f"failed to reschedule {len(skipped)} autoroles - retrying later:\n{traceback.format_exc()}")
+                cls._retry_expiry(skipped)
+        tasks: List[asyncio.Task] = []
+        for row in deleted:
+            record = jobs[row["id"]]
+            event = cls._build_event({**record, "id": record["guild_role"]})
+            tasks.append(asyncio.create_task(event.on_delete(record)))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                log.warning(f"failed to remove expired autorole: {result!r}")
+        if deleted:
+            log.info(f"removed {len(deleted)} expired autoroles", prefix="task")
+
+    @classmethod
+    def _retry_expiry(cls, jobs: Dict[int, Dict[str, Any]]) -> None:
+        """schedules <`jobs`> again in `EXPIRY_RETRY` seconds"""
+        when = time.time() + cls.EXPIRY_RETRY
+        for id, record in jobs.items():
+            Timers.schedule("autorole", id, when, record)
 
     @classmethod
     async def delete_guild(cls, guild_id: int) -> None:
@@ -649,37 +814,85 @@ class AutoroleManager():
         `None`
         """
         await autorole_table.delete(where={"guild_id": guild_id})
+        AutoroleRegistry.remove_guild(guild_id)
 
 
 
-class MetaVoiceAutoroleCache(type):
-    _guilds: Set[int] = set()
-    def __contains__(cls, guild_id: int) -> bool:
-        return guild_id in cls._guilds
-    
+class AutoroleRegistry:
+    """
+    In-memory copy of `autoroles.events` per guild and event type.
 
+    Loaded once, afterwards kept in sync by `AutoroleManager`,
+    hence event listeners don't need a database round trip.
+    """
+    # guild_id -> event_id -> id -> event
+    _events: Dict[int, Dict[int, Dict[int, AutoroleEvent]]] = {}
+    # id -> event
+    _by_id: Dict[int, AutoroleEvent] = {}
+    _loaded: bool = False
 
-class VoiceAutoroleCache(metaclass=MetaVoiceAutoroleCache):
-    _guilds: Set[int] = set()
+    @classmethod
+    @single_flight()
+    async def load(cls) -> int:
+        """
+        Loads all autoroles of the database.
+
+        Returns:
+        --------
+        `int`
+            the amount of loaded autoroles
+        """
+        events = await AutoroleManager.fetch_events()
+        cls._events = {}
+        cls._by_id = {}
+        for event in events:
+            cls.add(event)
+        cls._loaded = True
+        log.info(f"loaded {len(events)} autoroles into cache", prefix="cache")
+        return len(events)
 
     @classmethod
-    def add(cls, guild_id: int) -> None:
-        cls._guilds.add(guild_id)
+    async def get(cls, guild_id: int, event: Type[AutoroleEvent]) -> List[AutoroleEvent]:
+        """
+        Returns all autoroles of <`guild_id`> with the event type <`event`>
+        """
+        if not cls._loaded:
+            await cls.load()
+        return list(cls._events.get(guild_id, {}).get(event.event_id, {}).values())
 
     @classmethod
-    def extend(cls, guild_ids: Iterable[int]) -> None:
-        cls._guilds.update(guild_ids)
+    def add(cls, event: AutoroleEvent) -> None:
+        """adds or replaces <`event`>"""
+        if event.id is None:
+            return
+        # the guild or event type could have been changed
+        cls.remove(event)
+        (
+            cls._events
+            .setdefault(event.guild_id, {})
+            .setdefault(event.event_id, {})
+        )[event.id] = event
+        cls._by_id[event.id] = event
 
     @classmethod
-    def remove(cls, guild_id: int) -> None:
-        try:
-            cls._guilds.remove(guild_id)
-        except KeyError:
-            pass
+    def remove(cls, event: AutoroleEvent) -> None:
+        old = cls._by_id.pop(event.id, None)  # type: ignore
+        if old is None:
+            return
+        by_type = cls._events[old.guild_id]
+        events = by_type[old.event_id]
+        del events[old.id]  # type: ignore
+        if not events:
+            del by_type[old.event_id]
+        if not by_type:
+            del cls._events[old.guild_id]
 
     @classmethod
-    async def sync(cls) -> None:
-        events = await AutoroleManager.fetch_events(None, VoiceActivityEvent)
-        guilds = [event.guild_id for event in events]
-        log.info(f"synced {len(guilds)} voice autoroles for cache", prefix="cache")
-        cls._guilds.update(guilds)
\ No newline at end of file
+    def remove_guild(cls, guild_id: int) -> None:
+        for events in cls._events.pop(guild_id, {}).values():
+            for id in events:
+                cls._by_id.pop(id, None)
+
+
+
+Timers.register("autorole", AutoroleManager._expire)
@@ -4,6 +4,7 @@ from typing import *
 
 import asyncpg
 asyncpg.UniqueViolationError
+from cachetools import LRUCache
 
 from core import Table, Inu, getLogger
 from utils import Human
@@ -17,6 +18,21 @@ class BoardManager:
     # Dict has keys emojis (str set) and message_ids (int set)
     # this cache is not aware of, that a message can have multiple reactions
     _cache: Dict[int, Dict[str, Set[int]]] = {}
+    # Mapping[(orig message_id, emoji), entry record]
+    _entry_cache: LRUCache = LRUCache(maxsize=2048)
+
+    @classmethod
+    def _entry_cache_set(cls, entry: Mapping[str, Any]):
+        cls._entry_cache[(entry["message_id"], entry["emoji"])] = dict(entry)
+
+    @classmethod
+    def _entry_cache_remove(cls, message_id: int, emoji: Optional[str] = None):
+        for key in [k for k in cls._entry_cache.keys() if k[0] == message_id and (emoji is None or k[1] == emoji)]:
+            cls._entry_cache.pop(key, None)
+
+    @classmethod
+    def clear_entry_cache(cls):
+        cls._entry_cache.clear()
 
     @classmethod
     def _cache_add_entry(cls, guild_id: int, emoji: str, message_id: Optional[int]):
@@ -140,6 +156,8 @@ class BoardManager:
             ]
         )
         cls._cache_add_entry(guild_id, emoji, message_id)
+        if entry:
+            cls._entry_cache_set(entry[0])
         return entry
 
     @classmethod
@@ -180,6 +198,8 @@ class BoardManager:
             },
             set=set_
         )
+        if (cached := cls._entry_cache.get((message_id, emoji))):
+            cached.update(set_)
 
     
 
@@ -207,6 +227,7 @@ class BoardManager:
             columns.append("emoji")
             where.append(emoji)
         records = await table.delete(columns=columns, matching_values=where)
+        cls._entry_cache_remove(message_id, emoji)
         for record in records:
             cls._cache_remove_entry(record["guild_id"], record["emoji"], record["message_id"])
         return records
@@ -242,9 +263,11 @@ class BoardManager:
         emoji : str
             hence the message can be added to multiple boards, the emoji is needed to destinglish between them
         """
+        if (cached := cls._entry_cache.get((message_id, emoji))):
+            return dict(cached)
         table = Table("board.entries")
         try:
-            return (await table.fetch(
+            entry = (await table.fetch(
                 f"""
                 SELECT * FROM {table.name}\n
                 WHERE message_id = $1 AND emoji = $2
@@ -254,6 +277,8 @@ class BoardManager:
             ))[0]
         except IndexError:
             return None
+        cls._entry_cache_set(entry)
+        return dict(entry)
 
     @classmethod
     async def add_board(
@@ -330,6 +355,8 @@ class BoardManager:
         records = await table.delete(columns=columns, matching_values=where)
         if records:
             cls._cache_remove_guild(guild_id)
+            # entries are deleted with the board
+            cls.clear_entry_cache()
         return records
 
     @classmethod
@@ -396,6 +423,54 @@ class BoardManager:
             cls._cache_remove_entry(guild_id, r["emoji"], message_id)
         return records
 
+    @classmethod
+    async def add_reactions(
+        cls,
+        guild_id: int,
+        message_id: int,
+        reacter_ids: Iterable[int],
+        emoji: str,
+    ):
+        """
+        Adds reactions of multiple reacters with one query.
+        Already existing reactions are ignored.
+        """
+        table = Table("board.reactions")
+        await table.db.execute_many(
+            (
+                f"INSERT INTO {table.name} (message_id, reacter_id, emoji)\n"
+                f"VALUES ($1, $2, $3)\n"
+                f"ON CONFLICT DO NOTHING"
+            ),
+            [(message_id, reacter_id, emoji) for reacter_id in reacter_ids],
+        )
+        cls._cache_add_entry(guild_id, emoji, message_id)
+
+    @classmethod
+    async def remove_reactions(
+        cls,
+        message_id: int,
+        reacter_ids: Iterable[int],
+        emoji: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Deletes reactions of multiple reacters with one query
+
+        Returns:
+        -------
+        List[Dict[str, Any]] :
+            Deleted records
+        """
+        table = Table("board.reactions")
+        return await table.fetch(
+            (
+                f"DELETE FROM {table.name}\n"
+                f"WHERE message_id = $1 AND emoji = $2 AND reacter_id = ANY($3)\n"
+                f"RETURNING *"
+            ),
+            message_id, emoji, list(reacter_ids)
+        )
+
     @classmethod
     async def fetch_entry_reaction_amount(
         cls,
@@ -4,7 +4,7 @@ from typing import *
 from cachetools import TTLCache
 from asyncache import cached
 
-from core import Table, getLogger
+from core import Table, Database, WriteBuffer, getLogger
 
 
 log = getLogger(__name__)
@@ -17,12 +17,20 @@ class MusicHistoryHandler:
     table = Table("music_history")
 
     @classmethod
-    async def add(cls, guild_id: int, title: str, url: str):
-        await cls.table.insert(
-            ["title", "url", "played_on", "guild_id"], 
-            [title, url, datetime.datetime.now(), guild_id]
+    def _buffer(cls) -> WriteBuffer:
+        return Database().write_buffer(
+            cls.table.name,
+            ["title", "url", "played_on", "guild_id"],
+            max_rows=100,
+            flush_interval=10,
+            use_copy=True,
         )
 
+    @classmethod
+    async def add(cls, guild_id: int, title: str, url: str):
+        """queues a played title. It's written with the next flush of the write buffer"""
+        cls._buffer().add(title, url, datetime.datetime.now(), guild_id)
+
     @classmethod
     async def get(cls, guild_id: int) -> List[Dict[str, Any]]:
         """
@@ -39,6 +47,7 @@ class MusicHistoryHandler:
             a list with all the records in DESC order.
             keys: `title`, `url`
         """
+        await cls._buffer().flush()
         records = await cls.table.fetch(
             f"SELECT * FROM {cls.table.name} WHERE guild_id = $1 ORDER BY played_on DESC LIMIT {cls.max_length}", 
             guild_id
@@ -62,6 +71,7 @@ class MusicHistoryHandler:
             a list with all the records in DESC order.
             keys: `title`, `url`
         """
+        await cls._buffer().flush()
         return await cls.table.fetch(
             f"SELECT title, url FROM {cls.table.name} WHERE guild_id = $1 ORDER BY played_on DESC LIMIT {cls.max_length}", 
             guild_id
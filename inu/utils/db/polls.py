@@ -20,6 +20,7 @@ import pandas
 from core.bot import Inu
 from core import Database, Table
 from core import getLogger, Table
+from utils import Timers
 
 if TYPE_CHECKING:
     from utils import Poll
@@ -30,6 +31,224 @@ log = getLogger(__name__)
 # the time in seconds, after the next sql statement, to get further reminders, will be executed
 POLL_SYNC_TIME = 5*60
 
+
+class PollState:
+    """
+    Live state of one poll: its options and the voters of every option
+    """
+    __slots__ = ("record", "options", "reactions", "option_by_reaction", "votes", "vote_of")
+
+    def __init__(self, record: Mapping[str, Any]):
+        self.record: Dict[str, Any] = dict(record)
+        # option_id -> description
+        self.options: Dict[int, str] = {}
+        # option_id -> reaction / letter
+        self.reactions: Dict[int, str] = {}
+        self.option_by_reaction: Dict[str, int] = {}
+        # option_id -> user_ids
+        self.votes: Dict[int, Set[int]] = {}
+        # user_id -> option_id
+        self.vote_of: Dict[int, int] = {}
+
+    @property
+    def poll_id(self) -> int:
+        return self.record["poll_id"]
+
+    @property
+    def message_id(self) -> int:
+        return self.record["message_id"]
+
+    def add_option(self, option_id: int, reaction: str, description: str) -> None:
+        self.options[option_id] = description
+        self.reactions[option_id] = reaction
+        self.option_by_reaction[reaction] = option_id
+        self.votes.setdefault(option_id, set())
+
+    def vote(self, user_id: int, option_id: int) -> Optional[int]:
+        """
+        Moves the vote of <`user_id`> to <`option_id`>.
+
+        Returns:
+        --------
+        int | None:
+            the option the user voted for before
+        """
+        old = self.vote_of.get(user_id)
+        if old is not None:
+            self.votes[old].discard(user_id)
+        self.votes.setdefault(option_id, set()).add(user_id)
+        self.vote_of[user_id] = option_id
+        return old
+
+    @property
+    def total_votes(self) -> int:
+        return len(self.vote_of)
+
+
+class PollStore:
+    """
+    In-memory state of all active polls.
+
+    Votes are applied to the state directly and written to `poll_votes` in the background.
+    Pending votes are coalesced per user - only the last click is written.
+    """
+    FLUSH_INTERVAL: float = 5
+    # poll_id -> state
+    _polls: Dict[int, PollState] = {}
+    # message_id -> poll_id
+    _by_message: Dict[int, int] = {}
+    # (poll_id, user_id) -> option_id
+    _pending: Dict[Tuple[int, int], int] = {}
+    _flush_timer: Optional[asyncio.TimerHandle] = None
+    _flush_task: Optional[asyncio.Task] = None
+    _flush_lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def get(cls, poll_id: int) -> Optional[PollState]:
+        return cls._polls.get(poll_id)
+
+    @classmethod
+    def all(cls) -> List[PollState]:
+        return list(cls._polls.values())
+
+    @classmethod
+    def by_message(cls, message_id: int) -> Optional[PollState]:
+        poll_id = cls._by_message.get(message_id)
+        if poll_id is None:
+            return None
+        return cls._polls.get(poll_id)
+
+    @classmethod
+    def _add(cls, state: PollState) -> PollState:
+        cls._polls[state.poll_id] = state
+        cls._by_message[state.message_id] = state.poll_id
+        return state
+
+    @classmethod
+    async def load_all(cls) -> int:
+        """
+        Rebuilds the store with all polls, options and votes of the db.
+
+        Returns:
+        --------
+        int:
+            the amount of loaded polls
+        """
+        db = Database()
+        polls = await db.fetch("SELECT * FROM polls")
+        options = await db.fetch("SELECT * FROM poll_options")
+        votes = await db.fetch("SELECT poll_id, option_id, user_id FROM poll_votes")
+        cls._polls.clear()
+        cls._by_message.clear()
+        for record in polls:
+            cls._add(PollState(record))
+        for option in options:
+            if (state := cls._polls.get(option["poll_id"])):
+                state.add_option(option["option_id"], option["reaction"], option["description"])
+        for vote in votes:
+            if (state := cls._polls.get(vote["poll_id"])):
+                state.vote(vote["user_id"], vote["option_id"])
+        # votes, which weren't written yet, are newer than the db
+        for (poll_id, user_id), option_id in cls._pending.items():
+            if (state := cls._polls.get(poll_id)):
+                state.vote(user_id, option_id)
+        return len(cls._polls)
+
+    @classmethod
+    async def get_or_load(cls, poll_id: int) -> Optional[PollState]:
+        """
+        Returns the state of <`poll_id`>. Polls which are not in the store yet
+        are loaded from the db
+        """
+        if (state := cls._polls.get(poll_id)):
+            return state
+        db = Database()
+        records = await db.fetch("SELECT * FROM polls WHERE poll_id = $1", poll_id)
+        if not records:
+            return None
+        state = PollState(records[0])
+        for option in await PollManager.fetch_options(poll_id):
+            state.add_option(option["option_id"], option["reaction"], option["description"])
+        for vote in await PollManager.fetch_votes(poll_id):
+            state.vote(vote["user_id"], vote["option_id"])
+        # another task could have loaded it meanwhile
+        return cls._polls.get(poll_id) or cls._add(state)
+
+    @classmethod
+    def vote(cls, poll_id: int, user_id: int, option_id: int) -> None:
+        """
+        Applies the vote to the store and queues it for the db
+        """
+        state = cls._polls[poll_id]
+        if state.vote(user_id, option_id) == option_id:
+            return
+        cls._pending[(poll_id, user_id)] = option_id
+        cls._schedule_flush()
+
+    @classmethod
+    def _schedule_flush(cls) -> None:
+        if cls._flush_timer is None:
+            cls._flush_timer = asyncio.get_running_loop().call_later(
+                cls.FLUSH_INTERVAL, cls._start_flush
+            )
+
+    @classmethod
+    def _start_flush(cls) -> None:
+        # referenced, that the flush is not garbage collected
+        cls._flush_task = asyncio.create_task(cls.flush())
+
+    @classmethod
+    def forget(cls, poll_id: int) -> None:
+        """removes the poll and its pending votes"""
+        state = cls._polls.pop(poll_id, None)
+        if state is not None:
+            cls._by_message.pop(state.message_id, None)
+        for key in [key for key in cls._pending if key[0] == poll_id]:
+            del cls._pending[key]
+
+    @classmethod
+    async def flush(cls) -> int:
+        """
+        Writes all pending votes.
+
+        Returns:
+        --------
+        int:
+            the amount of written votes
+        """
+        if cls._flush_lock is None:
+            cls._flush_lock = asyncio.Lock()
+        async with cls._flush_lock:
+            if cls._flush_timer is not None:
+                cls._flush_timer.cancel()
+                cls._flush_timer = None
+            pending, cls._pending = cls._pending, {}
+            if not pending:
+                return 0
+            db = Database()
+            try:
+                await db.execute_many(
+                    "DELETE FROM poll_votes WHERE poll_id = $1 AND user_id = $2",
+                    list(pending.keys()),
+                )
+                await db.execute_many(
+                    (
+                        "INSERT INTO poll_votes (poll_id, option_id, user_id) "
+                        "VALUES ($1, $2, $3) ON CONFLICT DO NOTHING"
+                    ),
+                    [(poll_id, option_id, user_id) for (poll_id, user_id), option_id in pending.items()],
+                )
+            except Exception:
+                log.error(f"failed to write {len(pending)} poll votes:\n{traceback.format_exc()}")
+                # keep them for the next flush, unless the poll is gone meanwhile
+                for (poll_id, user_id), option_id in pending.items():
+                    if poll_id in cls._polls:
+                        cls._pending.setdefault((poll_id, user_id), option_id)
+                if cls._pending:
+                    cls._schedule_flush()
+                return 0
+            return len(pending)
+
 class PollManager:
     bot: Inu
     db: Database
@@ -54,7 +273,8 @@ class PollManager:
         table = Table("polls")
         records = await table.fetch(sql, datetime.now())
         for record in records:
-            cls.message_id_cache.remove(record["message_id"])
+            cls.message_id_cache.discard(record["message_id"])
+            PollStore.forget(record["poll_id"])
         log.info(f"Deleted {len(records)} old polls", prefix="task")
         
 
@@ -188,7 +408,9 @@ class PollManager:
             matching_values=vals
         )
         for p in poll_records:
-            cls.message_id_cache.remove(p["message_id"])
+            cls.message_id_cache.discard(p["message_id"])
+            PollStore.forget(p["poll_id"])
+            Timers.cancel("poll", p["poll_id"])
 
     @classmethod
     async def add_vote(cls, poll_id: int, user_id: int, option_id: str):
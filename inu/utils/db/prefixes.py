@@ -28,7 +28,7 @@ class PrefixManager:
         prefixes.append(prefix)
         prefixes = list(set(prefixes))
         await table.upsert(["guild_id", "prefixes"], [guild_id, prefixes])
-        table.db.bot._prefixes[guild_id] = prefixes
+        table.db.bot.prefix_cache.set(guild_id, prefixes)
         return prefixes
 
     @classmethod
@@ -52,7 +52,7 @@ class PrefixManager:
             pass
         prefixes = list(set(prefixes))
         await table.upsert(["guild_id", "prefixes"], [guild_id, prefixes])
-        table.db.bot._prefixes[guild_id] = prefixes
+        table.db.bot.prefix_cache.set(guild_id, prefixes)
         return prefixes
 
     @classmethod
@@ -70,8 +70,11 @@ class PrefixManager:
             List[str]: a list with prefixes
         """
         table = Table("guilds")
-        rec = await table.fetch_by_id("guild_id", guild_id)
         prefixes = [table.db.bot.conf.bot.DEFAULT_PREFIX]
+        if (cached := table.db.bot.prefix_cache.get(guild_id)) is not None:
+            prefixes.extend(cached)
+            return prefixes
+        rec = await table.fetch_by_id("guild_id", guild_id)
         if rec:
             prefixes.extend(rec["prefixes"])
         return prefixes
\ No newline at end of file
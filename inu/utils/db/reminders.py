@@ -8,6 +8,8 @@ import asyncio
 from enum import Enum
 import time
 import re
+import heapq
+import itertools
 
 import hikari
 from hikari.impl import MessageActionRowBuilder
@@ -26,8 +28,10 @@ from core import getLogger
 log = getLogger(__name__)
 
 
-# the time in seconds, after the next sql statement, to get further reminders, will be executed
+# reminders which are at least this amount of seconds in the future will be stored in the DB
 REMINDER_UPDATE = 5*60
+# reminders which are due within this amount of seconds will be fired together
+REMINDER_BATCH_WINDOW = 1.0
 
 
 def get_seconds_until_next(weekday: int) -> int:
@@ -427,12 +431,25 @@ class HikariReminder(BaseReminder):
         self.bot: Inu = Reminders.bot
 
         if self._query:
-            if self.in_seconds >= Reminders.REMINDER_UPDATE:
-                loop = asyncio.get_event_loop()
-                asyncio.Task(self.store_reminder(), loop=loop)
-            else:
-                asyncio.Task(self.schedule())
-    
+            self.start()
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        """the key of this reminder in the `ReminderScheduler`"""
+        if self.id:
+            return ("db", self.id)
+        return ("local", id(self))
+
+    def start(self):
+        """
+        Schedules the reminder. Long reminders will be stored in the DB before.
+        """
+        if self.in_seconds >= Reminders.REMINDER_UPDATE:
+            task = asyncio.create_task(self.store_reminder())
+            Reminders._storing.add(task)
+            task.add_done_callback(Reminders._storing.discard)
+        else:
+            Reminders.scheduler.schedule(self)
 
 
     @property
@@ -444,11 +461,7 @@ class HikariReminder(BaseReminder):
 
     async def store_reminder(self):
         self.id = await Reminders.add_reminder(self)
-
-    async def schedule(self):
-        await asyncio.sleep(self.remaining_time)
-        await self.destroy_reminder()
-        await self.send_message()
+        Reminders.scheduler.schedule(self)
 
     async def send_message(self):
         snooze_times = {
@@ -497,21 +510,17 @@ class HikariReminder(BaseReminder):
         reminder.datetime = datetime.datetime.fromtimestamp(reminder.wait_until)
         reminder.remind_text = self.remind_text
         reminder.in_seconds = int(value)
-        if reminder.in_seconds >= Reminders.REMINDER_UPDATE:
-            loop = asyncio.get_event_loop()
-            asyncio.Task(reminder.store_reminder(), loop=loop)
-        else:
-            asyncio.Task(reminder.schedule())
+        reminder.start()
         
         
     async def destroy_reminder(self):
         """
-        Deleting the DB entry, and the element in the set
+        Deleting the DB entry and cancels the scheduled reminder
         """
         if not self.id:
+            Reminders.scheduler.cancel(self.key)
             return  # reminder was to short to being stored
-        record = await Reminders.delete_reminder_by_id(self.id)
-        Reminders.delete_from_set(record)
+        await Reminders.delete_reminder_by_id(self.id)
 
     def from_database(
         self,
@@ -523,10 +532,7 @@ class HikariReminder(BaseReminder):
         self.datetime = timestamp
         self.remind_text = remind_text
         self.wait_until = self.datetime.timestamp()
-        asyncio.Task(
-            self.schedule(),
-            loop=asyncio.get_running_loop(),
-        )
+        Reminders.scheduler.schedule(self)
         
 
 
@@ -548,10 +554,99 @@ class HikariReminder(BaseReminder):
         if len(matches) > 1:
             raise RuntimeError(f"Found multiple time units ({matches}) with the given unit `{unit}`")
 
+class ReminderScheduler:
+    """
+    Schedules all reminders with one timer.
+
+    Reminders are kept in a min-heap by their due time. One task sleeps until the 
+    earliest reminder is due and fires all reminders which are due together.
+    Cancelled or rescheduled reminders are dropped lazily, when they reach the top of the heap.
+    """
+    def __init__(self):
+        # (due time, sequence, key)
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        # key -> (sequence, reminder) - only the entry with the matching sequence is valid
+        self._entries: Dict[Hashable, Tuple[int, HikariReminder]] = {}
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # fired batches - referenced, that they are not garbage collected
+        self._running: Set["asyncio.Task[Any]"] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def schedule(self, reminder: HikariReminder) -> None:
+        """
+        Schedules <`reminder`> at `reminder.wait_until`. 
+        A reminder with the same key will be replaced.
+        """
+        seq = next(self._sequence)
+        self._entries[reminder.key] = (seq, reminder)
+        heapq.heappush(self._heap, (reminder.wait_until, seq, reminder.key))
+        self._ensure_running()
+        if self._heap[0][1] == seq:
+            # new earliest reminder
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> Optional[HikariReminder]:
+        """
+        Cancels the reminder with <`key`>
+
+        Returns:
+        --------
+        Optional[HikariReminder] :
+            the cancelled reminder or None if there was no reminder with <`key`>
+        """
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def _ensure_running(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _is_valid(self, seq: int, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] == seq
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            while self._heap and not self._is_valid(self._heap[0][1], self._heap[0][2]):
+                heapq.heappop(self._heap)
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            due: List[HikariReminder] = []
+            until = time.time() + REMINDER_BATCH_WINDOW
+            while self._heap and self._heap[0][0] <= until:
+                _, seq, key = heapq.heappop(self._heap)
+                if self._is_valid(seq, key):
+                    due.append(self._entries.pop(key)[1])
+            if due:
+                task = asyncio.create_task(Reminders.fire_reminders(due))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+
 class Reminders:
     db: Database
     bot: lightbulb.BotApp
-    running_reminders = set()
+    scheduler: ReminderScheduler = ReminderScheduler()
+    # long reminders, which are stored right now
+    _storing: Set["asyncio.Task[Any]"] = set()
     REMINDER_UPDATE = REMINDER_UPDATE
     
     def __init__(self, key: Optional[str] = None):
@@ -577,21 +672,19 @@ class Reminders:
         log.info(f"Cleaned up reminders: {len(records)} reminders where removed", prefix="task")
 
     @classmethod
-    def add_reminders_to_set(cls, records: List[asyncpg.Record]):
+    def schedule_records(cls, records: List[asyncpg.Record]):
         """
-        Add a reminder to the set of running reminders.
-        Used as cache to avoid duplicates.
+        Schedules reminders from the DB, which are not scheduled yet.
 
         Args:
         -----
         records: List[asyncpg.Record]
-            The records which contain the reminder data which should be added to the set.
+            The records which contain the reminder data
         """
         for r in records:
-            if r["reminder_id"] in cls.running_reminders:
+            if ("db", r["reminder_id"]) in cls.scheduler:
                 continue
-            cls.running_reminders.add(r["reminder_id"])
-            log.debug(f"add reminder | id: {r['reminder_id']}; text: {'remind_text'}")
+            log.debug(f"add reminder | id: {r['reminder_id']}; text: {r['remind_text']}")
             reminder = HikariReminder(
                 channel_id=r["channel_id"],
                 creator_id=r["creator_id"],
@@ -604,15 +697,22 @@ class Reminders:
             )
 
     @classmethod
-    def delete_from_set(cls, reminder: asyncpg.Record):
-        """
-        remove a reminder form the cache set.
-        """
-        log.debug(f"del: {reminder}")
-        try:
-            cls.running_reminders.remove(reminder["reminder_id"])
-        except Exception:
-            log.warning(f"utils.Reminders - delte_from_set \n {traceback.format_exc()}")
+    async def fire_reminders(cls, reminders: List[HikariReminder]):
+        """
+        Deletes the stored <`reminders`> with one query and sends all of them
+        """
+        if (ids := [r.id for r in reminders if r.id]):
+            try:
+                await cls.db.execute("DELETE FROM reminders WHERE reminder_id = ANY($1)", ids)
+            except Exception:
+                log.error(f"failed to delete fired reminders {ids}:\n{traceback.format_exc()}")
+        results = await asyncio.gather(
+            *[reminder.send_message() for reminder in reminders], 
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                log.error(f"failed to send reminder: {''.join(traceback.format_exception(result))}")
 
     @classmethod
     async def add_reminder(cls, reminder: HikariReminder) -> int:
@@ -632,7 +732,7 @@ class Reminders:
         VALUES($1, $2, $3, $4, $5)
         RETURNING reminder_id
         """
-        id = await cls.db.row(
+        record = await cls.db.row(
             sql,
             reminder.remind_text, 
             reminder.channel_id, 
@@ -640,7 +740,7 @@ class Reminders:
             reminder.message_id,
             reminder.datetime
         )
-        return id
+        return record["reminder_id"]
 
     @classmethod
     async def fetch_reminder_by_id(cls, id: int) -> Optional[asyncpg.Record]:
@@ -683,6 +783,7 @@ class Reminders:
         RETURNING *
         """
         record = await cls.db.row(sql, id)
+        cls.scheduler.cancel(("db", id))
         if not record:
             return None
         return record
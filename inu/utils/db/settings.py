@@ -40,6 +40,6 @@ class SettingsManager:
             Mapping from guild_id to activity_tracking bool Dict[guild_id, is_activity_tracking_enabled]
         """
         table = Table("guilds")
-        records = table.fetch(f"SELECT guild_id, activity_tracking FROM {table.name}")
+        records = await table.fetch(f"SELECT guild_id, activity_tracking FROM {table.name}") or []
         mappings = {r["guild_id"]: r["activity_tracking"] for r in records}
         return mappings
\ No newline at end of file
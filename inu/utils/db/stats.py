@@ -1,5 +1,7 @@
 from typing import *
+import asyncio
 import json
+import traceback
 import typing as t
 import logging
 
@@ -14,6 +16,25 @@ T = t.TypeVar("T")
 class InvokationStats:
     db: Database
     bot: Inu
+    # seconds between two writes of the aggregated invocations
+    FLUSH_INTERVAL: int = 30
+    # Mapping from guild_id to a mapping from command name to not yet written invocations
+    _pending: Dict[int, Dict[str, int]] = {}
+    _flush_lock: Optional[asyncio.Lock] = None
+
+    # adds the counts of $2 to the counts in cmd_json - in one atomic statement
+    _increment_sql = """
+    INSERT INTO stats (guild_id, cmd_json)
+    VALUES ($1, $2::jsonb)
+    ON CONFLICT (guild_id) DO UPDATE
+    SET cmd_json = COALESCE(stats.cmd_json, '{}'::jsonb) || (
+        SELECT jsonb_object_agg(
+            d.key, 
+            COALESCE((stats.cmd_json->>d.key)::BIGINT, 0) + d.value::BIGINT
+        )
+        FROM jsonb_each_text(EXCLUDED.cmd_json) AS d
+    )
+    """
 
     def __init__(self, key: Optional[str] = None):
         self.key = key
@@ -22,6 +43,7 @@ class InvokationStats:
     def init_db(cls, bot: Inu):
         cls.db = bot.db
         cls.bot = bot
+        bot.add_task(cls.flush, seconds=cls.FLUSH_INTERVAL)
 
     @classmethod
     def bare_bone_json(
@@ -105,20 +127,38 @@ class InvokationStats:
             - command_name: (str) the name of the command, where <value> should be added
             - guild_id: (int) the id of the guild
             - value: (int, default=1) the value which should be added to <command_name> for guild with id <guild_id>
-        """
-        sql = """
-        SELECT * FROM stats
-        WHERE guild_id = $1
+
+        Note:
+        -----
+            - the value is aggregated in memory and written with the next `flush`
         """
         if guild_id is None:
             guild_id = -1
-        record = await cls.db.row(sql, guild_id)
-        if record:
-            json_ = record["cmd_json"]
-        else:
-            json_ = cls.bare_bone_json(command_name, guild_id)
-        json_ = cls.manipulate_json_value(json_, command_name, value)
-        await cls.update_json(json_, guild_id)
+        commands = cls._pending.setdefault(guild_id, {})
+        commands[command_name] = commands.get(command_name, 0) + value
+
+    @classmethod
+    async def flush(cls) -> None:
+        """
+        Writes all aggregated invocations with one atomic increment per guild
+        """
+        if cls._flush_lock is None:
+            cls._flush_lock = asyncio.Lock()
+        async with cls._flush_lock:
+            pending, cls._pending = cls._pending, {}
+            if not pending:
+                return
+            try:
+                await cls.db.execute_many(
+                    cls._increment_sql,
+                    [(guild_id, json.dumps(commands)) for guild_id, commands in pending.items()],
+                )
+            except Exception:
+                log.error(f"failed to write command stats:\n{traceback.format_exc()}")
+                # keep the counts for the next try
+                for guild_id, commands in pending.items():
+                    for command_name, value in commands.items():
+                        await cls.add_or_sub(command_name, guild_id, value)
 
     @classmethod
     async def fetch_json(cls, guild_id: Optional[int]) -> Optional[Dict]:
@@ -131,6 +171,7 @@ class InvokationStats:
         """
         if guild_id is None:
             guild_id = -1
+        await cls.flush()
         sql = """
         SELECT * FROM stats
         WHERE guild_id = $1
@@ -146,6 +187,7 @@ class InvokationStats:
         """
         Get a json in form of a dict, with all the command infos
         """
+        await cls.flush()
         records = await cls.db.fetch("SELECT * FROM stats")
         json_ = {}
         for rec in records:
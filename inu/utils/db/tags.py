@@ -10,8 +10,10 @@ from typing import (
     Set
 )
 import asyncio
+import bisect
 import typing
 from copy import deepcopy
+from functools import lru_cache
 from enum import Enum
 import re
 from datetime import datetime
@@ -488,10 +490,171 @@ class TagScope(Enum):
 
 
 
+class TagNameIndex:
+    """
+    In-memory index of tag keys and aliases, grouped by scope (guild/channel id, 0 = global).
+    Answers prefix and trigram similarity searches without a DB round trip.
+
+    Note:
+    -----
+        - similarity is computed like `pg_trgm.similarity`
+    """
+    def __init__(self):
+        # tag_id -> (tag_key, aliases, guild_ids)
+        self._tags: Dict[int, Tuple[str, Tuple[str, ...], Tuple[int, ...]]] = {}
+        self._last_use: Dict[int, datetime] = {}
+        # scope -> name -> tag_ids
+        self._names: Dict[int, Dict[str, Set[int]]] = {}
+        # scope -> sorted names for prefix search
+        self._sorted_names: Dict[int, List[str]] = {}
+        # scope -> trigram -> names
+        self._trigrams: Dict[int, Dict[str, Set[str]]] = {}
+        self.loaded = False
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def trigrams(text: str) -> frozenset:
+        """trigrams of <`text`> like pg_trgm creates them"""
+        grams = set()
+        for word in re.findall(r"[^\W_]+", text.lower()):
+            padded = f"  {word} "
+            grams.update(padded[i:i+3] for i in range(len(padded) - 2))
+        return frozenset(grams)
+
+    @classmethod
+    def similarity(cls, a: str, b: str) -> float:
+        t_a, t_b = cls.trigrams(a), cls.trigrams(b)
+        if not t_a or not t_b:
+            return 0.0
+        return len(t_a & t_b) / len(t_a | t_b)
+
+    def load(self, records: List[Mapping[str, Any]]) -> None:
+        """(re)builds the index from tag records"""
+        for container in (self._tags, self._last_use, self._names, self._sorted_names, self._trigrams):
+            container.clear()
+        for record in records:
+            self.add(record["tag_id"], record["tag_key"], record["aliases"], record["guild_ids"], record["last_use"])
+        self.loaded = True
+
+    def add(
+        self, 
+        tag_id: int, 
+        tag_key: str, 
+        aliases: Optional[List[str]], 
+        guild_ids: Optional[List[int]], 
+        last_use: Optional[datetime] = None,
+    ) -> None:
+        """adds or replaces a tag"""
+        self.remove(tag_id)
+        aliases_ = tuple(a for a in (aliases or []) if a)
+        guild_ids_ = tuple(g for g in (guild_ids or []) if g is not None)
+        self._tags[tag_id] = (tag_key, aliases_, guild_ids_)
+        self._last_use[tag_id] = last_use or datetime.min
+        for scope in guild_ids_:
+            for name in (tag_key, *aliases_):
+                self._add_name(scope, name, tag_id)
+
+    def remove(self, tag_id: int) -> None:
+        if (tag := self._tags.pop(tag_id, None)) is None:
+            return
+        self._last_use.pop(tag_id, None)
+        tag_key, aliases, guild_ids = tag
+        for scope in guild_ids:
+            for name in (tag_key, *aliases):
+                self._remove_name(scope, name, tag_id)
+
+    def used(self, tag_id: int, last_use: datetime) -> None:
+        if tag_id in self._last_use:
+            self._last_use[tag_id] = last_use
+
+    def _add_name(self, scope: int, name: str, tag_id: int) -> None:
+        names = self._names.setdefault(scope, {})
+        if name not in names:
+            names[name] = set()
+            bisect.insort(self._sorted_names.setdefault(scope, []), name)
+            trigrams = self._trigrams.setdefault(scope, {})
+            for gram in self.trigrams(name):
+                trigrams.setdefault(gram, set()).add(name)
+        names[name].add(tag_id)
+
+    def _remove_name(self, scope: int, name: str, tag_id: int) -> None:
+        names = self._names.get(scope, {})
+        if not (tag_ids := names.get(name)):
+            return
+        tag_ids.discard(tag_id)
+        if tag_ids:
+            return
+        del names[name]
+        sorted_names = self._sorted_names[scope]
+        sorted_names.pop(bisect.bisect_left(sorted_names, name))
+        trigrams = self._trigrams[scope]
+        for gram in self.trigrams(name):
+            trigrams[gram].discard(name)
+            if not trigrams[gram]:
+                del trigrams[gram]
+
+    def _scopes(self, guild_id: Optional[int]) -> List[int]:
+        return [0] if not guild_id else [guild_id, 0]
+
+    def _tag_ids(self, scope: int, name: str) -> Set[int]:
+        return self._names.get(scope, {}).get(name, set())
+
+    def startswith(self, prefix: str, guild_id: Optional[int], limit: int = 25) -> List[str]:
+        """
+        Returns:
+        --------
+        List[str] :
+            keys and aliases starting with <`prefix`>, ordered by last use
+        """
+        found: Dict[str, datetime] = {}
+        for scope in self._scopes(guild_id):
+            sorted_names = self._sorted_names.get(scope, [])
+            i = bisect.bisect_left(sorted_names, prefix)
+            while i < len(sorted_names) and sorted_names[i].startswith(prefix):
+                name = sorted_names[i]
+                last_use = max(self._last_use[tag_id] for tag_id in self._tag_ids(scope, name))
+                found[name] = max(last_use, found.get(name, datetime.min))
+                i += 1
+        return sorted(found, key=lambda name: found[name], reverse=True)[:limit]
+
+    def find_similar(self, query: str, guild_id: Optional[int], threshold: float, limit: int = 20) -> List[str]:
+        """
+        Returns:
+        --------
+        List[str] :
+            tag keys where the key or an alias is more similar than <`threshold`> to <`query`>.
+            Ordered by similarity of the key
+        """
+        query_grams = self.trigrams(query)
+        tag_ids: Set[int] = set()
+        for scope in self._scopes(guild_id):
+            trigrams = self._trigrams.get(scope, {})
+            # only names sharing a trigram can be similar at all
+            candidates = set()
+            for gram in query_grams:
+                candidates.update(trigrams.get(gram, ()))
+            for name in candidates:
+                if self.similarity(name, query) > threshold:
+                    tag_ids.update(self._tag_ids(scope, name))
+        keys = {self._tags[tag_id][0] for tag_id in tag_ids}
+        return sorted(keys, key=lambda key: self.similarity(key, query), reverse=True)[:limit]
+
+    def recent(self, guild_id: Optional[int], limit: int = 25) -> List[str]:
+        """the keys of the last used tags"""
+        tag_ids: Set[int] = set()
+        for scope in self._scopes(guild_id):
+            for ids in self._names.get(scope, {}).values():
+                tag_ids.update(ids)
+        tag_ids_ = sorted(tag_ids, key=lambda tag_id: self._last_use[tag_id], reverse=True)
+        return [self._tags[tag_id][0] for tag_id in tag_ids_[:limit]]
+
+
 class TagManager():
     db: Database
     bot: Inu
     table: Table
+    index: TagNameIndex = TagNameIndex()
+    _index_lock: Optional[asyncio.Lock] = None
 
     def __init__(self, key: Optional[str] = None):
         self.key = key
@@ -575,6 +738,7 @@ class TagManager():
             tag_type,
             info_visible,
         )
+        cls.index.add(record["tag_id"], key, aliases, guild_ids, datetime.now())
         return record["tag_id"]
 
     @classmethod
@@ -643,7 +807,9 @@ class TagManager():
             WHERE tag_id = $1
             RETURNING *
             """
-        return await cls.db.fetch(sql, id)
+        records = await cls.db.fetch(sql, id)
+        cls.index.remove(id)
+        return records
 
     @classmethod
     async def get(
@@ -731,6 +897,13 @@ class TagManager():
             record["type"],
             record["info_visible"],
         )
+        cls.index.add(
+            record["tag_id"], 
+            record["tag_key"], 
+            list(record["aliases"]), 
+            list(record["guild_ids"]), 
+            record["last_use"]
+        )
 
     @classmethod
     async def is_global_taken(cls, key: str, tags: Optional[List[str]] = None):
@@ -843,8 +1016,23 @@ class TagManager():
     @classmethod
     async def _update_tag_last_use(cls, tag_id: int, tag_uses: int):
         table = Table("tags")
-        
-        await table.update({"last_use": datetime.now(), "uses": tag_uses}, {"tag_id": tag_id})
+        now = datetime.now()
+        await table.update({"last_use": now, "uses": tag_uses}, {"tag_id": tag_id})
+        cls.index.used(tag_id, now)
+
+    @classmethod
+    async def get_index(cls) -> TagNameIndex:
+        """returns the `TagNameIndex`. It's loaded with the first call"""
+        if cls.index.loaded:
+            return cls.index
+        if cls._index_lock is None:
+            cls._index_lock = asyncio.Lock()
+        async with cls._index_lock:
+            if not cls.index.loaded:
+                records = await cls.db.fetch("SELECT tag_id, tag_key, aliases, guild_ids, last_use FROM tags")
+                cls.index.load(records)
+                log.info(f"loaded {len(records)} tags into the name index", prefix="init")
+        return cls.index
     
     @classmethod
     async def get_tags(
@@ -1051,25 +1239,17 @@ class TagManager():
         """autocomplete for tag keys"""
         guild_or_channel = get_guild_or_channel_id(interaction)
         try:
+            index = await cls.get_index()
             if option.value and len(str(option.value)) > 2:
-                tags = await cls.find_similar(option.value, guild_id=guild_or_channel)
-                return [tag['tag_key'] for tag in tags][:24]
+                return index.find_similar(
+                    str(option.value), 
+                    guild_id=guild_or_channel, 
+                    threshold=cls.bot.conf.tags.prediction_accuracy,
+                )[:24]
             elif option.value and len(str(option.value)) in [1, 2]:
-                tags = await cls.startswith(option.value, guild_id=guild_or_channel)
-                return [
-                    name for name in 
-                    [
-                        *[name for tag in tags for name in tag["aliases"]], 
-                        *[tag['tag_key'] for tag in tags]
-                    ] 
-                    if name.startswith(option.value) ][:24]
+                return index.startswith(str(option.value), guild_id=guild_or_channel)[:24]
             else:
-                tags = await cls.get_tags(
-                    type=TagScope.SCOPE,
-                    guild_id=guild_or_channel,
-                    limit=25
-                )
-                return [tag["tag_key"] for tag in tags][:24]
+                return index.recent(guild_id=guild_or_channel)[:24]
 
         except:
             log.error(traceback.format_exc())
@@ -36,6 +36,8 @@ from PIL import Image
 from pprint import pprint
 import logging
 
+from .render import RenderPool, RenderCache
+
 
 
 PERIOD_START = " "
@@ -950,6 +952,11 @@ def latex2image(
 
 from io import BytesIO
 
+# render parameters of evaluations - part of the render cache key
+EVALUATION_IMAGE_SIZE = (3, 2)
+EVALUATION_FONTSIZE = 16
+EVALUATION_DPI = 100
+
 def evaluation2image(evaluation: str, multiline: bool = False) -> BytesIO:
     """
     Converts a mathematical evaluation string into an image using LaTeX.
@@ -969,9 +976,60 @@ def evaluation2image(evaluation: str, multiline: bool = False) -> BytesIO:
         logging.debug("No latex needed")
         return None
     latex = "\n".join(evaluations)
-    image = latex2image(latex, multiline=multiline)
+    image = latex2image(
+        latex,
+        image_size_in=EVALUATION_IMAGE_SIZE,
+        fontsize=EVALUATION_FONTSIZE,
+        dpi=EVALUATION_DPI,
+        multiline=multiline,
+    )
     return image
 
+def evaluation2png(evaluation: str, multiline: bool = False) -> bytes | None:
+    """
+    Same as `evaluation2image`, but returns the raw PNG bytes.
+    Used as job for `RenderPool` workers.
+    """
+    image = evaluation2image(evaluation, multiline=multiline)
+    if image is None:
+        return None
+    return image.getvalue()
+
+# bump, when the rendering changes - invalidates the disk cache
+RENDER_VERSION = 2
+evaluation_cache = RenderCache(
+    directory=os.path.join(os.getcwd(), "inu/data/bot/render_cache/latex")
+)
+
+async def render_evaluation(evaluation: str, multiline: bool = False) -> BytesIO | None:
+    """
+    Cached version of `evaluation2image`, which renders in a `RenderPool` worker.
+
+    Args:
+        evaluation (str): The mathematical evaluation string.
+        multiline (bool, optional): Specifies whether the evaluation string contains multiple lines.
+
+    Returns:
+        BytesIO | None: The image or None if the evaluation doesn't need LaTeX.
+    """
+    # parsing is deterministic, hence the input identifies the LaTeX as well.
+    # The normalized input is rendered, that equal keys mean equal images
+    evaluation = RenderCache.normalize(evaluation)
+    key = RenderCache.key(
+        RENDER_VERSION, 
+        evaluation, 
+        EVALUATION_IMAGE_SIZE, 
+        EVALUATION_FONTSIZE, 
+        EVALUATION_DPI, 
+        multiline,
+    )
+    png = await evaluation_cache.get(key)
+    if png is None:
+        # empty bytes are cached for evaluations without LaTeX
+        png = await RenderPool.render(evaluation2png, evaluation, multiline=multiline) or b""
+        await evaluation_cache.set(key, png)
+    return BytesIO(png) if png else None
+
 def prepare_for_latex(result: str) -> str:
     """prepares the result for latex by removing unicode characters like √ or π"""
     result = result.replace("'", "") # remove number things for better readability
@@ -1,5 +1,8 @@
 from .base import (
     Paginator, 
+    PaginatorRouter,
+    PageProvider,
+    LazyPages,
     listener, 
     StatelessPaginator, 
     CustomID, 
@@ -7,6 +10,7 @@ from .base import (
     button,
     ButtonObserver
 )
+from .custom_id_codec import CustomIDCodec, CustomIDError
 from .tag import TagHandler, TagCustomID
 from .anime import AnimePaginator, AnimeCornerPaginator, AnimeCornerPaginator2
 from .anime_character import AnimeCharacterPaginator
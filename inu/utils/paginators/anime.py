@@ -85,6 +85,9 @@ class AnimePaginator(Paginator):
         self._max_endings: int = 4
         self._detailed: bool = False
         self._base_init_kwargs = kwargs or {}
+        # mal_ids, which are loaded in the background
+        self._prefetching: Set[int] = set()
+        self._prefetch_tasks: Set[asyncio.Task] = set()
 
         # re-init in start - just leave it
         super().__init__(
@@ -157,7 +160,7 @@ class AnimePaginator(Paginator):
             await self.send(self._pages[self._position], interaction=event.interaction)
             return
         elif custom_id == "btn_anime_re_search":
-            self._stop = True
+            self._stop.set()
             if self._old_message:
                 await self._old_message.delete()
             await self.bot.rest.delete_messages(self.ctx.channel_id, [self._message.id])
@@ -236,6 +239,7 @@ class AnimePaginator(Paginator):
         self._pages = await self._search_anime(anime_name, results)
         self._position = 0
         await self._load_details()
+        self._prefetch_neighbours()
         super().__init__(
             page_s=self._pages, 
             timeout=60*4, 
@@ -253,11 +257,40 @@ class AnimePaginator(Paginator):
         self._current_has_prequel = False
         self._current_has_sequel = False
         await self._load_details(detailed=detailed)
+        self._prefetch_neighbours()
         if detailed:
             self._detailed = True
         await super()._update_position(interaction)
         self._detailed = False
 
+    def _prefetch_neighbours(self) -> None:
+        """
+        Loads the anime of the previous and next page in the background,
+        that flipping pages doesn't wait for MyAnimeList
+        """
+        results = getattr(self, "_results", None)
+        if not results or len(results) < 2:
+            return
+        for offset in (1, -1):
+            result = results[(self._position + offset) % len(results)]
+            mal_id = result["node"]["id"]
+            if result.get("anime") or mal_id in self._prefetching:
+                continue
+            self._prefetching.add(mal_id)
+            task = asyncio.create_task(self._prefetch(result))
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def _prefetch(self, result: Dict[str, Any]) -> None:
+        mal_id = result["node"]["id"]
+        try:
+            # shares the request with `_fetch_current_anime`, if the page is opened meanwhile
+            result["anime"] = await MyAnimeList.fetch_anime_by_id(mal_id)
+        except Exception:
+            log.debug(f"prefetching anime {mal_id} failed:\n{traceback.format_exc()}")
+        finally:
+            self._prefetching.discard(mal_id)
+
 
     def _fuzzy_sort_results(self, compare_name: str):
         """fuzzy sort the anime result titles of  `self._results` by given name"""
@@ -84,7 +84,7 @@ class AnimeCharacterPaginator(Paginator):
             await self.send(self._pages[self._position], interaction=event.interaction)
             return
         elif event.interaction.custom_id == "btn_anime_re_search":
-            self._stop = True
+            self._stop.set()
             if self._old_message:
                 await self._old_message.delete()
             await self.bot.rest.delete_messages(self.ctx.channel_id, [self._message.id])
@@ -12,6 +12,7 @@ from pytimeparse.timeparse import timeparse
 from humanize import naturaldelta
 
 from . import Paginator, StatelessPaginator
+from .custom_id_codec import CustomIDCodec, UINT
 from ..db import AutoroleManager, AutoroleBuilder, AutoroleEvent
 
 from utils import crumble
@@ -220,6 +221,8 @@ class AutorolesView(miru.View):
         """predicate to check wether or not a user is allowed to use the view."""
         return context.message.id == self.message.id and context.author.id == self.author_id
     
+CustomIDCodec.register("autoroles", 2, autoid=UINT)
+
 class AutorolesViewer(StatelessPaginator):
     """
     Viewer for which person has got which role
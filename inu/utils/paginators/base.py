@@ -15,7 +15,11 @@ from typing import (
     Dict,
     Generic,
     Type,
+    Set,
+    AsyncIterator,
+    Awaitable,
 )
+from collections import OrderedDict
 import json
 import traceback
 import logging
@@ -40,11 +44,13 @@ from lightbulb.context import Context
 
 from core import InteractionContext, RESTContext, InuContext, get_context, BotResponseError, getLogger
 from utils.buttons import add_row_when_filled
+from utils.timer_wheel import TimerWheel
+from .custom_id_codec import CustomIDCodec, CustomIDError
 LOGLEVEL = logging.WARNING
 log = logging.getLogger(__name__)
 log.setLevel(LOGLEVEL)
 
-__all__: Final[List[str]] = ["Paginator", "BaseListener", "BaseObserver", "EventListener", "EventObserver"]
+__all__: Final[List[str]] = ["Paginator", "PaginatorRouter", "PageProvider", "LazyPages", "BaseListener", "BaseObserver", "EventListener", "EventObserver"]
 _Sendable = Union[Embed, str]
 T = TypeVar("T")
 
@@ -349,7 +355,10 @@ class CustomID():
     @classmethod
     def from_custom_id(cls, custom_id: str):
         try:
-            d = json.loads(custom_id)
+            if CustomIDCodec.is_binary(custom_id):
+                d = CustomIDCodec.decode(custom_id)
+            else:
+                d = json.loads(custom_id)
             if not isinstance(d, Dict):
                 raise TypeError
             custom_id_inst = cls(
@@ -362,7 +371,7 @@ class CustomID():
             custom_id_inst._kwargs = {k:v for k, v in d.items() if k not in ["t", "cid", "mid", "aid", "p"]}
             return custom_id_inst
         
-        except (TypeError, json.JSONDecodeError):
+        except (TypeError, KeyError, json.JSONDecodeError, CustomIDError):
             return cls(custom_id=custom_id)
 
     def get(self, key: str) -> int|str|None:
@@ -413,6 +422,15 @@ class CustomID():
         d.update(self._kwargs)
         log.debug(f"serialized custom_id: {d}")
         return JsonDict(d)
+
+    def encode(self) -> str:
+        """
+        Returns:
+        --------
+        str :
+            the custom_id encoded with `CustomIDCodec` - binary if the type is registered
+        """
+        return CustomIDCodec.encode(self.serialize_custom_id())
             
 class NavigationMenuBuilder():
     _pages: int = 0
@@ -607,10 +625,186 @@ class NavigationMenuBuilder():
         return action_row_builder
         
 
+class PaginatorRouter:
+    """
+    Routes events to the running paginators.
+
+    Interactions are looked up by the id of the message they belong to,
+    message events by their author. All other events from `listen_to_events`
+    go to every paginator which listens to them. Timeouts of all paginators
+    are handled by one `TimerWheel`.
+    """
+    _by_message: Dict[int, "Paginator"] = {}
+    _by_author: Dict[int, Set["Paginator"]] = {}
+    _listeners: Dict[Type[Event], Set["Paginator"]] = {}
+    _subscribed: Set[Type[Event]] = set()
+    wheel: TimerWheel = TimerWheel(tick=1.0, name="paginator timeouts")
+
+    @classmethod
+    def register(cls, paginator: "Paginator") -> None:
+        """starts routing events to <`paginator`>"""
+        cls._by_message[paginator._message.id] = paginator
+        cls._by_author.setdefault(paginator.author_id, set()).add(paginator)
+        for event_type in [InteractionCreateEvent, *paginator.listen_to_events]:
+            if event_type is not InteractionCreateEvent:
+                cls._listeners.setdefault(event_type, set()).add(paginator)
+            cls._subscribe(paginator.bot, event_type)
+        cls.schedule_timeout(paginator)
+
+    @classmethod
+    def unregister(cls, paginator: "Paginator") -> None:
+        message = getattr(paginator, "_message", None)
+        if message and cls._by_message.get(message.id) is paginator:
+            del cls._by_message[message.id]
+        if (author_pags := cls._by_author.get(paginator._author_id)):  # type: ignore
+            author_pags.discard(paginator)
+            if not author_pags:
+                del cls._by_author[paginator._author_id]  # type: ignore
+        for event_type in paginator.listen_to_events:
+            if (pags := cls._listeners.get(event_type)):
+                pags.discard(paginator)
+        cls.wheel.cancel(paginator)
+
+    @classmethod
+    def schedule_timeout(cls, paginator: "Paginator") -> None:
+        cls.wheel.schedule(
+            paginator, 
+            paginator._last_used + paginator.timeout, 
+            functools.partial(cls._on_timeout, paginator)
+        )
+
+    @classmethod
+    async def _on_timeout(cls, paginator: "Paginator") -> None:
+        # `_last_used` is reset on every use - the timer is moved here instead of on every click
+        if paginator._stop.is_set():
+            return
+        if paginator._last_used + paginator.timeout > time.time():
+            cls.schedule_timeout(paginator)
+            return
+        paginator.log.debug("timeout - stop")
+        await paginator.dispatch_event(PaginatorTimeoutEvent(paginator.bot))
+        paginator._stop.set()
+
+    @classmethod
+    def _subscribe(cls, bot: lightbulb.BotApp, event_type: Type[Event]) -> None:
+        if event_type in cls._subscribed:
+            return
+        cls._subscribed.add(event_type)
+
+        async def callback(event: Event) -> None:
+            await cls._route(event_type, event)
+        bot.subscribe(event_type, callback)
+
+    @classmethod
+    async def _route(cls, event_type: Type[Event], event: Event) -> None:
+        if event_type is InteractionCreateEvent:
+            message = getattr(event.interaction, "message", None)  # type: ignore
+            paginator = cls._by_message.get(message.id) if message else None
+            if paginator is not None:
+                await paginator.handle_event(event)
+            return
+        listeners = cls._listeners.get(event_type)
+        if not listeners:
+            return
+        if isinstance(event, MessageCreateEvent):
+            listeners = listeners & cls._by_author.get(event.author_id, set())
+        for paginator in list(listeners):
+            await paginator.handle_event(event)
+
+
+class PageProvider(ABC):
+    """
+    Creates the pages of a `Paginator` on demand.
+
+    Only viewed pages are built. The last <`cache_size`> built pages
+    are kept in a LRU, hence memory grows with the viewed pages, not all pages.
+    """
+    def __init__(self, cache_size: int = 8):
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, Embed | str] = OrderedDict()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    async def build_page(self, index: int) -> Embed | str:
+        """builds the page with <`index`>"""
+        ...
+
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"page index {index} out of range")
+        return index
+
+    async def get_page(self, index: int) -> Embed | str:
+        """
+        Returns the page with <`index`> from the LRU or builds it
+        """
+        index = self._normalize_index(index)
+        page = self._cache.get(index)
+        if page is not None:
+            self._cache.move_to_end(index)
+            return page
+        page = await self.build_page(index)
+        self._cache[index] = page
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return page
+
+    async def iter_pages(self) -> AsyncIterator[Embed | str]:
+        """
+        Yields all pages. Pages which are not cached are built, but not stored
+        """
+        for index in range(len(self)):
+            page = self._cache.get(index)
+            yield page if page is not None else await self.build_page(index)
+
+    def invalidate(self, index: Optional[int] = None) -> None:
+        """removes the page with <`index`> or all pages from the LRU"""
+        if index is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(index, None)
+
+
+class LazyPages(PageProvider):
+    """
+    `PageProvider` which builds the pages with <`builder`>
+
+    Args:
+    -----
+    amount: int
+        the amount of pages
+    builder: Callable[[int], Embed | str | Awaitable[Embed | str]]
+        function or coroutine function, which builds the page with the given index
+    """
+    def __init__(
+        self,
+        amount: int,
+        builder: Callable[[int], Union[Embed, str, Awaitable[Union[Embed, str]]]],
+        cache_size: int = 8,
+    ):
+        super().__init__(cache_size=cache_size)
+        self._amount = amount
+        self._builder = builder
+
+    def __len__(self) -> int:
+        return self._amount
+
+    async def build_page(self, index: int) -> Embed | str:
+        page = self._builder(index)
+        if asyncio.iscoroutine(page):
+            page = await page
+        return page  # type: ignore
+
+
 class Paginator():
     def __init__(
         self,
-        page_s: List[Embed | str],
+        page_s: List[Embed | str] | PageProvider,
         timeout: int = 2*60,
         component_factory: Callable[[int], MessageActionRowBuilder] | None = None,
         components_factory: Callable[[int], List[MessageActionRowBuilder]] | None = None,
@@ -636,8 +830,8 @@ class Paginator():
 
         Args:
         -----
-        pege_s: List[Embed] | List[str] 
-            the page*s the Paginator should paginate
+        pege_s: List[Embed] | List[str] | PageProvider
+            the page*s the Paginator should paginate. A `PageProvider` builds them on demand
         timeout: int, default=120
             the seconds the paginator has to be inactive to "shutdown"; maximum is 15*60 min
         component_factory: Callable[[int], MessageActionRowBuilder], default=None
@@ -698,7 +892,8 @@ class Paginator():
         self.count = count
         self.onetime_kwargs = {}  # used once when sending a message
         self._stop: asyncio.Event = asyncio.Event()
-        self._pages: List[Embed | str] = page_s
+        self._event_lock: asyncio.Lock = asyncio.Lock()
+        self._pages: List[Embed | str] | PageProvider = page_s
         self._old_position: int = 0
 
         self._component: Optional[MessageActionRowBuilder] = None
@@ -1006,8 +1201,25 @@ class Paginator():
         return action_rows
     
     def add_page(self, page: Union[Embed, str]):
+        if isinstance(self._pages, PageProvider):
+            raise TypeError("pages can't be added to a `PageProvider`")
         self._pages.append(page)
 
+    async def get_page(self, index: int) -> Embed | str:
+        """Returns the page with <`index`> - builds it, if pages are provided lazily"""
+        if isinstance(self._pages, PageProvider):
+            return await self._pages.get_page(index)
+        return self._pages[index]
+
+    async def iter_pages(self) -> AsyncIterator[Embed | str]:
+        """Yields all pages"""
+        if isinstance(self._pages, PageProvider):
+            async for page in self._pages.iter_pages():
+                yield page
+        else:
+            for page in self._pages:
+                yield page
+
     def add_onetime_kwargs(self, **kwargs):
         """
         Kwargs used when sending the next message.
@@ -1032,8 +1244,8 @@ class Paginator():
         else:
             await self.paginate(index)
 
-    @property
-    def download(self) -> Optional[str]:
+    async def fetch_download(self) -> Optional[str]:
+        """returns the content of the download file"""
         if not self._download:
             return None
         elif callable(self._download):
@@ -1041,17 +1253,19 @@ class Paginator():
         elif isinstance(self._download, str):
             return self._download
         elif isinstance(self._download, bool) and self._download is True:
-            return self._pages_to_str()
+            return await self._pages_to_str()
 
-    def _pages_to_str(self) -> str:
-        text = ""
-        if isinstance(self._pages[0], hikari.Embed):
-            for embed in self._pages:
+    async def _pages_to_str(self) -> str:
+        first_page = await self.get_page(0)
+        if isinstance(first_page, hikari.Embed):
+            text = ""
+            async for embed in self.iter_pages():
                 text += self._embed_to_md(embed)  # type: ignore
-        elif isinstance(self._pages[0], str):
-            text = "\n".join(
-                line for page in [textwrap.wrap(text, width=100) for page in self._pages] for line in page
-            )
+        elif isinstance(first_page, str):
+            lines = []
+            async for page in self.iter_pages():
+                lines.extend(textwrap.wrap(page, width=100))  # type: ignore
+            text = "\n".join(lines)
         else:
             raise RuntimeError(f"Can't convert `self._pages` of type {type(self._pages)} to str")
         return text
@@ -1186,6 +1400,8 @@ class Paginator():
             return
         # to prevent from calling again
         self._stopped = True
+        # ends `pagination_loop` and with that the routing of events
+        self._stop.set()
         self.log.debug("stopping navigator")
         with suppress(NotFoundError, hikari.ForbiddenError):
             kwargs = kwargs or {}
@@ -1255,14 +1471,15 @@ class Paginator():
             raise RuntimeError("<pages> must have minimum 1 item")
         elif len(self.pages) == 1 and self._disable_paginator_when_one_site and len(self.components) == 0:
             self.log.debug("<pages> has only one item, and <components> has only one item, so the paginator will exit")
-            if isinstance(self.pages[0], Embed):
+            first_page = await self.get_page(0)
+            if isinstance(first_page, Embed):
                 msg_proxy = await self.ctx.respond(
-                    embed=self.pages[0],
+                    embed=first_page,
                     **self._first_message_kwargs
                 )
             else:
                 msg_proxy = await self.ctx.respond(
-                    content=self.pages[0],
+                    content=first_page,
                     **self._first_message_kwargs
                 )
             return await msg_proxy.message()
@@ -1278,20 +1495,21 @@ class Paginator():
             kwargs["component"] = self.component
         elif not self._disable_components and not (len(self.pages) == 1 and self._hide_components_when_one_site):
             kwargs["components"] = self.components
-        if (download := self.download):
+        if (download := await self.fetch_download()):
             kwargs["attachment"] = hikari.Bytes(download, self._download_name)
         kwargs.update(self._first_message_kwargs)
 
-        if isinstance(self.pages[self._default_page_index], Embed):
+        first_page = await self.get_page(self._default_page_index)
+        if isinstance(first_page, Embed):
             self.log.debug("Creating message with embed")
             msg_proxy = await self.ctx.respond(
-                embed=self.pages[0],
+                embed=first_page,
                 **kwargs
             )
         else:
-            self.log.debug(f"Creating message with content {self.pages[self._default_page_index]}")
+            self.log.debug(f"Creating message with content {first_page}")
             msg_proxy = await self.ctx.respond(
-                content=self.pages[self._default_page_index],
+                content=first_page,
                 **kwargs
             )
         self._message = await msg_proxy.message()
@@ -1317,60 +1535,25 @@ class Paginator():
             self.log.error(traceback.format_exc())
 
     async def pagination_loop(self, **kwargs):
+        """
+        registers the paginator in the `PaginatorRouter` and waits until it is stopped
+        """
+        PaginatorRouter.register(self)
         try:
-            def create_event(event, predicate: Callable | None = None):
-                if predicate:
-                    return self.bot.wait_for(
-                        event,
-                        timeout=self.timeout,
-                        predicate=predicate
-                    )
-                else:
-                    return self.bot.wait_for(
-                        event,
-                        timeout=self.timeout,
-                    )
-            
-
-            while not self._stop.is_set():
-                self.log.debug(f"re-enter pagination loop - status: {self._stop.is_set()}, {self.timeout=}")
-                try:
-                    # default events
-                    events = [
-                        create_event(InteractionCreateEvent),
-                        self._stop.wait()
-                    ]
-                    # adding user specific events
-                    for event in self.listen_to_events:
-                        events.append(create_event(event))
-                    # wait for first incoming event
-                    done, pending = await asyncio.wait(
-                        [asyncio.create_task(task) for task in events],
-                        return_when=asyncio.FIRST_COMPLETED,
-                        timeout=self.timeout - (time.time() - self._last_used)
-                    )
-                except Exception:
-                    log.error(traceback.format_exc())
-                
-                # timeout - no tasks done - stop
-                if len(done) == 0:
-                    self.log.debug(f"no done tasks - stop")
-                    self.dispatch_event(PaginatorTimeoutEvent(self.bot))
-                    self._stop.set()
-                
-                # cancel all other tasks
-                for e in pending:
-                    e.cancel()
-                if self._stop.is_set():
-                    continue
-
-                # unpack Event
-                event = done.pop().result()
-                if not isinstance(event, hikari.Event):
-                    log.error(f"Unknown result - not an instance of `hikari.Event`")
-                    self._stop.set()
-                    continue
+            await self._stop.wait()
+        finally:
+            PaginatorRouter.unregister(self)
+        await self.stop()
 
+    async def handle_event(self, event: Event):
+        """
+        Handles one event, routed by the `PaginatorRouter`.
+        Events of one paginator are handled one after another
+        """
+        async with self._event_lock:
+            if self._stop.is_set():
+                return
+            try:
                 if (
                     isinstance(event, hikari.InteractionCreateEvent) 
                     and self.interaction_pred(event)
@@ -1386,15 +1569,13 @@ class Paginator():
 
                 self.log.debug(f"dispatch event | {self.count}")
                 await self.dispatch_event(event)
-            await self.stop()
-            return
-        except BotResponseError as e:
-            raise e
-        except Exception:
-            self.log.error(
-                f"following traceback was suppressed and pagination continued:\n{traceback.format_exc()}"
-            )
-            await self.pagination_loop(**kwargs)
+            except BotResponseError as e:
+                self._stop.set()
+                raise e
+            except Exception:
+                self.log.error(
+                    f"following traceback was suppressed and pagination continued:\n{traceback.format_exc()}"
+                )
             
     async def dispatch_event(self, event: Event, reject_interaction: bool = True):
         """
@@ -1468,7 +1649,7 @@ class Paginator():
 
     async def _update_position(self, interaction: ComponentInteraction | None = None):
         """sends the page with the current `self._position` index"""
-        await self.send(content=self.pages[self._position], interaction=interaction)
+        await self.send(content=await self.get_page(self._position), interaction=interaction)
         
     async def search(self):
         bot_message = await self.ctx.respond("What do you want to search ?")
@@ -1476,35 +1657,39 @@ class Paginator():
             message = await self.bot.wait_for(
                 MessageCreateEvent,
                 90,
-                lambda e: e.author_id == self.author.id and e.channel_id == self.ctx.channel_id
+                lambda e: e.author_id == self.author_id and e.channel_id == self.ctx.channel_id
             )
             query = str(message.content)
         except:
             return
-        if isinstance(self.pages[0], hikari.Embed):
-            site = self._search_embed(query)
+        if isinstance(await self.get_page(0), hikari.Embed):
+            site = await self._search_embed(query)
         else:
-            site = self._search_str(query)
+            site = await self._search_str(query)
         if site == -1:
             await self._message.respond(f"Nothing with `{query}` found")
             return
         await self.bot.rest.delete_messages(self.ctx.channel_id, [message.message_id, (await bot_message.message()).id])
         self._position = site
-        await self.send(content=self.pages[self._position])
+        await self.send(content=await self.get_page(self._position))
             
-    def _search_embed(self, query: str) -> int:
-        for i, e in enumerate(self.pages):
-            if query in str(e.title) or query in str(e.description):
+    async def _search_embed(self, query: str) -> int:
+        i = 0
+        async for e in self.iter_pages():
+            if query in str(e.title) or query in str(e.description):  # type: ignore
                 return i
-            for field in e.fields:
+            for field in e.fields:  # type: ignore
                 if query in str(field.name) or query in str(field.value):
                     return i
+            i += 1
         return -1
     
-    def _search_str(self, query: str) -> int:
-        for i, s in enumerate(self.pages):
+    async def _search_str(self, query: str) -> int:
+        i = 0
+        async for s in self.iter_pages():
             if query in str(s):
                 return i
+            i += 1
         return -1
             
             
@@ -1724,7 +1909,8 @@ class StatelessPaginator(Paginator, ABC):
         Returns:
         --------
         str :
-            The jsonified dict with following keys:
+            The custom_id encoded with `CustomIDCodec` (binary if `custom_id_type` is registered,
+            JSON otherwise) with following keys:
             * `t` str
                 the type which was set in __init__ `custom_id_type` to specify use of paginator
             * `p` : int
@@ -1750,7 +1936,7 @@ class StatelessPaginator(Paginator, ABC):
             author_id=self.ctx.author.id if with_author_id else None,
             **kwargs
         )
-        return json.dumps(d, indent=None, separators=(',', ':'))
+        return CustomIDCodec.encode(d)
     
     @staticmethod
     def _get_serialization_custom_id_dict(
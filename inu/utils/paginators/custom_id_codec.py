@@ -0,0 +1,213 @@
+"""
+Compact binary encoding for the custom_ids of stateless paginators.
+
+Layout of the payload before the url-safe base64 text encoding (without padding):
+    varint  schema id
+    varint  bitmask of the optional fields which are set
+    str     `cid`
+    uint    `p` (page)
+    uint    `aid` (author id) - optional
+    uint    `mid` (message id) - optional
+    ...     the fields of the schema in registration order - optional
+    2 byte  crc32 of everything before (truncated)
+
+`str` is a varint length followed by utf-8. The text starts with
+`CustomIDCodec.PREFIX` and a version character, hence JSON custom_ids
+can still be decoded and old messages keep working.
+"""
+from typing import *
+import base64
+import json
+import zlib
+
+__all__: Final[Sequence[str]] = ["CustomIDCodec", "CustomIDError", "UINT", "INT", "STR"]
+
+UINT: Final[str] = "uint"
+INT: Final[str] = "int"
+STR: Final[str] = "str"
+
+
+class CustomIDError(ValueError):
+    """Raised when a binary custom_id is corrupted or unknown"""
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("varint can't be negative")
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        if offset >= len(data) or shift > 70:
+            raise CustomIDError("truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+class _Schema(NamedTuple):
+    id: int
+    type: str
+    fields: Tuple[Tuple[str, str], ...]
+
+
+class CustomIDCodec:
+    """
+    Registry of custom_id schemas and the binary codec using them.
+
+    Every paginator type, which wants short custom_ids, registers its extra
+    fields once with a stable id. Dicts with unregistered types or keys are
+    encoded as JSON like before.
+    """
+    PREFIX: Final[str] = "~"
+    VERSION: Final[str] = "1"
+    # fields every custom_id has - `cid` and `p` are required
+    BASE_FIELDS: Final[Tuple[Tuple[str, str], ...]] = (("aid", UINT), ("mid", UINT))
+    _by_type: Dict[str, _Schema] = {}
+    _by_id: Dict[int, _Schema] = {}
+
+    @classmethod
+    def register(cls, type: str, schema_id: int, **fields: str) -> None:
+        """
+        Registers the schema of the custom_id type <`type`>.
+
+        Args:
+        -----
+        type: str
+            the custom_id type (`t` in the JSON custom_id)
+        schema_id: int
+            stable id of this schema. Never reuse ids, since old messages still carry them
+        **fields: str
+            the extra keys with one of `UINT`, `INT`, `STR` as type
+        """
+        schema = _Schema(schema_id, type, tuple(fields.items()))
+        if (old := cls._by_id.get(schema_id)) is not None and old.type != type:
+            raise ValueError(f"schema id {schema_id} is already used by `{old.type}`")
+        for _, kind in schema.fields:
+            if kind not in (UINT, INT, STR):
+                raise ValueError(f"unknown field type `{kind}`")
+        cls._by_type[type] = schema
+        cls._by_id[schema_id] = schema
+
+    @classmethod
+    def is_binary(cls, custom_id: str) -> bool:
+        return custom_id.startswith(cls.PREFIX)
+
+    @classmethod
+    def _encode_binary(cls, d: Dict[str, Any]) -> Optional[str]:
+        schema = cls._by_type.get(d.get("t"))  # type: ignore
+        if schema is None:
+            return None
+        optional = (*cls.BASE_FIELDS, *schema.fields)
+        known = {"t", "cid", "p", *(name for name, _ in optional)}
+        if any(key not in known for key in d):
+            return None
+        cid, page = d.get("cid"), d.get("p") or 0
+        if not isinstance(cid, str) or not isinstance(page, int) or page < 0:
+            return None
+
+        out = bytearray()
+        _write_varint(out, schema.id)
+        mask = 0
+        values: List[Tuple[str, Any]] = []
+        for i, (name, kind) in enumerate(optional):
+            value = d.get(name)
+            if value is None:
+                continue
+            if kind == STR:
+                if not isinstance(value, str):
+                    return None
+            elif not isinstance(value, int) or isinstance(value, bool) or (kind == UINT and value < 0):
+                return None
+            mask |= 1 << i
+            values.append((kind, value))
+        _write_varint(out, mask)
+        values.insert(0, (UINT, page))
+        values.insert(0, (STR, cid))
+        for kind, value in values:
+            if kind == STR:
+                raw = value.encode("utf-8")
+                _write_varint(out, len(raw))
+                out += raw
+            elif kind == INT:
+                # zigzag - small negative numbers stay small
+                _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+            else:
+                _write_varint(out, value)
+        out += (zlib.crc32(out) & 0xFFFF).to_bytes(2, "big")
+        text = base64.urlsafe_b64encode(bytes(out)).decode("ascii").rstrip("=")
+        return f"{cls.PREFIX}{cls.VERSION}{text}"
+
+    @classmethod
+    def encode(cls, d: Dict[str, Any]) -> str:
+        """
+        Encodes the custom_id dict <`d`> binary if its type is registered,
+        otherwise as JSON. The shorter one is returned.
+        """
+        as_json = json.dumps(d, indent=None, separators=(',', ':'))
+        binary = cls._encode_binary(d)
+        if binary is None or len(binary) > len(as_json):
+            return as_json
+        return binary
+
+    @classmethod
+    def decode(cls, custom_id: str) -> Dict[str, Any]:
+        """
+        Decodes a binary custom_id into the dict it was made of.
+
+        Raises:
+        -------
+        CustomIDError:
+            when <`custom_id`> is not binary, corrupted or of an unknown schema
+        """
+        if not cls.is_binary(custom_id) or len(custom_id) < 2:
+            raise CustomIDError("not a binary custom_id")
+        if custom_id[1] != cls.VERSION:
+            raise CustomIDError(f"unknown custom_id version `{custom_id[1]}`")
+        try:
+            text = custom_id[2:]
+            data = base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+        except ValueError as e:
+            raise CustomIDError("invalid base64") from e
+        if len(data) < 3 or zlib.crc32(data[:-2]) & 0xFFFF != int.from_bytes(data[-2:], "big"):
+            raise CustomIDError("checksum mismatch")
+        data = data[:-2]
+
+        schema_id, offset = _read_varint(data, 0)
+        schema = cls._by_id.get(schema_id)
+        if schema is None:
+            raise CustomIDError(f"unknown schema id {schema_id}")
+        mask, offset = _read_varint(data, offset)
+
+        def read(kind: str) -> Any:
+            nonlocal offset
+            value, offset = _read_varint(data, offset)
+            if kind == STR:
+                raw = data[offset:offset + value]
+                if len(raw) != value:
+                    raise CustomIDError("truncated string")
+                offset += value
+                return raw.decode("utf-8", errors="replace")
+            if kind == INT:
+                return (value >> 1) ^ -(value & 1)
+            return value
+
+        d: Dict[str, Any] = {"t": schema.type, "cid": read(STR), "p": read(UINT)}
+        for i, (name, kind) in enumerate((*cls.BASE_FIELDS, *schema.fields)):
+            if mask & (1 << i):
+                d[name] = read(kind)
+        if offset != len(data):
+            raise CustomIDError("trailing data")
+        return d
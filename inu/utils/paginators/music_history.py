@@ -10,6 +10,7 @@ from lightbulb import context
 
 from .base import PaginatorReadyEvent
 from .base import Paginator
+from .base import PageProvider
 from .base import listener
 
 from utils import Colors
@@ -23,7 +24,7 @@ class MusicHistoryPaginator(Paginator):
         self,
         *,
         history: List[Dict[str, str]],
-        pages: Union[List[hikari.Embed], List[str]],
+        pages: Union[List[hikari.Embed], List[str], PageProvider],
         items_per_site: int,
         timeout: int = 60,
     ):
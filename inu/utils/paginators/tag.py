@@ -23,6 +23,7 @@ from .base import (
     listener,
     StatelessPaginator
 )
+from .custom_id_codec import CustomIDCodec, UINT
 import asyncpg
 
 from utils import crumble, TagManager, add_row_when_filled, ListParser
@@ -64,6 +65,8 @@ with LoL champions.\n\n
 __Select the type you want__:
 """
 
+CustomIDCodec.register("stl-tag-edit", 1, tid=UINT)
+
 class TagCustomID(CustomID):
     def set_tag_id(self, tag_id: int) -> "TagCustomID":
         self._kwargs["tid"] = tag_id
@@ -16,8 +16,9 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import mplcyberpunk
 
-from utils.db import PollManager
-from utils import Colors
+from utils.db import PollManager, PollStore, PollState
+from utils import Colors, Timers
+from utils.render import RenderPool
 from core import Table, Inu, getLogger, ConfigProxy, ConfigType, InteractionContext
 
 log = getLogger(__name__)
@@ -167,8 +168,6 @@ class Poll():
     _message_id: int
     _channel_id: int
     _creator_id: int
-    # list with poll ids
-    _finalizing: Set[int] = set()
 
     def __init__(
         self, 
@@ -197,9 +196,9 @@ class Poll():
         ]
         self._reaction_letter: Dict[str, str] = {r: l for r, l in zip(self.letter_emojis, "ABCDEFGHIJKLMNOPQRSTUVWXYZ")}
         self.bot = bot
-        # mapping from option id to a list with user ids
-        # Dict[option_id, List[user_id]]
-        self._poll: Dict[int, List[int]] = {}
+        # mapping from option id to the user ids who voted for it
+        # Dict[option_id, Set[user_id]]
+        self._poll: Dict[int, Set[int]] = {}
         # mapping from option id to the option title
         self._options: Dict[int, str] = {}
         # mapping from option id to reaction/letter/partial custom id e.g. 1 -> A
@@ -217,6 +216,7 @@ class Poll():
         self._message_id = record["message_id"]
         self._channel_id = record["channel_id"]
         self._creator_id = record["creator_id"]
+        self._record = record
 
 
         # f"{int(time.time)}{ctx.author.id}{ctx.guild_id}"
@@ -233,7 +233,7 @@ class Poll():
                 the description of the option
             - reaction : str
                 the reaction or letter for interaction for this option
-            - votes : List[int]
+            - votes : Set[int]
                 user_ids of people who voted
             - color : str
                 the color as emoji, color name or "/"
@@ -249,7 +249,7 @@ class Poll():
                     "votes": self._poll[id],
                 }
             )
-        options.sort(key=lambda d: d["votes"], reverse=True)
+        options.sort(key=lambda d: len(d["votes"]), reverse=True)
         for option, _, emoji_or_name in zip(options, PIE_CHART_COLORS, COLOR_TO_EMOJI):
             option["color"] = emoji_or_name or "/"
 
@@ -410,7 +410,7 @@ class Poll():
             icon=self.bot.cache.get_member(self.guild_id, self.creator_id).avatar_url,
         )
         #embed.add_field("Legend", self.legend, inline=False)
-        #embed.set_image(self._make_pie_chart())
+        #embed.set_image(await self._make_pie_chart())
         return embed
 
     @property
@@ -452,24 +452,19 @@ class Poll():
 
     async def fetch(self) -> None:
         """updates `self` with the current poll values"""
-        option_table = Table("poll_options")
-        vote_table = Table("poll_votes")
-
-        # fetch options
-        for option_record in await PollManager.fetch_options(self.id):
-            self._options[option_record["option_id"]] = option_record["description"]
-            self._id_reaction[option_record["option_id"]] = option_record["reaction"]
-
-        for k in self._options.keys():
-            self._poll[k] = []
+        state = await PollStore.get_or_load(self.id)
+        if state is None:
+            return
+        self.load_state(state)
 
-        # fetch votes
-        for vote_record in await PollManager.fetch_votes(self.id):
-            # insert votes into polls - mapping from option_id to a list of user_ids
-            if vote_record['option_id'] in self._poll.keys():
-                self._poll[vote_record['option_id']].append(vote_record['user_id'])
-            else:
-                self._poll[vote_record['option_id']] = [vote_record['user_id']]
+    def load_state(self, state: PollState) -> None:
+        """
+        uses the options and votes of <`state`>. The vote sets are shared,
+        hence `self` stays up to date with the store
+        """
+        self._options = state.options
+        self._id_reaction = state.reactions
+        self._poll = state.votes
 
     async def dispatch_embed(
         self, 
@@ -498,6 +493,23 @@ class Poll():
         #     await message.add_reaction(letter_emojis[i])
         return message
 
+    def schedule_finalize(self) -> None:
+        """
+        Finalizes the poll when it expires. Scheduling it again only moves the timer
+        """
+        Timers.schedule("poll", self.id, self.expires, self._record)
+
+    @classmethod
+    async def _finalize_due(cls, jobs: Dict[int, Dict[str, Any]]) -> None:
+        """timer handler - finalizes all expired polls of <`jobs`> (poll id -> record)"""
+        results = await asyncio.gather(
+            *[cls(record, PollManager.bot).finalize() for record in jobs.values()],
+            return_exceptions=True
+        )
+        for poll_id, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                log.error(f"failed to finalize poll {poll_id}: {result!r}")
+
     async def finalize(self) -> None:
         """
         Sends result and deletes db entry
@@ -506,10 +518,7 @@ class Poll():
         ----
         Automatically calls self.fetch()
         """
-        if self.id in self.__class__._finalizing:
-            return
-        self.__class__._finalizing.add(self.id)
-        await asyncio.sleep(self.expires.timestamp() - tm.time())
+        Timers.cancel("poll", self.id)
         await self.fetch()
         await self.bot.rest.create_message(
             channel=self.channel_id,
@@ -517,58 +526,58 @@ class Poll():
             embed=self.final_embed
         )
         await PollManager.remove_poll(self.id, self.message_id)
-        self.__class__._finalizing.remove(self.id)
-
-    def _make_pie_chart(self) -> BytesIO:
-        #Using matplotlib
-        plt.style.use("cyberpunk")
-        sns.set_palette("Set2")
-        sns.set_context("notebook", font_scale=4.5, rc={"lines.linewidth": 4.5})
-        chart, ax = plt.subplots(figsize=[7,7])
+
+    async def _make_pie_chart(self) -> BytesIO:
         all_labels = [v for v in self._options.values()]
-        all_data = [len(self._poll[k]) for k in self._poll.keys()]
         labels = []
         data = []
-        reaction_letters = []
         for labal, value in zip(all_labels, self._poll.items()):
             if len(value[1]) > 0:
                 labels.append(labal)
                 data.append(len(value[1]))
-                reaction_letters.append(self._letter_by_id(value[0]))
-        chart.set_tight_layout(True)
-        wedges, texts = ax.pie(
-            x=data, 
-            colors=PIE_CHART_COLORS[:len(labels)],
-            # autopct="%.1f%%", 
-            autopct=None,
-            explode=[0.05]*len(labels), 
-            wedgeprops=dict(width=0.4),
-            labels=None, 
-            # pctdistance=0.5,
-            labeldistance=0.7,
-            startangle=-40
-        )
-        #form matplotlib - create annotations
-        # bbox_props = dict(boxstyle="square")#, fc="white", ec="white", lw=3,pad=0.3
-        # kw = dict(arrowprops=dict(arrowstyle="-", color='white', linewidth=3,),
-        #         bbox=bbox_props, zorder=0, va="center")
-
-        # for i, p in enumerate(wedges):
-        #     ang = (p.theta2 - p.theta1)/2. + p.theta1
-        #     y = np.sin(np.deg2rad(ang))
-        #     x = np.cos(np.deg2rad(ang))
-        #     horizontalalignment = {-1: "right", 1: "left"}[int(np.sign(x))]
-        #     connectionstyle = "angle,angleA=0,angleB={}".format(ang)
-        #     kw["arrowprops"].update({"connectionstyle": connectionstyle})
-        #     ax.annotate(labels[i], xy=(x, y), xytext=(1.35*np.sign(x), 1.4*y),
-        #                 horizontalalignment=horizontalalignment, **kw)
-        # plt.legend()
-        # mplcyberpunk.add_glow_effects(ax=ax)
-        buffer = BytesIO()
-        # plt.title(f"{self.title}", fontsize=14);
-        chart.savefig(buffer, dpi=40, transparent=True)
-        buffer.seek(0)
-        return buffer
+        return await RenderPool.render_png(_draw_pie_chart, data, PIE_CHART_COLORS[:len(labels)])
+
+
+def _draw_pie_chart(data: List[int], colors: List[str]) -> bytes:
+    """draws the donut chart of a poll. Runs in a `RenderPool` worker"""
+    #Using matplotlib
+    plt.style.use("cyberpunk")
+    sns.set_palette("Set2")
+    sns.set_context("notebook", font_scale=4.5, rc={"lines.linewidth": 4.5})
+    chart, ax = plt.subplots(figsize=[7,7])
+    chart.set_tight_layout(True)
+    wedges, texts = ax.pie(
+        x=data, 
+        colors=colors,
+        # autopct="%.1f%%", 
+        autopct=None,
+        explode=[0.05]*len(data), 
+        wedgeprops=dict(width=0.4),
+        labels=None, 
+        # pctdistance=0.5,
+        labeldistance=0.7,
+        startangle=-40
+    )
+    #form matplotlib - create annotations
+    # bbox_props = dict(boxstyle="square")#, fc="white", ec="white", lw=3,pad=0.3
+    # kw = dict(arrowprops=dict(arrowstyle="-", color='white', linewidth=3,),
+    #         bbox=bbox_props, zorder=0, va="center")
+
+    # for i, p in enumerate(wedges):
+    #     ang = (p.theta2 - p.theta1)/2. + p.theta1
+    #     y = np.sin(np.deg2rad(ang))
+    #     x = np.cos(np.deg2rad(ang))
+    #     horizontalalignment = {-1: "right", 1: "left"}[int(np.sign(x))]
+    #     connectionstyle = "angle,angleA=0,angleB={}".format(ang)
+    #     kw["arrowprops"].update({"connectionstyle": connectionstyle})
+    #     ax.annotate(labels[i], xy=(x, y), xytext=(1.35*np.sign(x), 1.4*y),
+    #                 horizontalalignment=horizontalalignment, **kw)
+    # plt.legend()
+    # mplcyberpunk.add_glow_effects(ax=ax)
+    buffer = BytesIO()
+    # plt.title(f"{self.title}", fontsize=14);
+    chart.savefig(buffer, dpi=40, transparent=True)
+    return buffer.getvalue()
 
 
 
@@ -694,4 +703,7 @@ class Poll():
 
 
 
-    
\ No newline at end of file
+    
+
+
+Timers.register("poll", Poll._finalize_due)
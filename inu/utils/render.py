@@ -0,0 +1,283 @@
+from typing import *
+import asyncio
+import os
+import signal
+import traceback
+import multiprocessing
+import hashlib
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import aiofiles
+from cachetools import LRUCache
+
+from core import getLogger
+
+log = getLogger(__name__)
+
+__all__: Final[Sequence[str]] = ["RenderPool", "RenderTimeout", "RenderCache"]
+
+T = TypeVar("T")
+
+
+class RenderTimeout(asyncio.TimeoutError):
+    """Raised when a render job took longer than its timeout"""
+
+
+def _init_worker() -> None:
+    """
+    Runs once in every worker process.
+    Imports matplotlib with all styles, that the first render is not paying for it
+    """
+    # Ctrl+C is handled by the bot process, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import matplotlib
+    matplotlib.use("agg")
+    import matplotlib.pyplot as plt
+    import seaborn  # noqa: F401
+    import mplcyberpunk  # noqa: F401
+    plt.figure()
+    plt.close("all")
+
+
+def _run_job(func: Callable[..., T], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> T:
+    """
+    Runs <`func`> in a worker. Changes to rcParams and open figures
+    are reset afterwards, that jobs can't leak styles into each other
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+    try:
+        with matplotlib.rc_context():
+            return func(*args, **kwargs)
+    finally:
+        plt.close("all")
+
+
+class RenderPool:
+    """
+    Process pool for rendering matplotlib charts and LaTeX images
+    outside of the event loop.
+
+    Jobs are plain functions, which take picklable data (DataFrames, strings)
+    and return PNG bytes.
+    """
+    WORKERS: int = min(4, os.cpu_count() or 1)
+    # max jobs which are submitted at once - others wait before the pool
+    MAX_CONCURRENCY: int = WORKERS * 2
+    TIMEOUT: float = 30
+    _executor: Optional[ProcessPoolExecutor] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def start(cls) -> None:
+        """
+        Starts the worker processes. Should be called after all extensions are loaded,
+        that the workers already know the modules of the jobs
+        """
+        if cls._executor is not None:
+            return
+        # fork - workers inherit all loaded modules, hence jobs don't need to import the bot
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        cls._executor = ProcessPoolExecutor(
+            max_workers=cls.WORKERS,
+            mp_context=multiprocessing.get_context(method),
+            initializer=_init_worker,
+        )
+        # ProcessPoolExecutor starts the workers on first submit
+        for _ in range(cls.WORKERS):
+            cls._executor.submit(os.getpid)
+        log.info(f"Started render pool with {cls.WORKERS} workers ({method})", prefix="init")
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is None:
+            return
+        cls._executor.shutdown(wait=False, cancel_futures=True)
+        cls._executor = None
+
+    @classmethod
+    def _restart(cls, executor: Optional[ProcessPoolExecutor]) -> None:
+        """
+        replaces the broken or stuck pool <`executor`> with a fresh one.
+        Does nothing, if <`executor`> was already replaced - other jobs of
+        the killed pool fail too and must not kill the new one
+        """
+        if executor is None or cls._executor is not executor:
+            return
+        cls._executor = None
+        # stuck workers won't finish on their own
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        cls.start()
+
+    @classmethod
+    async def render(
+        cls,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> T:
+        """
+        Runs <`func`> with <`args`> and <`kwargs`> in a render worker.
+
+        Args:
+        -----
+        func: Callable[..., T]
+            a module level function (has to be picklable)
+        timeout: float | None
+            seconds until `RenderTimeout` is raised. Defaults to `RenderPool.TIMEOUT`
+
+        Returns:
+        --------
+        T:
+            what <`func`> returned
+
+        Raises:
+        -------
+        RenderTimeout:
+            the job took too long. The pool will be restarted
+        """
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(cls.MAX_CONCURRENCY)
+        loop = asyncio.get_running_loop()
+        async with cls._semaphore:
+            if cls._executor is None:
+                cls.start()
+            executor = cls._executor
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, _run_job, func, args, kwargs),
+                    timeout=timeout or cls.TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                log.warning(f"render job {func.__qualname__} timed out - restarting render pool")
+                cls._restart(executor)
+                raise RenderTimeout(f"rendering with `{func.__qualname__}` took too long")
+            except BrokenProcessPool:
+                if cls._executor is executor:
+                    log.error(f"render pool broke while running {func.__qualname__}:\n{traceback.format_exc()}")
+                cls._restart(executor)
+                raise
+
+    @classmethod
+    async def render_png(
+        cls,
+        func: Callable[..., Optional[bytes]],
+        *args: Any,
+        **kwargs: Any
+    ) -> Optional[BytesIO]:
+        """
+        Same as `render`, but wraps the returned PNG bytes into a `BytesIO`
+        """
+        png = await cls.render(func, *args, **kwargs)
+        if png is None:
+            return None
+        return BytesIO(png)
+
+
+class RenderCache:
+    """
+    Content addressed cache for rendered PNGs.
+
+    Keys are hashes of everything which changes the image. The memory tier
+    is a LRU bounded by bytes, the optional disk tier stores one PNG per key
+    in <`directory`> and survives restarts.
+    """
+    _whitespace = re.compile(r"[ \t]+")
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024**2,
+        directory: Optional[str] = None,
+        max_files: int = 5000,
+    ):
+        self._memory: LRUCache[str, bytes] = LRUCache(maxsize=max_bytes, getsizeof=lambda png: len(png) or 1)
+        self.directory = directory
+        self.max_files = max_files
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """strips <`text`> and collapses whitespace - line breaks are kept"""
+        return "\n".join(cls._whitespace.sub(" ", line).strip() for line in text.strip().splitlines())
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """
+        Returns the hash of <`parts`>
+        """
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")  # type: ignore
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the cached PNG of <`key`> or None
+        """
+        png = self._memory.get(key)
+        if png is not None:
+            self.hits += 1
+            return png
+        if self.directory:
+            try:
+                async with aiofiles.open(self._path(key), "rb") as f:
+                    png = await f.read()
+                self.disk_hits += 1
+                self._memory[key] = png
+                return png
+            except FileNotFoundError:
+                pass
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, png: bytes) -> None:
+        """
+        Stores <`png`> under <`key`>. An empty PNG marks inputs without image
+        """
+        self._memory[key] = png
+        if not self.directory or not png:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            async with aiofiles.open(self._path(key), "wb") as f:
+                await f.write(png)
+        except OSError:
+            log.warning(f"can't write render cache file: {traceback.format_exc()}")
+            return
+        self._writes += 1
+        if self._writes % 100 == 0:
+            await asyncio.to_thread(self.prune)
+
+    def prune(self) -> None:
+        """removes the oldest files, if there are more than <`max_files`>"""
+        if not self.directory:
+            return
+        files = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".png")]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - self.max_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} memory hits / {self.disk_hits} disk hits / {self.misses} misses "
+            f"({self.hit_rate:.0%})"
+        )
@@ -12,6 +12,7 @@ from expiring_dict import ExpiringDict
 
 from core import stopwatch
 from core.api import PartialAnimeMatch, AnimeMatch
+from utils import SingleFlight
 
 
 # from utils.db import MyAnimeList
@@ -26,6 +27,8 @@ REGEX = r"(\d+)(th|st|nd|rd) (.+) ([\d\.]+)%"
 class AnimeCornerAPI:
     TTL = 60*60*24*7
     ttl_dict = ExpiringDict(ttl=TTL)
+    # one browser per link, even if the cache expired for many callers at once
+    _flight = SingleFlight("AnimeCornerAPI.fetch_ranking")
 
     def __init__(self) -> None:
         self.link = "https://animecorner.me/spring-2023-anime-rankings-week-12/"
@@ -49,8 +52,12 @@ class AnimeCornerAPI:
             # )
             # selenium_async stopped working
             # better solution?
-            matches = await asyncio.to_thread(self._fetch_ranking)
-            self.ttl_dict.ttl(link, matches, self.TTL)
+            matches = await self._flight.do(link, self._fetch_and_cache_ranking, link)
+        return matches
+
+    async def _fetch_and_cache_ranking(self, link: str) -> List[PartialAnimeMatch]:
+        matches = await asyncio.to_thread(self._fetch_ranking)
+        self.ttl_dict.ttl(link, matches, self.TTL)
         return matches
 
     @staticmethod
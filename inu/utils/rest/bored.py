@@ -2,6 +2,7 @@ from typing import *
 import aiohttp
 import hikari
 
+from core import HTTPClient
 from utils import Colors
 {
   "activity": "Make a couch fort",
@@ -36,9 +37,8 @@ class BoredAPI:
     @classmethod
     async def fetch_idea(cls, ssl: bool = True) -> BoredIdea:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(cls.Endpoint, ssl=ssl) as resp:
-                    json_resp = await resp.json()
+            async with HTTPClient().get(cls.Endpoint, api="bored", ssl=ssl) as resp:
+                json_resp = await resp.json()
             return BoredIdea(json_resp)
         except aiohttp.ClientConnectorCertificateError as e:
             if not ssl:
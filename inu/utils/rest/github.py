@@ -4,6 +4,8 @@ import aiohttp
 from datetime import datetime
 import asyncio
 
+from core import HTTPClient
+
 OWNER = "zp33dy"
 REPO = "inu"
 
@@ -78,14 +80,13 @@ class GitHubAPI:
             "per_page": per_page
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    commits_data: List[dict] = await response.json()
-                    if len(commits_data) == 0:
-                        return commits
-                    for commit_data in commits_data:
-                        commit: Commit = Commit(commit_data["commit"])
-                        commits.append(commit)
+        async with HTTPClient().get(url, api="github", params=params) as response:
+            if response.status == 200:
+                commits_data: List[dict] = await response.json()
+                if len(commits_data) == 0:
+                    return commits
+                for commit_data in commits_data:
+                    commit: Commit = Commit(commit_data["commit"])
+                    commits.append(commit)
         return commits
 
@@ -3,7 +3,7 @@ import traceback
 
 import aiohttp
 
-from core import getLogger
+from core import HTTPClient, getLogger
 
 
 log = getLogger(__name__)
@@ -14,10 +14,14 @@ class IP:
     async def fetch_public_ip(cls, ssl: bool = True, timeout: int = 4) -> str:
         """Returns the public IP"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://api.ipify.org?format=json", ssl=ssl, timeout=timeout) as resp:
-                    data = await resp.json()
-                    return data["ip"]
+            async with HTTPClient().get(
+                "https://api.ipify.org?format=json",
+                api="ipify",
+                ssl=ssl,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                data = await resp.json()
+                return data["ip"]
         except Exception:
             if ssl:
                 return await cls.fetch_public_ip(ssl=False, timeout=2)
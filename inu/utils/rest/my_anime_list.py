@@ -17,9 +17,12 @@ import asyncio
 from fuzzywuzzy import fuzz
 from expiring_dict import ExpiringDict
 
-from core import getLogger, stopwatch
+from core import HTTPClient, getLogger, stopwatch
+from utils import SingleFlight
 
 log = getLogger(__name__)
+# MAL answers bursts with 429 or 504
+HTTPClient().register_api("myanimelist", concurrency=3, max_retries=3)
 
 class MALRatings(Enum):
     g = "G - All Ages"
@@ -41,6 +44,7 @@ class MyAnimeListAIOClient:
     client_id: str = ""
     TTL = 60*60
     response_cache = ExpiringDict(ttl=TTL)
+    search_flight = SingleFlight("MyAnimeListAIOClient.search_anime")
 
 
     def __init__(
@@ -56,20 +60,12 @@ class MyAnimeListAIOClient:
                 "Client id has to be passed into the constructor or in the .env file under key `ID`. Consider calling `set_credentails`"
             )
         self._base_url = r"https://api.myanimelist.net/v2"
-        self._session = None
 
     @classmethod
     def set_credentials(cls, client_id: str):
         """"set the client id"""
         cls.client_id = client_id
 
-    @property
-    def session(self) -> aiohttp.ClientSession:
-        """Get AioHTTP session by creating it if it doesn't already exist"""
-        if not self._session or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-
     async def _make_request(
         self,
         endpoint: str,
@@ -82,9 +78,8 @@ class MyAnimeListAIOClient:
         if optional_query:
             query = f"?{urlencode(optional_query)}"
         url = f"{self._base_url}/{endpoint}{value or ''}{query or ''}"
-        async with self.session.get(url, headers=self.headers) as resp:
+        async with HTTPClient().get(url, api="myanimelist", headers=self.headers) as resp:
             json = await resp.json(encoding="utf-8")
-        await self._session.close()
         self.log.debug(f"request: {url}")
         self.log.debug(f"response: {pf(json)}")
         if not resp.ok:
@@ -125,8 +120,39 @@ class MyAnimeListAIOClient:
         )
         return resp
 
-    async def _search(self):
-        pass
+    async def _search(self, query: str, include_nsfw: bool) -> Dict[str, Any]:
+        """
+        Fetches and caches the search results of <`query`>.
+        Concurrent searches for the same query share one request
+
+        Raises:
+        -------
+        RuntimeError:
+            the request failed
+        """
+        fields = (
+            "id,title,main_picture,alternative_titles,"
+            "start_date,end_date,synopsis,mean,rank,popularity,"
+            "num_list_users,num_scoring_users,nsfw,created_at,"
+            "updated_at,media_type,status,genres,my_list_status,"
+            "num_episodes,start_season,broadcast,source,"
+            "average_episode_duration,rating,pictures,background,"
+            "related_anime,related_manga,recommendations,studios,statistics,"
+            "average_episode_duration,opening_themes,ending_themes"
+        )
+        a = datetime.now()
+        kwargs = {"nsfw": "true" if include_nsfw else "false"}
+        resp = await self._make_request(
+            endpoint="anime", 
+            optional_query={
+                "q": query, 
+                "fields":fields, 
+                "limit":"50", 
+                **kwargs
+        })
+        log.info(f"fetched {len(resp['data'])} anime in {(datetime.now() - a).total_seconds():.2f}s")
+        self.response_cache.ttl(query, deepcopy(resp), self.TTL)
+        return resp
 
     async def search_anime(self, query: str, include_nsfw=True, fallback: bool = False) -> Dict[str, Any]:
         """search for anime by name
@@ -149,27 +175,10 @@ class MyAnimeListAIOClient:
             return deepcopy(resp)
         except KeyError:
             pass
-        fields = (
-            "id,title,main_picture,alternative_titles,"
-            "start_date,end_date,synopsis,mean,rank,popularity,"
-            "num_list_users,num_scoring_users,nsfw,created_at,"
-            "updated_at,media_type,status,genres,my_list_status,"
-            "num_episodes,start_season,broadcast,source,"
-            "average_episode_duration,rating,pictures,background,"
-            "related_anime,related_manga,recommendations,studios,statistics,"
-            "average_episode_duration,opening_themes,ending_themes"
-        )
-        a = datetime.now()
-        kwargs = {"nsfw": "true" if include_nsfw else "false"}
         try:
-            resp = await self._make_request(
-                endpoint="anime", 
-                optional_query={
-                    "q": query, 
-                    "fields":fields, 
-                    "limit":"50", 
-                    **kwargs
-            })
+            resp = await self.search_flight.do(
+                (query, include_nsfw), self._search, query, include_nsfw
+            )
         except RuntimeError as e:
             if fallback:
                 log.warning(f"Error while fetching anime - title len = {len(query)}")
@@ -178,8 +187,7 @@ class MyAnimeListAIOClient:
             else:
                 log.warning(f"fallback search for title {query}")
                 return await self.search_anime(query[:50], include_nsfw, True)
-        log.info(f"fetched {len(resp['data'])} anime in {(datetime.now() - a).total_seconds():.2f}s")
-        self.response_cache.ttl(query, deepcopy(resp), self.TTL)
+        # every waiter gets its own copy
         return deepcopy(resp)
 
 
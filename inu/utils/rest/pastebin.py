@@ -1,7 +1,6 @@
 import urllib.request
 import urllib.parse
-from core import ConfigProxy, ConfigType, getLogger
-import aiohttp  
+from core import ConfigProxy, ConfigType, HTTPClient, getLogger
 import asyncio
 
 log = getLogger(__name__)
@@ -9,18 +8,6 @@ config = ConfigProxy(ConfigType.YAML)
 
 class PasteBin:
     dev_key = config.pastebin.SECRET
-    session: aiohttp.ClientSession = None
-
-    @classmethod
-    async def _create_session(cls) -> aiohttp.ClientSession:
-        return aiohttp.ClientSession()
-
-
-    @classmethod
-    async def _get_session(cls) -> aiohttp.ClientSession:
-        if cls.session is None or cls.session.closed:
-            cls.session = await cls._create_session()
-        return cls.session
 
     @classmethod
     async def upload(cls, code: str):
@@ -37,19 +24,21 @@ class PasteBin:
                 "api_paste_format": api_paste_format,
             }
         
-        session = await cls._get_session()
-        async with session.post(url=site, data=data_bytes) as resp:
+        async with HTTPClient().post(site, api="pastebin", data=data_bytes) as resp:
             if str(resp.status).startswith("4"):
                 print(await resp.text())  
             print(await resp.text())
-        await session.close()
             
         # our_data = our_data_bytes.encode()
         # request = urllib.request.Request(site, method='POST')
         # resp = urllib.request.urlopen(request, our_data)
         # print(resp.read())
 
-asyncio.run(PasteBin.upload(str(20000*"A")))
-asyncio.run(PasteBin.upload("testfsdlksj"))
-asyncio.run(PasteBin.upload("testfsdlksj"))
-asyncio.run(PasteBin.upload("testfsdlksj"))
+if __name__ == "__main__":
+    async def main():
+        # the session of `HTTPClient` is bound to one loop
+        await PasteBin.upload(str(20000*"A"))
+        await PasteBin.upload("testfsdlksj")
+        await HTTPClient().close()
+
+    asyncio.run(main())
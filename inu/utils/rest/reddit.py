@@ -12,7 +12,7 @@ from cachetools import TTLCache
 from dotenv import load_dotenv
 from core import Inu
 from core import getLogger
-from utils import Multiple
+from utils import Multiple, single_flight
 
 
 log = getLogger(__name__)
@@ -44,6 +44,7 @@ class Reddit():
         )
     @classmethod
     @cached(TTLCache(int(2 ** 16), float(3*60*60)))
+    @single_flight()
     async def get_posts(
         cls,
         subreddit: str,
@@ -156,6 +157,7 @@ class Reddit():
 
     @classmethod
     @cached(TTLCache(int(2 ** 16), float(1*60*60)))
+    @single_flight()
     async def get_anime_of_the_week_post(
         cls
     ) -> asyncpraw.models.Submission:
@@ -251,6 +253,7 @@ class Reddit():
     
     @classmethod
     @cached(TTLCache(int(2 ** 16), float(1*60*60)))
+    @single_flight()
     async def search(
         cls,
         subreddit: str,
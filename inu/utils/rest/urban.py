@@ -7,8 +7,9 @@ import asyncio
 from pprint import *
 from collections.abc import Iterable
 
-from core import Inu, BotResponseError, getLogger
+from core import Inu, BotResponseError, HTTPClient, getLogger
 log = getLogger(__name__)
+HTTPClient().register_api("urban", concurrency=4)
 
 class UrbanIterator(Iterable):
     """Iterator for the returned answers fetched from `Urban` wrapper"""
@@ -78,9 +79,8 @@ class Urban:
             }
 
         r = None
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=querystring) as resp:
-                r = await resp.json(encoding="utf-8")
+        async with HTTPClient().get(url, api="urban", headers=headers, params=querystring) as resp:
+            r = await resp.json(encoding="utf-8")
         if not r:
             raise RuntimeError(f"no response received from {headers['x-rapidapi-host']}")
         if not r['list']:
@@ -19,7 +19,8 @@ class xkcdComicDict(TypedDict):
     day: str
     explanation_url: str
 
-from utils import Colors
+from core import HTTPClient
+from utils import Colors, single_flight
 
 class xkcdAPI:
     BaseEndpoint = "https://xkcd.com/"
@@ -38,6 +39,7 @@ class xkcdAPI:
         return cls.BaseEndpoint + f"{comic_id}/info.0.json"
     
     @classmethod
+    @single_flight()
     async def fetch_comic(cls, comic_url: str) -> xkcdComicDict | None:
         """
         Args:
@@ -47,16 +49,15 @@ class xkcdAPI:
         """
         json_resp = None
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(comic_url) as resp:
-                    if resp.status >= 400:
-                        return None
-                    json_resp = await resp.json()
-                    if not json_resp.get("link"):
-                        if json_resp.get("num"):
-                            json_resp["link"] = cls.BaseEndpoint + str(json_resp["num"])
-                    if (num := json_resp.get("num")):
-                        json_resp["explanation_url"] = f"https://www.explainxkcd.com/wiki/index.php/{num}"
-                    return json_resp
+            async with HTTPClient().get(comic_url, api="xkcd") as resp:
+                if resp.status >= 400:
+                    return None
+                json_resp = await resp.json()
+                if not json_resp.get("link"):
+                    if json_resp.get("num"):
+                        json_resp["link"] = cls.BaseEndpoint + str(json_resp["num"])
+                if (num := json_resp.get("num")):
+                    json_resp["explanation_url"] = f"https://www.explainxkcd.com/wiki/index.php/{num}"
+                return json_resp
         except aiohttp.ClientConnectorCertificateError as e:
                 raise e
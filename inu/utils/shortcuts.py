@@ -4,7 +4,7 @@ import hikari
 from hikari.impl import MessageActionRowBuilder
 import aiohttp
 
-from core import Inu
+from core import Inu, HTTPClient
 from utils import pacman
 
 # Pictures
@@ -95,9 +95,8 @@ async def check_website(url: str) -> Tuple[int, Optional[str]]:
         the status code and an optional error message
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                return response.status, response.reason
+        async with HTTPClient().get(url) as response:
+            return response.status, response.reason
     except aiohttp.ClientError as e:
         return 0, str(e)
     
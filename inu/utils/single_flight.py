@@ -0,0 +1,110 @@
+from typing import *
+import asyncio
+import functools
+
+from cachetools.keys import hashkey
+
+from core import getLogger
+
+log = getLogger(__name__)
+
+__all__: Final[Sequence[str]] = ["SingleFlight", "single_flight"]
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one call.
+
+    The first caller starts the call as task, every caller with the same key
+    awaits this task until it's done. Results and exceptions are shared,
+    nothing is cached afterwards - put a TTL cache in front for that.
+    """
+    def __init__(self, name: str = "single flight"):
+        self.name = name
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[..., Awaitable[T]],
+        *args: Any,
+        **kwargs: Any
+    ) -> T:
+        """
+        Returns the result of `await func(*args, **kwargs)`. If a call with <`key`>
+        is already running, its result is returned instead.
+
+        Args:
+        -----
+        key: Hashable
+            identifies the call. Calls with equal keys have to return the same
+        func: Callable[..., Awaitable[T]]
+            the coroutine function
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.create_task(func(*args, **kwargs))
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        else:
+            self.shared += 1
+        # shield - a cancelled caller must not cancel the call of the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # retrieve the exception, if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.calls} calls / {self.shared} shared / {len(self)} in flight"
+
+
+def single_flight(
+    key: Callable[..., Hashable] = hashkey,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Decorator, which coalesces concurrent calls of a coroutine function with equal arguments.
+    Put it below `asyncache.cached`, that only cache misses are coalesced.
+
+    Args:
+    -----
+    key: Callable[..., Hashable]
+        makes the key out of the arguments. Defaults to the key function of cachetools
+
+    Example:
+    --------
+    >>> @classmethod
+    ... @cached(TTLCache(1024, 60))
+    ... @single_flight()
+    ... async def fetch(cls, name: str): ...
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        flight = SingleFlight(func.__qualname__)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            try:
+                k = key(*args, **kwargs)
+                hash(k)
+            except TypeError:
+                # unhashable arguments - can't be coalesced
+                return await func(*args, **kwargs)
+            return await flight.do(k, func, *args, **kwargs)
+
+        wrapper.flight = flight  # type: ignore
+        return wrapper
+    return decorator
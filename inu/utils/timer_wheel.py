@@ -0,0 +1,123 @@
+from typing import *
+import asyncio
+import math
+import time
+import traceback
+
+from core import getLogger
+
+log = getLogger(__name__)
+
+__all__: Final[Sequence[str]] = ["TimerWheel"]
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel, which runs callbacks at given unix timestamps.
+
+    Timers are put into one of <`slots`> buckets by their deadline and one task
+    checks only the bucket of the current tick. Scheduling and cancelling is O(1),
+    regardless of how many timers are running. Deadlines are precise to <`tick`> seconds.
+    """
+    def __init__(self, tick: float = 1.0, slots: int = 512, name: str = "timer wheel"):
+        self.tick = tick
+        self.name = name
+        # slot -> key -> (deadline, tick of deadline, callback)
+        self._slots: List[Dict[Hashable, Tuple[float, int, Callable[[], Any]]]] = [{} for _ in range(slots)]
+        # key -> slot index
+        self._keys: Dict[Hashable, int] = {}
+        self._last_tick: int = self._tick_of(time.time())
+        self._task: Optional[asyncio.Task] = None
+        # fired callbacks - referenced, that they are not garbage collected
+        self._running: Set["asyncio.Task[None]"] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self.tick)
+
+    def schedule(
+        self,
+        key: Hashable,
+        when: float,
+        callback: Callable[[], Union[Awaitable[Any], Any]]
+    ) -> None:
+        """
+        Calls <`callback`> at the unix timestamp <`when`>.
+        An already scheduled timer with the same <`key`> is replaced.
+
+        Args:
+        -----
+        key: Hashable
+            identifies the timer
+        when: float
+            unix timestamp; timestamps in the past are fired with the next tick
+        callback: Callable[[], Awaitable | Any]
+            function or coroutine function without arguments
+        """
+        self.cancel(key)
+        # round up - the timer must not fire before <`when`>
+        now_tick = self._tick_of(time.time())
+        tick = max(math.ceil(when / self.tick), now_tick + 1)
+        index = tick % len(self._slots)
+        self._slots[index][key] = (when, tick, callback)
+        self._keys[key] = index
+        if self._task is None or self._task.done():
+            self._last_tick = now_tick
+            self._task = asyncio.create_task(self._run())
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Returns:
+        --------
+        bool:
+            wether or not a timer with <`key`> was scheduled
+        """
+        index = self._keys.pop(key, None)
+        if index is None:
+            return False
+        self._slots[index].pop(key, None)
+        return True
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        """returns the timestamp of the timer with <`key`>"""
+        index = self._keys.get(key)
+        if index is None:
+            return None
+        return self._slots[index][key][0]
+
+    async def _run(self) -> None:
+        while self._keys:
+            await asyncio.sleep(self.tick - (time.time() % self.tick))
+            now = time.time()
+            current = self._tick_of(now)
+            # catch up all ticks, which were missed while the loop was busy
+            ticks = range(self._last_tick + 1, current + 1)
+            if len(ticks) > len(self._slots):
+                ticks = range(current - len(self._slots) + 1, current + 1)
+            self._last_tick = current
+            due: List[Callable[[], Any]] = []
+            for tick in ticks:
+                slot = self._slots[tick % len(self._slots)]
+                # timers which are one or more rotations ahead stay
+                expired = [key for key, (_, due_tick, _) in slot.items() if due_tick <= current]
+                for key in expired:
+                    _, _, callback = slot.pop(key)
+                    del self._keys[key]
+                    due.append(callback)
+            for callback in due:
+                task = asyncio.create_task(self._fire(callback))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _fire(self, callback: Callable[[], Any]) -> None:
+        try:
+            result = callback()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception:
+            log.error(f"{self.name}: timer callback failed:\n{traceback.format_exc()}")
@@ -0,0 +1,129 @@
+from typing import *
+import asyncio
+import functools
+import traceback
+from datetime import datetime
+
+from core import getLogger
+from .timer_wheel import TimerWheel
+
+log = getLogger(__name__)
+
+__all__: Final[Sequence[str]] = ["Timers"]
+
+# job id -> payload
+JobBatch = Dict[Hashable, Any]
+
+
+class Timers:
+    """
+    One `TimerWheel` for all jobs of the bot, which have to run at a given time
+    (autorole expiry, poll results, ...).
+
+    Jobs are identified by their kind and a stable id (e.g. the primary key of their row),
+    hence scheduling a job again moves it instead of adding a second one.
+    Jobs of one kind, which are due in the same tick, are handed to the handler
+    of that kind as one batch.
+
+    Nothing is stored here - the jobs live in the tables they belong to
+    and have to be scheduled again from there after a restart.
+    """
+    wheel: TimerWheel = TimerWheel(tick=1.0, slots=1024, name="timers")
+    # kind -> handler
+    _handlers: Dict[str, Callable[[JobBatch], Awaitable[None]]] = {}
+    # kind -> due jobs, which are not handed to the handler yet
+    _due: Dict[str, JobBatch] = {}
+    # running batches - referenced, that they are not garbage collected
+    _running: Set["asyncio.Task[None]"] = set()
+
+    @classmethod
+    def register(cls, kind: str, handler: Callable[[JobBatch], Awaitable[None]]) -> None:
+        """
+        Sets the handler of <`kind`>.
+
+        Args:
+        -----
+        kind: str
+            the kind of the jobs
+        handler: Callable[[Dict[Hashable, Any]], Awaitable[None]]
+            gets a mapping from job id to payload of all due jobs of <`kind`>
+        """
+        cls._handlers[kind] = handler
+
+    @classmethod
+    def schedule(
+        cls,
+        kind: str,
+        job_id: Hashable,
+        when: Union[datetime, float],
+        payload: Any = None,
+    ) -> None:
+        """
+        Runs the job <`job_id`> of <`kind`> at <`when`>.
+        An already scheduled job with the same id is rescheduled.
+
+        Args:
+        -----
+        kind: str
+            the kind of the job
+        job_id: Hashable
+            stable id of the job
+        when: datetime | float
+            datetime or unix timestamp. Jobs in the past run with the next tick
+        payload: Any
+            passed to the handler
+        """
+        if isinstance(when, datetime):
+            when = when.timestamp()
+        cls.wheel.schedule(
+            (kind, job_id),
+            when,
+            functools.partial(cls._on_due, kind, job_id, payload),
+        )
+
+    @classmethod
+    def cancel(cls, kind: str, job_id: Hashable) -> bool:
+        """
+        Returns:
+        --------
+        bool:
+            wether or not the job was scheduled
+        """
+        return cls.wheel.cancel((kind, job_id))
+
+    @classmethod
+    def is_scheduled(cls, kind: str, job_id: Hashable) -> bool:
+        return (kind, job_id) in cls.wheel
+
+    @classmethod
+    def deadline(cls, kind: str, job_id: Hashable) -> Optional[float]:
+        """returns the timestamp of the job or None"""
+        return cls.wheel.deadline((kind, job_id))
+
+    @classmethod
+    def _on_due(cls, kind: str, job_id: Hashable, payload: Any) -> None:
+        due = cls._due.get(kind)
+        if due is None:
+            due = cls._due[kind] = {}
+            # the wheel fires all callbacks of a tick as tasks, which
+            # are all running before this one - hence it gets the whole tick
+            task = asyncio.create_task(cls._run_batch(kind))
+            cls._running.add(task)
+            task.add_done_callback(cls._running.discard)
+        due[job_id] = payload
+
+    @classmethod
+    async def _run_batch(cls, kind: str) -> None:
+        batch = cls._due.pop(kind, {})
+        if not batch:
+            return
+        handler = cls._handlers.get(kind)
+        if handler is None:
+            log.error(f"no timer handler for `{kind}` - dropped {len(batch)} jobs")
+            return
+        log.debug(f"running {len(batch)} `{kind}` jobs", prefix="task")
+        try:
+            await handler(batch)
+        except Exception:
+            log.error(f"`{kind}` timer handler failed:\n{traceback.format_exc()}")
+